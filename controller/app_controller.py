@@ -1,5 +1,8 @@
+import time
 from typing import Any
 
+from definitions import Constants, DataSource
+from model.archive import ObservationArchive
 from model.data_model import DataModel
 from .weather_service import WeatherService
 
@@ -11,10 +14,21 @@ class AppController:
     to fetch and load data.
     """
 
-    def __init__(self, service: WeatherService | None = None, model: DataModel | None = None) -> None:
+    def __init__(
+        self,
+        service: WeatherService | None = None,
+        model: DataModel | None = None,
+        bulk_mode: bool = False,
+        archive: ObservationArchive | None = None,
+    ) -> None:
         self.service = service or WeatherService()
         self.model = model or DataModel()
         self.last_error = ""
+        # In bulk mode the data of all stations is fetched with one request
+        # and station data is served from the model's observation store.
+        self.bulk_mode = bulk_mode
+        # Optional archive that keeps every parsed observation (written in the background).
+        self.archive = archive
 
     def __repr__(self) -> str:
         """Return a short representation useful for debugging."""
@@ -30,19 +44,104 @@ class AppController:
         if self.service.has_error:
             self.last_error = self.service.error_message
             return False
+        return self.load_station_list(stations_json)
+
+    def stream_and_load_station_list(self) -> bool:
+        """Fetch the station list and parse it into the model while it downloads.
+
+        Uses less memory than `fetch_and_load_station_list`: stations are
+        built one at a time and the full JSON tree never exists. On a failed
+        or interrupted download the previous station list is kept.
+        """
+        success = self.model.parse_station_list(self.service.stream_station_list())
+        if self.service.has_error:
+            self.last_error = self.service.error_message
+            return False
+        return success
+
+    def load_station_list(self, stations_json) -> bool:
+        """Load station list JSON fetched earlier (e.g. on a worker thread) into the `DataModel`."""
         return self.model.parse_station_list(stations_json)
 
     def fetch_and_load_station_data(self, station_id: str) -> bool:
         """Fetch detailed station data for `station_id` and parse it into the model.
 
-        Returns True if parsing succeeded, False if the service reported an error
-        or parsing failed.
+        Returns True if parsing succeeded, False if the service reported an error,
+        the station is missing from the bulk data (both set `last_error`) or
+        parsing failed. In bulk mode the data comes from the observation
+        store, which is refreshed with one request for all stations when it
+        is older than `Constants.DEFAULT_POLLING_INTERVAL_S`.
         """
+        if self.bulk_mode:
+            observations = self.model.observations
+            age_s = time.time() - observations.fetched_at
+            if station_id not in observations or age_s >= Constants.DEFAULT_POLLING_INTERVAL_S:
+                if not self.fetch_and_load_all_station_data():
+                    return False
+            self.model.set_currect_station(station_id)
+            if station_id not in observations:
+                self.last_error = f"station {station_id} missing from bulk data"
+                return False
+            return True
+
         station_json = self.service.get_road_weather(station_id)
         if self.service.has_error:
             self.last_error = self.service.error_message
             return False
-        return self.model.parse_station_data(station_json)
+        success = self.model.parse_station_data(station_json)
+        if success and self.archive is not None:
+            self.archive.add_station(self.model.current_station)
+        return success
+
+    def fetch_and_load_all_station_data(self) -> bool:
+        """Fetch data of all stations with one request and load it into the observation store."""
+        stations_data_json = self.service.get_all_road_weather()
+        if self.service.has_error:
+            self.last_error = self.service.error_message
+            return False
+        success = self.model.parse_all_station_data(stations_data_json)
+        if success and self.archive is not None:
+            self.archive.add_stations(self.model.observations.stations)
+        return success
+
+    def store_city_weather(self, city_weather, now_s: float | None = None) -> None:
+        """Keep city weather fetched for the current station at `now_s` (default: now) in the model."""
+        self.model.city_weather = city_weather
+        self.model.city_weather_fetched_at = time.time() if now_s is None else now_s
+
+    def store_forecast(self, forecast, now_s: float | None = None) -> None:
+        """Keep a forecast fetched for the current station at `now_s` (default: now) in the model."""
+        self.model.forecast = forecast
+        self.model.forecast_fetched_at = time.time() if now_s is None else now_s
+
+    def refresh_time(self, source: DataSource) -> float:
+        """Return when the current station's data from `source` is due for a refresh (s since the epoch).
+
+        Each source has its own cadence: road weather is due at the
+        station's next expected update, learned from its observation times;
+        city weather `Constants.CITY_WEATHER_REFRESH_S` after it was fetched;
+        the forecast `Constants.FORECAST_SLOT_DELAY_S` after the next
+        OpenWeatherMap 3-hour forecast slot has started. Data never fetched
+        for this station, or restored from a snapshot, is due at once (0).
+        """
+        if source == DataSource.ROAD_WEATHER:
+            if self.model.is_stale:
+                return 0.0
+            return self.model.current_station.cadence.expected_update_s() or 0.0
+        if source == DataSource.CITY_WEATHER:
+            fetched_at = self.model.city_weather_fetched_at
+            return fetched_at + Constants.CITY_WEATHER_REFRESH_S if fetched_at else 0.0
+        fetched_at = self.model.forecast_fetched_at
+        if not fetched_at:
+            return 0.0
+        # the forecast of the slot that had started when it was fetched
+        slot = (fetched_at - Constants.FORECAST_SLOT_DELAY_S) // Constants.FORECAST_SLOT_S
+        return (slot + 1) * Constants.FORECAST_SLOT_S + Constants.FORECAST_SLOT_DELAY_S
+
+    def due_sources(self, now_s: float | None = None) -> set:
+        """Return the `DataSource`s of the current station due for a refresh at `now_s` (default: now)."""
+        now_s = time.time() if now_s is None else now_s
+        return {source for source in DataSource if self.refresh_time(source) <= now_s}
 
     def set_current_station(self, station_id: str) -> None:
         """Set the currently selected station in the `DataModel` by `station_id`."""
@@ -55,3 +154,13 @@ class AppController:
     def get_current_station(self):
         """Return the currently selected `WeatherStation` instance."""
         return self.model.current_station
+
+    def find_nearest_stations(self, lat: float, lon: float, count: int = 1) -> list:
+        """Return up to `count` (WeatherStationInfo, distance_km) pairs of the stations
+        shown in station lists nearest to (lat, lon), nearest first."""
+        return self.model.station_list.find_nearest_stations(lat, lon, count)
+
+    def find_stations_within(self, lat: float, lon: float, radius_km: float) -> list:
+        """Return (WeatherStationInfo, distance_km) pairs of the stations shown in
+        station lists within `radius_km` of (lat, lon), nearest first."""
+        return self.model.station_list.find_stations_within(lat, lon, radius_km)
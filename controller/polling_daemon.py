@@ -0,0 +1,246 @@
+import heapq
+import itertools
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from definitions import Constants
+from model.station_info import WeatherStationList
+from model.weather_station import WeatherStation
+from .weather_service import WeatherService
+
+
+class PollScheduler:
+    """Priority queue of station ids keyed by the time (seconds since the epoch) of their next poll.
+
+    Rescheduling a station leaves its old heap entry in place; stale
+    entries are skipped when they reach the top.
+    """
+
+    def __init__(self):
+        self._heap = []  # (due time, sequence, station id)
+        self._due = {}  # station id -> due time of its live entry
+        self._sequence = itertools.count()
+
+    def __repr__(self) -> str:
+        return f"PollScheduler(stations={len(self._due)})"
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, station_id) -> bool:
+        return station_id in self._due
+
+    def schedule(self, station_id, due_s: float) -> None:
+        self._due[station_id] = due_s
+        heapq.heappush(self._heap, (due_s, next(self._sequence), station_id))
+
+    def due_time(self, station_id) -> float | None:
+        """Return the due time of a scheduled station, or None."""
+        return self._due.get(station_id)
+
+    def remove(self, station_id) -> None:
+        self._due.pop(station_id, None)
+
+    def _drop_stale(self) -> None:
+        heap = self._heap
+        while heap and self._due.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def next_due(self) -> float | None:
+        """Return the earliest due time, or None when nothing is scheduled."""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now_s: float, limit: int) -> list:
+        """Remove and return up to `limit` station ids due at `now_s`, earliest first."""
+        due = []
+        while len(due) < limit:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now_s:
+                break
+            _, _, station_id = heapq.heappop(self._heap)
+            del self._due[station_id]
+            due.append(station_id)
+        return due
+
+
+class PollingDaemon:
+    """Polls many road weather stations, each shortly after it is expected to publish.
+
+    Stations wait in a `PollScheduler` keyed by their predicted next
+    update, learned by the station's `cadence` (the latest observation time
+    plus the default polling interval until it has seen two), plus
+    `Constants.DAEMON_PUBLISH_DELAY_S`. A station that has not published
+    when expected, or whose request failed, is retried with exponential
+    backoff. Every due time gets up to `jitter_s` of random delay so that
+    stations publishing together are not requested at the same instant.
+
+    Polls the stations `station_list` shows in station lists, or only
+    `station_ids` when given; `station_list` provides their names and
+    coordinates. At most `workers`
+    requests are in flight. Polled stations are kept in `stations`; each
+    update is passed to `archive.add_station` and to `on_update(station)`
+    (called on a worker thread) when given.
+    """
+
+    def __init__(
+        self,
+        station_list: WeatherStationList,
+        station_ids=None,
+        service: WeatherService | None = None,
+        workers: int = Constants.DAEMON_WORKERS,
+        jitter_s: float = Constants.DAEMON_JITTER_S,
+        archive=None,
+        on_update=None,
+        clock=time.time,
+    ):
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        self.service = service or WeatherService()
+        self.station_list = station_list
+        self.stations = {}  # station id -> WeatherStation
+        self.archive = archive
+        self.on_update = on_update
+        self._workers = workers
+        self._jitter_s = jitter_s
+        self._clock = clock
+        self._random = random.Random()
+        self._scheduler = PollScheduler()
+        self._misses = {}  # station id -> consecutive polls without new data
+        self._results = queue.Queue()  # (station id, updated, error message) from workers
+        self._in_flight = 0
+        self._stop = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="poll")
+        self.polls = 0
+        self.updates = 0
+        self.errors = 0
+        self.last_error = ""
+
+        if station_ids is None:
+            station_ids = [station.id for station in station_list.get_visible_stations()]
+        now = self._clock()
+        for station_id in station_ids:
+            self._scheduler.schedule(station_id, now + self._jitter())
+
+    def __repr__(self) -> str:
+        return f"PollingDaemon(stations={len(self._scheduler) + self._in_flight}, workers={self._workers})"
+
+    @property
+    def scheduler(self) -> PollScheduler:
+        return self._scheduler
+
+    @property
+    def in_flight(self) -> int:
+        """Number of polls started whose results have not been handled yet."""
+        return self._in_flight
+
+    def _jitter(self) -> float:
+        return self._random.uniform(0.0, self._jitter_s)
+
+    def next_poll_time(self, station_id, now_s: float, updated: bool) -> float:
+        """Return when to poll a station next (without jitter).
+
+        `updated` tells whether its last poll brought a new observation.
+        """
+        station = self.stations.get(station_id)
+        misses = self._misses.get(station_id, 0)
+        retry = Constants.DAEMON_RETRY_S * 2 ** max(misses - 1, 0)
+        if station is None:  # never polled successfully
+            return now_s + min(retry, Constants.DAEMON_MAX_INTERVAL_S)
+        cadence = station.cadence
+        interval = min(
+            cadence.interval_s or Constants.DEFAULT_POLLING_INTERVAL_S, Constants.DAEMON_MAX_INTERVAL_S
+        )
+        expected = cadence.expected_update_s() or cadence.latest_s + Constants.DEFAULT_POLLING_INTERVAL_S
+        expected = min(expected, cadence.latest_s + Constants.DAEMON_MAX_INTERVAL_S)
+        expected += Constants.DAEMON_PUBLISH_DELAY_S
+        if updated and expected > now_s:
+            return expected
+        # late or failing: retry, backing off up to the update interval
+        return max(expected, now_s + min(retry, interval))
+
+    def _poll(self, station_id) -> None:
+        # runs on a pool thread; only one poll per station is in flight
+        try:
+            station_json = self.service.get_road_weather(station_id)
+            if self.service.has_error:
+                self._results.put((station_id, False, self.service.error_message))
+                return
+            station = self.stations.get(station_id)
+            if station is None:
+                station = WeatherStation()
+                station._station_info = self.station_list.find_station_by_id(station_id)
+            previous_time = station.data_updated_time if station_id in self.stations else None
+            station.parse(station_json)
+            self.stations[station_id] = station
+            updated = station.data_updated_time != previous_time
+            if updated:
+                if self.archive is not None:
+                    self.archive.add_station(station)
+                if self.on_update is not None:
+                    self.on_update(station)
+            self._results.put((station_id, updated, ""))
+        except Exception as exc:  # keep polling the other stations
+            self._results.put((station_id, False, f"{type(exc).__name__}: {exc}"))
+
+    def _handle_result(self, station_id, updated: bool, error: str) -> None:
+        self._in_flight -= 1
+        if error:
+            self.errors += 1
+            self.last_error = f"station {station_id}: {error}"
+        if updated:
+            self.updates += 1
+            self._misses[station_id] = 0
+        else:
+            self._misses[station_id] = self._misses.get(station_id, 0) + 1
+        due = self.next_poll_time(station_id, self._clock(), updated)
+        self._scheduler.schedule(station_id, due + self._jitter())
+
+    def step(self, timeout_s: float) -> int:
+        """Start the due polls the pool has room for, then handle finished polls.
+
+        Waits up to `timeout_s` for a poll to finish. Returns the number of
+        polls started.
+        """
+        started = 0
+        for station_id in self._scheduler.pop_due(self._clock(), self._workers - self._in_flight):
+            self._in_flight += 1
+            self.polls += 1
+            started += 1
+            self._executor.submit(self._poll, station_id)
+        try:
+            result = self._results.get(timeout=max(0.0, timeout_s))
+        except queue.Empty:
+            return started
+        while True:
+            self._handle_result(*result)
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                return started
+
+    def run(self, duration_s: float | None = None) -> None:
+        """Poll until `stop` is called or `duration_s` has passed."""
+        end = None if duration_s is None else self._clock() + duration_s
+        while not self._stop.is_set():
+            now = self._clock()
+            if end is not None and now >= end:
+                break
+            next_due = self._scheduler.next_due()
+            wait = Constants.DAEMON_IDLE_WAIT_S if next_due is None else next_due - now
+            if self._in_flight >= self._workers:
+                wait = Constants.DAEMON_IDLE_WAIT_S
+            if end is not None:
+                wait = min(wait, end - now)
+            self.step(min(wait, Constants.DAEMON_IDLE_WAIT_S))
+
+    def stop(self) -> None:
+        """Make `run` return; may be called from another thread or a signal handler."""
+        self._stop.set()
+
+    def close(self) -> None:
+        """Wait for the polls in flight and shut the worker pool down."""
+        self._executor.shutdown(wait=True)
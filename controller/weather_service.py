@@ -1,15 +1,52 @@
+import threading
+import time
 from typing import Any
 
+from definitions import Constants
+from utils import json_backend
+from utils.city_resolver import CityResolver
+from utils.http_cache import HttpCache
+from utils.response_cache import ResponseCache
 from utils.web_utils import RequestRunner
 
 
 class WeatherService:
     """Thin wrapper around the existing RequestRunner to provide a
     clearer service interface for the rest of the application.
+
+    When an `HttpCache` is given, responses are cached on disk and
+    revalidated with conditional GET requests. When a `ResponseCache` is
+    given as `owm_cache`, OpenWeatherMap responses are shared between
+    stations: city weather by city name, forecasts by location (coordinates
+    rounded to `Constants.OWM_COORDINATE_DECIMALS`), and concurrent requests
+    for the same city or location make one upstream call. With a
+    `CityResolver`, city weather is queried by the city id or coordinates
+    that worked before instead of trying the city name first.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        cache: HttpCache | None = None,
+        owm_cache: ResponseCache | None = None,
+        city_resolver: CityResolver | None = None,
+    ) -> None:
         self._runner = RequestRunner()
+        if cache is not None:
+            self._runner.cache = cache
+        if city_resolver is not None:
+            self._runner.city_resolver = city_resolver
+        self.owm_cache = owm_cache
+        self.city_resolver = city_resolver
+        self._local = threading.local()  # per-thread time of the latest OpenWeatherMap data
+
+    @property
+    def fetched_at(self) -> float:
+        """Return when this thread's latest city weather or forecast data was fetched (s since the epoch).
+
+        A response shared through `owm_cache` may have been fetched up to
+        `Constants.OWM_CACHE_TTL_S` before the call. 0 before the first call.
+        """
+        return getattr(self._local, "fetched_at", 0.0)
 
     @property
     def has_error(self) -> bool:
@@ -21,6 +58,60 @@ class WeatherService:
         """Return last error message from the underlying request runner."""
         return self._runner.error_message
 
+    @staticmethod
+    def _location_key(coordinates) -> tuple:
+        return (
+            round(coordinates.latitude, Constants.OWM_COORDINATE_DECIMALS),
+            round(coordinates.longitude, Constants.OWM_COORDINATE_DECIMALS),
+        )
+
+    def _fetch_shared(self, key, fetch) -> Any:
+        """Return `fetch()` through `owm_cache`, keeping this thread's error state as if it had fetched."""
+
+        def fetch_with_error():
+            data = fetch()
+            if self._runner.has_error:
+                return data, (self._runner.status_code, self._runner.error_message)
+            return data, ""
+
+        data, error, self._local.fetched_at = self.owm_cache.get_or_fetch(key, fetch_with_error)
+        self._runner.reset_error()
+        if error:
+            # (status, message) of a failed request, or the text of an exception raised by it
+            status_code, message = error if isinstance(error, tuple) else (0, error)
+            self._runner.status_code, self._runner.error_message = status_code, message
+        return data if data is not None else {}
+
+    def close(self) -> None:
+        """Write pending HTTP cache index changes to disk; call before the application exits."""
+        cache = getattr(self._runner, "cache", None)
+        if cache is not None:
+            cache.close()
+
+    @property
+    def cache_stats(self) -> dict:
+        """Return HTTP cache hit/miss counters, or an empty dict when caching is off."""
+        cache = getattr(self._runner, "cache", None)
+        return cache.stats if cache is not None else {}
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return runtime details useful in bug reports: JSON decoder backend and cache stats."""
+        return {
+            "json_backend": json_backend.get_backend(),
+            "http_cache": self.cache_stats,
+            "owm_cache": self.owm_cache.stats if self.owm_cache is not None else {},
+            "city_resolver": self.city_resolver.stats if self.city_resolver is not None else {},
+        }
+
+    def warm_up(self) -> None:
+        """Open pooled connections to the upstream APIs in the background.
+
+        Called at startup so the first refresh does not pay for the TCP and
+        TLS handshakes.
+        """
+        self._runner.warm_up()
+
     def get_station_list(self) -> Any:
         """Return the raw station list JSON from the network runner.
 
@@ -29,20 +120,44 @@ class WeatherService:
         """
         return self._runner.get_weather_stations()
 
+    def stream_station_list(self) -> Any:
+        """Return an iterator over the station list items, decoded while downloading.
+
+        Raises `ValueError` during iteration if the download or decoding fails.
+        """
+        return self._runner.stream_weather_stations()
+
     def get_road_weather(self, station_id: str) -> Any:
         """Return detailed road/weather data for the given `station_id`."""
         return self._runner.get_road_weather(station_id)
 
+    def get_all_road_weather(self) -> Any:
+        """Return road/weather data of all stations (the `stations` array)."""
+        return self._runner.get_all_road_weather()
+
     def get_city_weather(self, city: str, coordinates, api_key: str) -> Any:
         """Get current weather for a city (or fallback to coordinates).
 
-        Returns the JSON response from the OpenWeatherMap endpoint.
+        Returns the JSON response from the OpenWeatherMap endpoint. With
+        `owm_cache` the response is shared by stations in the same city, or
+        at the same rounded location when `city` is empty.
         """
-        return self._runner.get_city_weather(city, coordinates, api_key)
+        if self.owm_cache is None:
+            self._local.fetched_at = time.time()
+            return self._runner.get_city_weather(city, coordinates, api_key)
+        name = city.strip().casefold()
+        key = ("weather", name) if name else ("weather",) + self._location_key(coordinates)
+        return self._fetch_shared(key, lambda: self._runner.get_city_weather(city, coordinates, api_key))
 
     def get_forecast(self, coordinates, api_key: str) -> Any:
         """Return forecast JSON for the given coordinates.
 
-        The result is used to display short-term forecasts in the UI.
+        The result is used to display short-term forecasts in the UI. With
+        `owm_cache` the response is shared by stations at the same rounded
+        location.
         """
-        return self._runner.get_forecast(coordinates, api_key)
+        if self.owm_cache is None:
+            self._local.fetched_at = time.time()
+            return self._runner.get_forecast(coordinates, api_key)
+        key = ("forecast",) + self._location_key(coordinates)
+        return self._fetch_shared(key, lambda: self._runner.get_forecast(coordinates, api_key))
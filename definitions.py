@@ -4,6 +4,7 @@ import enum
 
 class Constants:
     SETTINGS_FILE_NAME = "settings.json"
+    SNAPSHOT_FILE_NAME = "snapshot.bin"
     FORECAST_CNT = 3
     SYMBOL_CNT = FORECAST_CNT + 1
     STATION_UPDATE_DELAY_S = (
@@ -14,6 +15,41 @@ class Constants:
     )
     INVALID_VALUE = -999.0
     MISSING_UNIT = ["///", "???"]
+    HTTP_TIMEOUT_S = 10
+    HTTP_POOL_SIZE = 4  # max. pooled keep-alive connections per upstream host
+    HTTP_WARM_UP_TIMEOUT_S = 5
+    HTTP_CACHE_DIR = ".cache/http"
+    HTTP_CACHE_MAX_BYTES = 20 * 1024 * 1024
+    HTTP_CACHE_INDEX_SAVE_S = 30  # changed HTTP cache index is written to disk at most this often
+    HTTP_STREAM_CHUNK_BYTES = 64 * 1024  # read size of streamed responses
+    TIMESTAMP_CACHE_SIZE = 256  # recently parsed timestamp strings to memoize
+    EARTH_RADIUS_KM = 6371.0  # mean radius, used for great-circle distances
+    HISTORY_CAPACITY = 144  # readings kept per station and sensor (24 h at 10 min cadence)
+    SELECTED_STATIONS_KEPT = 32  # recently selected stations whose history is kept outside bulk mode
+    SPATIAL_INDEX_CELL_KM = 50.0  # nearest-station index grid cell, sized for ~500 stations
+    ARCHIVE_FILE_NAME = "observations.sqlite"
+    ARCHIVE_BATCH_SIZE = 50_000  # max. readings written per transaction
+    ARCHIVE_FLUSH_INTERVAL_S = 1.0  # max. time a queued reading waits for its batch
+    ARCHIVE_BUSY_TIMEOUT_S = 10
+    # rollup bucket length (s) and buckets kept: 10 min for a day, hours for a week, days for a season
+    ROLLUP_RESOLUTIONS = ((600, 144), (3600, 168), (86400, 90))
+    SERIES_BLOCK_POINTS = 1024  # readings per compressed series file block (~1 week at 10 min)
+    DAEMON_WORKERS = 8  # max. station requests in flight in the polling daemon
+    DAEMON_JITTER_S = 5.0  # max. random delay added to each poll
+    DAEMON_PUBLISH_DELAY_S = 15  # poll this long after a station's expected update
+    DAEMON_RETRY_S = 30  # first retry delay of a late or failed station, doubled on each miss
+    DAEMON_MAX_INTERVAL_S = 1800  # longest wait between polls of a station
+    DAEMON_IDLE_WAIT_S = 1.0  # max. time the daemon loop sleeps before checking for a stop
+    CADENCE_HISTORY = 12  # observation times kept per station to learn its update cadence
+    CADENCE_MAX_WAIT_S = 1800  # longest wait until a station's next expected update
+    CITY_WEATHER_REFRESH_S = 600  # OpenWeatherMap current weather is refreshed every 10 min
+    FORECAST_SLOT_S = 3 * 3600  # OpenWeatherMap forecasts are given in 3-hour slots (UTC)
+    FORECAST_SLOT_DELAY_S = 300  # refresh the forecast this long after a new slot starts
+    OWM_CACHE_TTL_S = 600  # OpenWeatherMap responses are shared between stations for this long
+    OWM_CACHE_MAX_ENTRIES = 1024  # cached OpenWeatherMap responses (cities and locations)
+    OWM_COORDINATE_DECIMALS = 1  # coordinates are rounded to ~10 km for OpenWeatherMap cache keys
+    CITY_RESOLVER_FILE_NAME = ".cache/owm_cities.json"  # city name -> OpenWeatherMap city id
+    CITY_NEGATIVE_TTL_S = 7 * 86400  # city names OpenWeatherMap did not recognise are retried after this
 
 
 class ConversionType(enum.Enum):
@@ -21,6 +57,12 @@ class ConversionType(enum.Enum):
     TO_FLOAT = 2
 
 
+class DataSource(enum.Enum):
+    ROAD_WEATHER = 1
+    CITY_WEATHER = 2
+    FORECAST = 3
+
+
 class Formats:
     SHORT_TIME_FORMAT = "%H:%M"
     TIME_FORMAT = "%H:%M:%S"
@@ -34,6 +76,11 @@ class Urls:
         "https://api.openweathermap.org/data/2.5/weather?q={}&appid={}"
     )
 
+    # Open Weather Map current weather url with placeholders for city id and api key (appid):
+    OPENWEATHERMAP_CITY_ID_URL = (
+        "https://api.openweathermap.org/data/2.5/weather?id={}&appid={}"
+    )
+
     # Open Weather Map current weather url with placeholders for location (lat, lon) and api key (appid):
     OPENWEATHERMAP_LOCATION_URL = (
         "https://api.openweathermap.org/data/2.5/weather?lat={}&lon={}&appid={}"
@@ -50,6 +97,15 @@ class Urls:
     # Liikennevirasto's weather station data with a placeholder for numeric station id, e.g. 12082:
     WEATHER_STATION_URL = "https://tie.digitraffic.fi/api/weather/v1/stations/{}/data"
 
+    # Liikennevirasto's weather data of all stations in one document:
+    ALL_STATIONS_DATA_URL = "https://tie.digitraffic.fi/api/weather/v1/stations/data"
+
+    # Upstream hosts to open pooled connections to at startup:
+    WARM_UP_URLS = [
+        "https://tie.digitraffic.fi/",
+        "https://api.openweathermap.org/",
+    ]
+
 
 class Styles:
     DEFAULT = """
@@ -0,0 +1,196 @@
+import itertools
+import queue
+import sqlite3
+import threading
+import time
+
+from definitions import Constants
+from model.series_file import SeriesFileWriter
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    station_id INTEGER NOT NULL,
+    sensor_id INTEGER NOT NULL,
+    measured_time INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (station_id, sensor_id, measured_time)
+) WITHOUT ROWID
+"""
+
+_INSERT = "INSERT OR IGNORE INTO observations VALUES (?, ?, ?, ?)"
+
+_STOP = object()  # queue sentinel that ends the writer thread
+
+
+class ObservationArchive:
+    """SQLite archive of every parsed sensor reading.
+
+    Readings are queued by `add_station` (cheap, safe to call from any
+    thread) and written by a background thread in batched transactions, so
+    callers never wait for the disk. The database uses WAL mode, which lets
+    `query` read while the writer is active.
+
+    The primary key (station_id, sensor_id, measured_time) is the index and
+    deduplicates readings: unchanged readings are skipped before queueing,
+    and `INSERT OR IGNORE` drops readings stored by an earlier session.
+    """
+
+    def __init__(
+        self,
+        file_name: str = Constants.ARCHIVE_FILE_NAME,
+        batch_size: int = Constants.ARCHIVE_BATCH_SIZE,
+        flush_interval_s: float = Constants.ARCHIVE_FLUSH_INTERVAL_S,
+    ):
+        self._file_name = file_name
+        self._batch_size = batch_size
+        self._flush_interval_s = flush_interval_s
+        self._queue = queue.Queue()
+        self._latest = {}  # station id -> {sensor id: latest queued measured time}
+        self._latest_lock = threading.Lock()
+        self.rows_queued = 0
+        self.rows_written = 0  # rows handed to INSERT OR IGNORE, including ignored duplicates
+        self.transactions = 0
+        self.last_error = ""
+
+        # create the schema before returning, so queries work right away
+        connection = self._connect()
+        connection.execute(_SCHEMA)
+        connection.commit()
+        connection.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="archive-writer", daemon=True)
+        self._writer.start()
+
+    def __repr__(self) -> str:
+        return f"ObservationArchive({self._file_name!r}, queued={self._queue.qsize()})"
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._file_name, timeout=Constants.ARCHIVE_BUSY_TIMEOUT_S)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints, fast commits
+        return connection
+
+    def add_station(self, station) -> int:
+        """Queue the valid sensor readings of a `WeatherStation`; returns the number queued.
+
+        Readings are archived under the station id of the parsed data document.
+        Readings whose measured time was already queued are skipped.
+        """
+        rows = []
+        station_id = station.data_station_id or station.id
+        last_time = None
+        measured_ts = 0
+        with self._latest_lock:
+            latest = self._latest.get(station_id)
+            if latest is None:
+                latest = self._latest[station_id] = {}
+            for sensor in station.sensor_values:
+                value = sensor.float_value
+                if value == Constants.INVALID_VALUE:
+                    continue
+                if sensor.measured_time is not last_time:
+                    # sensors of one station share a few (memoized) timestamps
+                    last_time = sensor.measured_time
+                    measured_ts = int(last_time.timestamp())
+                if latest.get(sensor.id, -1) >= measured_ts:
+                    continue
+                latest[sensor.id] = measured_ts
+                rows.append((station_id, sensor.id, measured_ts, value))
+        if rows:
+            self.rows_queued += len(rows)
+            self._queue.put(rows)
+        return len(rows)
+
+    def add_stations(self, stations) -> int:
+        return sum(self.add_station(station) for station in stations)
+
+    def flush(self) -> None:
+        """Block until everything queued so far has been committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write the remaining readings and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def query(self, station_id: int, sensor_id: int, start_s: float = 0, end_s: float | None = None) -> list:
+        """Return archived (measured_time, value) rows of one sensor, oldest first.
+
+        Times are seconds since the epoch; `end_s` is exclusive and defaults
+        to no limit. Only committed readings are visible.
+        """
+        if end_s is None:
+            end_s = 2**62
+        connection = self._connect()
+        try:
+            return connection.execute(
+                "SELECT measured_time, value FROM observations"
+                " WHERE station_id = ? AND sensor_id = ? AND measured_time >= ? AND measured_time < ?"
+                " ORDER BY measured_time",
+                (station_id, sensor_id, int(start_s), int(end_s)),
+            ).fetchall()
+        finally:
+            connection.close()
+
+    def export_series(self, file_name: str, start_s: float = 0, end_s: float | None = None) -> int:
+        """Write the committed readings in [start_s, end_s) into a compressed series file.
+
+        Returns the number of readings written. Read the file with
+        `model.series_file.SeriesFileReader`.
+        """
+        if end_s is None:
+            end_s = 2**62
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT station_id, sensor_id, measured_time, value FROM observations"
+                " WHERE measured_time >= ? AND measured_time < ?"
+                " ORDER BY station_id, sensor_id, measured_time",
+                (int(start_s), int(end_s)),
+            )
+            with SeriesFileWriter(file_name) as writer:
+                for (station_id, sensor_id), readings in itertools.groupby(rows, key=lambda r: r[:2]):
+                    readings = list(readings)
+                    writer.add_series(
+                        station_id, sensor_id, [r[2] for r in readings], [r[3] for r in readings]
+                    )
+            return writer.points
+        finally:
+            connection.close()
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        stop = False
+        while not stop:
+            batch = []
+            taken = 0
+            item = self._queue.get()
+            deadline = time.monotonic() + self._flush_interval_s
+            while True:
+                taken += 1
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.extend(item)
+                if len(batch) >= self._batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(connection, batch)
+            for _ in range(taken):
+                self._queue.task_done()
+        connection.close()
+
+    def _write(self, connection, rows) -> None:
+        try:
+            with connection:  # one transaction per batch
+                connection.executemany(_INSERT, rows)
+            self.rows_written += len(rows)
+            self.transactions += 1
+        except sqlite3.Error as exc:
+            self.last_error = str(exc)
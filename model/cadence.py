@@ -0,0 +1,98 @@
+import math
+from collections import deque
+from statistics import median
+
+from definitions import Constants
+
+
+class CadenceEstimator:
+    """Learns when a station publishes from the observation times it has published.
+
+    Keeps the latest `history` distinct observation times (seconds since the
+    epoch). The update interval is the median of the intervals between
+    them, each divided first by the number of updates it spans, so a missed
+    or late update does not throw the estimate off. The phase is the median
+    offset of the kept times from the interval grid through the latest one,
+    so one late update does not shift it either. Both are re-estimated on
+    each new observation time.
+    """
+
+    __slots__ = ("_times", "_interval_s", "_anchor_s")
+
+    def __init__(self, history: int = Constants.CADENCE_HISTORY):
+        if history < 2:
+            raise ValueError("history must be at least 2")
+        self._times = deque(maxlen=history)
+        self._interval_s = None
+        self._anchor_s = None  # a publish time on the learned grid
+
+    def __repr__(self) -> str:
+        return f"CadenceEstimator(times={len(self._times)}, interval_s={self._interval_s})"
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    @property
+    def latest_s(self) -> float | None:
+        """Return the newest observation time, or None when empty."""
+        return self._times[-1] if self._times else None
+
+    @property
+    def previous_s(self) -> float | None:
+        """Return the observation time before the newest one, or None."""
+        return self._times[-2] if len(self._times) > 1 else None
+
+    @property
+    def interval_s(self) -> float | None:
+        """Return the learned update interval, or None until two times are known."""
+        return self._interval_s
+
+    def add(self, observation_s: float) -> bool:
+        """Add an observation time; returns False (and learns nothing) unless newer than the latest."""
+        if self._times and observation_s <= self._times[-1]:
+            return False
+        self._times.append(observation_s)
+        if len(self._times) > 1:
+            self._estimate()
+        return True
+
+    def _estimate(self) -> None:
+        times = list(self._times)
+        intervals = [later - earlier for earlier, later in zip(times, times[1:])]
+        rough = median(intervals)
+        interval = median(d / max(1, round(d / rough)) for d in intervals)
+        latest = times[-1]
+        offsets = [(t - latest + interval / 2) % interval - interval / 2 for t in times]
+        self._interval_s = interval
+        self._anchor_s = latest + median(offsets)
+
+    def expected_update_s(self) -> float | None:
+        """Return the expected time of the first update after the latest observation.
+
+        None until two observation times are known.
+        """
+        if self._interval_s is None:
+            return None
+        interval = self._interval_s
+        slot = math.floor((self._times[-1] - self._anchor_s) / interval + 0.5)
+        return self._anchor_s + (slot + 1) * interval
+
+    def next_update_s(self, now_s: float) -> float | None:
+        """Return the expected time of the next update at or after `now_s`.
+
+        This is `expected_update_s` unless that has passed without an update
+        (the station is late or skipped it); then it is the next publish time
+        on the learned grid. None until two observation times are known.
+        """
+        expected = self.expected_update_s()
+        if expected is None or expected >= now_s:
+            return expected
+        slots = math.ceil((now_s - self._anchor_s) / self._interval_s)
+        return self._anchor_s + slots * self._interval_s
+
+    def seconds_until_next_update(self, now_s: float) -> float:
+        """Return the wait until `next_update_s`, saturated to [0, CADENCE_MAX_WAIT_S]; 0 while unknown."""
+        expected = self.next_update_s(now_s)
+        if expected is None:
+            return 0
+        return min(max(expected - now_s, 0), Constants.CADENCE_MAX_WAIT_S)
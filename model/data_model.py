@@ -1,12 +1,30 @@
-from . import station_info, weather_station
+import json
+import os
+import zlib
+from collections import OrderedDict
+
+from definitions import Constants
+from utils import json_backend
+
+from . import observation_store, station_info, weather_station
 
 
 class DataModel:
     VERSION = "0.1.0"
+    SNAPSHOT_VERSION = 2
 
     def __init__(self):
         self._station_list = station_info.WeatherStationList()  # all stations
         self._current_station = weather_station.WeatherStation()  # selected station
+        self._observations = observation_store.ObservationStore()  # bulk mode data
+        # recently selected stations outside bulk mode, least recently used first;
+        # each keeps its own history, rollups and cadence across station switches
+        self._selected_stations = OrderedDict()  # station id -> WeatherStation
+        self.city_weather = {}  # latest OpenWeatherMap current weather JSON
+        self.forecast = {}  # latest OpenWeatherMap forecast JSON
+        self.city_weather_fetched_at = 0.0  # when `city_weather` was fetched (s), 0 when not fresh
+        self.forecast_fetched_at = 0.0  # when `forecast` was fetched (s), 0 when not fresh
+        self._is_stale = False  # True while showing data restored from a snapshot
 
     def __repr__(self) -> str:
         """Short representation for debugging and logging."""
@@ -16,10 +34,29 @@ class DataModel:
     def stations(self):
         return self._station_list._stations
 
+    @property
+    def station_list(self):
+        return self._station_list
+
+    @property
+    def visible_stations(self):
+        """Stations to show in the UI station list, sorted by formatted name."""
+        return self._station_list.get_visible_stations()
+
     @property
     def current_station(self):
         return self._current_station
 
+    @property
+    def observations(self):
+        """Observations of all stations, filled in bulk mode."""
+        return self._observations
+
+    @property
+    def is_stale(self) -> bool:
+        """True when the current station data was restored from a snapshot and not yet refreshed."""
+        return self._is_stale
+
     def parse_station_list(self, station_list_json) -> bool:
         """Parse raw station list JSON into model objects.
 
@@ -29,9 +66,109 @@ class DataModel:
 
     def parse_station_data(self, station_data_json) -> bool:
         """Parse detailed station observation JSON into the current station."""
-        return self._current_station.parse(station_data_json)
+        success = self._current_station.parse(station_data_json)
+        if success:
+            self._is_stale = False
+        return success
+
+    def parse_all_station_data(self, stations_data_json) -> bool:
+        """Parse observations of all stations into the observation store.
+
+        When the store has data for the current station, `current_station`
+        becomes a view of the stored station.
+        """
+        success = self._observations.parse(stations_data_json, self._station_list)
+        stored_station = self._observations.get(self._current_station.id)
+        if stored_station is not None:
+            self._current_station = stored_station
+            self._is_stale = False
+        return success
 
     def set_currect_station(self, station_id):
-        self._current_station._station_info = self._station_list.find_station_by_id(
-            station_id
-        )
+        switched = station_id != self._current_station.id
+        if switched:
+            # OpenWeatherMap data belongs to the previous station's location
+            self.city_weather = {}
+            self.forecast = {}
+            self.city_weather_fetched_at = 0.0
+            self.forecast_fetched_at = 0.0
+
+        stored_station = self._observations.get(station_id)
+        if stored_station is not None:
+            self._current_station = stored_station
+            return
+        station = self._selected_stations.pop(station_id, None)
+        if station is None:
+            if switched or self._observations.get(self._current_station.id) is self._current_station:
+                # history, rollups and cadence belong to one station; also don't
+                # re-link a station that belongs to the observation store
+                station = weather_station.WeatherStation()
+            else:
+                station = self._current_station
+        self._selected_stations[station_id] = station
+        while len(self._selected_stations) > Constants.SELECTED_STATIONS_KEPT:
+            self._selected_stations.popitem(last=False)
+        station._station_info = self._station_list.find_station_by_id(station_id)
+        self._current_station = station
+
+    def save_snapshot(self, file_name) -> bool:
+        """Save the station catalogue, the current station's latest sensor values,
+        and the latest city weather and forecast to `file_name`.
+
+        The snapshot is a zlib-compressed JSON document of plain lists and
+        dicts. Returns True on success.
+        """
+        snapshot = {
+            "version": DataModel.SNAPSHOT_VERSION,
+            "stations": self._station_list.to_snapshot(),
+            "current_station_id": self._current_station.id,
+            "current_station": self._current_station.to_snapshot(),
+            "city_weather": self.city_weather,
+            "forecast": self.forecast,
+        }
+        try:
+            data = zlib.compress(json.dumps(snapshot, separators=(",", ":")).encode("utf-8"))
+            with open(file_name + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(file_name + ".tmp", file_name)
+            return True
+        except (OSError, TypeError, ValueError):
+            return False
+
+    def load_snapshot(self, file_name) -> bool:
+        """Restore the model from a snapshot written by `save_snapshot`.
+
+        The restored values are marked stale until the current station is
+        parsed from fresh data. Returns False, leaving the model untouched,
+        when the file is missing, unreadable, malformed or from another
+        snapshot version.
+        """
+        # build everything first, so a bad snapshot changes nothing
+        try:
+            with open(file_name, "rb") as f:
+                snapshot = json_backend.loads(zlib.decompress(f.read()))
+            if snapshot["version"] != DataModel.SNAPSHOT_VERSION:
+                return False
+            station_list = station_info.WeatherStationList()
+            station_list.restore_snapshot(snapshot["stations"])
+            current_station = weather_station.WeatherStation()
+            current_station._station_info = station_list.find_station_by_id(
+                snapshot["current_station_id"]
+            )
+            current_station.restore_snapshot(snapshot["current_station"])
+            city_weather = snapshot["city_weather"]
+            forecast = snapshot["forecast"]
+            if not isinstance(city_weather, dict) or not isinstance(forecast, dict):
+                return False
+        except Exception:
+            return False
+
+        self._station_list = station_list
+        self._current_station = current_station
+        self._selected_stations = OrderedDict([(current_station.id, current_station)])
+        self.city_weather = city_weather
+        self.forecast = forecast
+        self.city_weather_fetched_at = 0.0
+        self.forecast_fetched_at = 0.0
+        self._is_stale = True
+        return True
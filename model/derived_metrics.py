@@ -0,0 +1,227 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the engine is unavailable without it
+    np = None
+
+from definitions import Constants
+
+# Magnus formula coefficients over water and over ice (Sonntag 1990)
+MAGNUS_WATER = (17.62, 243.12)
+MAGNUS_ICE = (22.46, 272.62)
+
+# Slipperiness risk levels
+RISK_NONE = 0
+RISK_LOW = 1
+RISK_ELEVATED = 2
+RISK_HIGH = 3
+
+# Wind chill categories and the upper wind chill limit (°C) of each one
+WIND_CHILL_NONE = 0
+WIND_CHILL_COLD = 1  # below -10 °C
+WIND_CHILL_VERY_COLD = 2  # below -28 °C, frostbite possible in 10-30 min
+WIND_CHILL_FROSTBITE = 3  # below -40 °C, frostbite in 5-10 min
+WIND_CHILL_SEVERE = 4  # below -48 °C, frostbite in 2-5 min
+WIND_CHILL_LIMITS = (-10.0, -28.0, -40.0, -48.0)
+
+
+class Metric:
+    """A derived metric: a vectorized function of sensor readings and other metrics.
+
+    `inputs` name station sensors (e.g. "ILMA") or previously registered
+    metrics. `func` receives one float64 array per input, in order, holding
+    only stations where every input is valid, and returns an array of
+    results for them; other stations get `Constants.INVALID_VALUE`. Results
+    are floats, including levels and categories.
+    """
+
+    __slots__ = ("name", "inputs", "func", "description")
+
+    def __init__(self, name: str, inputs: tuple, func, description: str = ""):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.func = func
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"Metric({self.name!r}, inputs={self.inputs})"
+
+
+# name -> Metric, in registration order (a metric may use earlier metrics as inputs)
+METRICS = {}
+
+
+def register_metric(name: str, inputs, func, description: str = "") -> Metric:
+    """Register a derived metric computed by every `DerivedMetricsEngine`."""
+    for input_name in inputs:
+        if input_name == name:
+            raise ValueError(f"metric {name!r} cannot use itself as an input")
+    metric = Metric(name, inputs, func, description)
+    METRICS[name] = metric
+    return metric
+
+
+def _magnus_vapour_pressure_ln(temp, coefficients):
+    a, b = coefficients
+    return a * temp / (b + temp)
+
+
+def dew_point(temp, rh):
+    """Dew point (°C) from air temperature (°C) and relative humidity (%)."""
+    a, b = MAGNUS_WATER
+    gamma = np.log(rh / 100.0) + _magnus_vapour_pressure_ln(temp, MAGNUS_WATER)
+    return b * gamma / (a - gamma)
+
+
+def frost_point(dew_point_temp):
+    """Frost point (°C): the temperature at which the air's water vapour saturates over ice.
+
+    Equals the dew point above 0 °C, as in the road weather stations' own
+    frost point sensor (KUURAPISTE).
+    """
+    a, b = MAGNUS_ICE
+    gamma = _magnus_vapour_pressure_ln(dew_point_temp, MAGNUS_WATER)
+    return np.where(dew_point_temp >= 0.0, dew_point_temp, b * gamma / (a - gamma))
+
+
+def frost_point_margin(road_temp, frost_point_temp):
+    """Road surface temperature above the frost point (°C); frost forms at zero or below."""
+    return road_temp - frost_point_temp
+
+
+def slipperiness_risk(road_temp, margin, rain_intensity):
+    """Slipperiness risk level (`RISK_NONE` ... `RISK_HIGH`).
+
+    High: the road is at or below 0 °C and frost is forming or it is raining.
+    Elevated: the road is at most 1 °C above zero and within 1 °C of the frost point.
+    Low: the road is at most 2 °C above zero.
+    """
+    freezing = road_temp <= 0.0
+    high = freezing & ((margin <= 0.0) | (rain_intensity > 0.0))
+    elevated = (road_temp <= 1.0) & (margin < 1.0)
+    low = road_temp <= 2.0
+    return np.select([high, elevated, low], [RISK_HIGH, RISK_ELEVATED, RISK_LOW], RISK_NONE)
+
+
+def wind_chill_category(temp, wind):
+    """Wind chill category (`WIND_CHILL_NONE` ... `WIND_CHILL_SEVERE`).
+
+    Uses the wind chill index (air temperature in °C, wind in m/s at 10 m)
+    where it is defined, i.e. at or below 10 °C with wind of at least
+    4.8 km/h, and the air temperature elsewhere.
+    """
+    wind_kmh = wind * 3.6
+    v016 = np.power(np.maximum(wind_kmh, 0.0), 0.16)
+    chill = 13.12 + 0.6215 * temp - 11.37 * v016 + 0.3965 * temp * v016
+    chill = np.where((temp <= 10.0) & (wind_kmh >= 4.8), chill, temp)
+    category = np.zeros(chill.shape, dtype=np.float64)
+    for limit in WIND_CHILL_LIMITS:
+        category += chill < limit
+    return category
+
+
+register_metric("dew_point", ("ILMA", "ILMAN_KOSTEUS"), dew_point, "dew point, °C")
+register_metric("frost_point", ("dew_point",), frost_point, "frost point, °C")
+register_metric(
+    "frost_point_margin",
+    ("TIE_1", "frost_point"),
+    frost_point_margin,
+    "road surface temperature above the frost point, °C",
+)
+register_metric(
+    "slipperiness_risk",
+    ("TIE_1", "frost_point_margin", "SADE_INTENSITEETTI"),
+    slipperiness_risk,
+    "slipperiness risk level 0-3",
+)
+register_metric(
+    "wind_chill_category", ("ILMA", "KESKITUULI"), wind_chill_category, "wind chill category 0-4"
+)
+
+
+class DerivedMetricsEngine:
+    """Computes all registered metrics for many stations in one batched pass.
+
+    Results are cached per station together with the observation time they
+    were computed from; between polls only stations with a new observation
+    are recomputed. Requires numpy.
+    """
+
+    def __init__(self, metrics=None):
+        if np is None:
+            raise ImportError("DerivedMetricsEngine requires numpy")
+        self._metrics = list((metrics or METRICS).values())
+        self._sensor_inputs = []
+        for metric in self._metrics:
+            for input_name in metric.inputs:
+                if input_name not in self._sensor_inputs and not self._is_metric(input_name):
+                    self._sensor_inputs.append(input_name)
+        self._cache = {}  # station id -> (observation time, {metric name: value})
+        self.computed = 0  # station results computed
+        self.reused = 0  # station results served from the cache
+
+    def __repr__(self) -> str:
+        return f"DerivedMetricsEngine(metrics={len(self._metrics)}, cached={len(self._cache)})"
+
+    def _is_metric(self, name) -> bool:
+        return any(metric.name == name for metric in self._metrics)
+
+    @property
+    def metric_names(self) -> list:
+        return [metric.name for metric in self._metrics]
+
+    def compute(self, stations) -> dict:
+        """Return {station id: {metric name: value}} for (station id, `WeatherStation`) pairs.
+
+        `stations` is e.g. the items of a dict keyed by station id; results
+        and cache entries are keyed by the given ids. Invalid results are
+        `Constants.INVALID_VALUE`. Cache entries of stations not in
+        `stations` are dropped.
+        """
+        results = {}
+        stale = []
+        for station_id, station in stations:
+            observation_time = station.data_updated_time
+            cached = self._cache.get(station_id)
+            if cached is not None and cached[0] == observation_time:
+                results[station_id] = cached[1]
+                self.reused += 1
+            else:
+                stale.append((station_id, station, observation_time))
+
+        if stale:
+            batch = self._compute_batch(station for _, station, _ in stale)
+            for (station_id, _, observation_time), values in zip(stale, batch):
+                self._cache[station_id] = (observation_time, values)
+                results[station_id] = values
+            self.computed += len(stale)
+
+        for station_id in [i for i in self._cache if i not in results]:
+            del self._cache[station_id]
+        return results
+
+    def _compute_batch(self, stations) -> list:
+        stations = list(stations)
+        count = len(stations)
+        columns = {
+            name: np.fromiter((s.get_float(name) for s in stations), dtype=np.float64, count=count)
+            for name in self._sensor_inputs
+        }
+        valid = {name: column != Constants.INVALID_VALUE for name, column in columns.items()}
+
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            for metric in self._metrics:
+                mask = np.ones(count, dtype=bool)
+                for input_name in metric.inputs:
+                    mask &= valid[input_name]
+                column = np.full(count, Constants.INVALID_VALUE)
+                if mask.any():
+                    values = metric.func(*(columns[name][mask] for name in metric.inputs))
+                    column[mask] = values
+                ok = mask & np.isfinite(column)
+                column[~ok] = Constants.INVALID_VALUE
+                columns[metric.name] = column
+                valid[metric.name] = ok
+
+        names = self.metric_names
+        rows = zip(*(columns[name].tolist() for name in names))
+        return [dict(zip(names, row)) for row in rows]
@@ -1,3 +1,8 @@
+import math
+
+from definitions import Constants
+
+
 def ok_to_add_station(raw_name: str) -> bool:
     """Return True if a station should be included in lists (filters out test/temporary stations)."""
     station_name_filter_list = [
@@ -15,3 +20,13 @@ def ok_to_add_station(raw_name: str) -> bool:
             return False
 
     return True
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle (haversine) distance between two points in kilometres."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * Constants.EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
@@ -0,0 +1,140 @@
+import time
+from array import array
+
+from definitions import Constants
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of (timestamp, value) pairs backed by two `array('d')`.
+
+    Timestamps are seconds since the epoch and must increase: a pair that is
+    not newer than the latest one is ignored, so re-parsing an unchanged
+    reading stores nothing. Appending is O(1); when the buffer is full the
+    oldest pair is overwritten. The arrays grow up to `capacity` and are not
+    allocated up front, so memory is bounded by `capacity * 16` bytes.
+    """
+
+    __slots__ = ("_times", "_values", "_capacity", "_start")
+
+    def __init__(self, capacity: int = Constants.HISTORY_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._times = array("d")
+        self._values = array("d")
+        self._capacity = capacity
+        self._start = 0  # physical index of the oldest pair once the buffer is full
+
+    def __repr__(self) -> str:
+        return f"RingBuffer(len={len(self._times)}, capacity={self._capacity})"
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def latest(self):
+        """Return the newest (timestamp, value) pair, or None when empty."""
+        if not self._times:
+            return None
+        i = (self._start - 1) % len(self._times)
+        return self._times[i], self._values[i]
+
+    def append(self, timestamp: float, value: float) -> bool:
+        """Add a pair; returns False (and stores nothing) unless it is newer than the latest."""
+        count = len(self._times)
+        if count and timestamp <= self._times[(self._start - 1) % count]:
+            return False
+        if count < self._capacity:
+            self._times.append(timestamp)
+            self._values.append(value)
+        else:
+            self._times[self._start] = timestamp
+            self._values[self._start] = value
+            self._start = (self._start + 1) % self._capacity
+        return True
+
+    def since(self, timestamp: float) -> tuple:
+        """Return (timestamps, values) arrays of the readings at or after `timestamp`, oldest first."""
+        count = len(self._times)
+        times = self._times
+        start = self._start if count == self._capacity else 0
+
+        # binary search over the logical (oldest first) order
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if times[(start + mid) % count] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self._slice(start, lo, count)
+
+    def items(self) -> tuple:
+        """Return (timestamps, values) arrays of all readings, oldest first."""
+        count = len(self._times)
+        return self._slice(self._start if count == self._capacity else 0, 0, count)
+
+    def _slice(self, start: int, first: int, count: int) -> tuple:
+        # array slices are plain memory copies, no per-reading objects are created
+        a = start + first
+        if a >= count:
+            a -= count
+        if a + (count - first) <= count:
+            b = a + count - first
+            return self._times[a:b], self._values[a:b]
+        # the range wraps around the end of the arrays
+        return (
+            self._times[a:] + self._times[:start],
+            self._values[a:] + self._values[:start],
+        )
+
+
+class StationHistory:
+    """Observation history of one station: a `RingBuffer` per sensor id."""
+
+    __slots__ = ("_buffers", "_capacity")
+
+    def __init__(self, capacity: int = Constants.HISTORY_CAPACITY):
+        self._buffers = {}  # sensor id -> RingBuffer
+        self._capacity = capacity
+
+    def __repr__(self) -> str:
+        return f"StationHistory(sensors={len(self._buffers)})"
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def record(self, sensors) -> int:
+        """Append the valid readings of `Sensor` objects; returns the number of new pairs."""
+        added = 0
+        last_time = None
+        last_timestamp = 0.0
+        for sensor in sensors:
+            value = sensor.float_value
+            if value == Constants.INVALID_VALUE:
+                continue
+            measured_time = sensor.measured_time
+            if measured_time is not last_time:
+                # sensors of one station share a few (memoized) timestamps
+                last_time = measured_time
+                last_timestamp = measured_time.timestamp()
+            buffer = self._buffers.get(sensor.id)
+            if buffer is None:
+                buffer = self._buffers[sensor.id] = RingBuffer(self._capacity)
+            added += buffer.append(last_timestamp, value)
+        return added
+
+    def sensor(self, sensor_id: int) -> RingBuffer | None:
+        return self._buffers.get(sensor_id)
+
+    def last_hours(self, sensor_id: int, hours: float, now: float | None = None) -> tuple:
+        """Return (timestamps, values) arrays of the readings of the last `hours`, oldest first."""
+        buffer = self._buffers.get(sensor_id)
+        if buffer is None:
+            return array("d"), array("d")
+        if now is None:
+            now = time.time()
+        return buffer.since(now - hours * 3600.0)
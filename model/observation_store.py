@@ -0,0 +1,88 @@
+import time
+
+from . import derived_metrics, physics, station_info, weather_station
+
+
+class ObservationStore:
+    """Latest observations of all stations, keyed by station id.
+
+    Filled from the Digitraffic all-stations data document, which holds the
+    sensor values of every station. `WeatherStation` objects are kept across
+    updates, so each station keeps its own observation time history.
+    """
+
+    def __init__(self):
+        self._stations = {}  # station id -> WeatherStation
+        self._fetched_at = 0.0  # time.time() of the latest successful parse
+        self._metrics_engine = None  # created on first use
+
+    def __repr__(self) -> str:
+        return f"ObservationStore(stations={len(self._stations)})"
+
+    def __len__(self) -> int:
+        return len(self._stations)
+
+    def __contains__(self, station_id) -> bool:
+        return station_id in self._stations
+
+    @property
+    def fetched_at(self) -> float:
+        """Time (seconds since the epoch) of the latest successful parse, 0 if never."""
+        return self._fetched_at
+
+    @property
+    def stations(self) -> list:
+        """Return the stored `WeatherStation` objects."""
+        return list(self._stations.values())
+
+    def get(self, station_id) -> weather_station.WeatherStation | None:
+        return self._stations.get(station_id)
+
+    def feels_like_temperatures(self) -> dict:
+        """Return the feels-like temperature of every stored station, keyed by station id.
+
+        Computed in one vectorized pass when numpy is installed; stations with
+        missing readings get `Constants.INVALID_VALUE`.
+        """
+        ids = list(self._stations)
+        stations = list(self._stations.values())
+        wind = [station.wind_speed for station in stations]
+        rh = [station.air_humidity for station in stations]
+        temp = [station.air_temperature for station in stations]
+        if physics.np is None:
+            values = map(physics.fmi_feels_like_temperature, wind, rh, temp)
+        else:
+            values = physics.fmi_feels_like_temperature_array(wind, rh, temp).tolist()
+        return dict(zip(ids, values))
+
+    def derived_metrics(self) -> dict:
+        """Return {station id: {metric name: value}} of all registered derived metrics.
+
+        Stations whose observation time has not changed since the previous
+        call are served from the engine's cache. Requires numpy.
+        """
+        if self._metrics_engine is None:
+            self._metrics_engine = derived_metrics.DerivedMetricsEngine()
+        return self._metrics_engine.compute(self._stations.items())
+
+    def parse(self, stations_json, station_list: station_info.WeatherStationList) -> bool:
+        """Parse the `stations` array of the all-stations data document.
+
+        Station metadata (name, coordinates) is linked from `station_list`.
+        Returns True when all stations were parsed.
+        """
+        try:
+            for station_json in stations_json:
+                station_id = station_json["id"]
+                station = self._stations.get(station_id)
+                if station is None:
+                    station = weather_station.WeatherStation()
+                    self._stations[station_id] = station
+                station._station_info = station_list.find_station_by_id(station_id)
+                if not station.parse(station_json):
+                    return False
+        except (KeyError, TypeError, ValueError):
+            return False
+
+        self._fetched_at = time.time()
+        return True
@@ -1,5 +1,10 @@
 import math
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only the array versions need it
+    np = None
+
 from definitions import Constants
 
 
@@ -54,3 +59,72 @@ def fmi_feels_like_temperature(wind, rh, temp) -> float:
 
     except Exception:
         return Constants.INVALID_VALUE
+
+
+def _fmi_summer_simmer_index_array(rh, temp):
+    """Array version of `__fmi_summer_simmer_index`, same operation order."""
+    simmer_limit = 14.5
+    RH_REF = 50.0 / 100.0
+    r = rh / 100.0
+    result = (
+        1.8 * temp
+        - 0.55 * (1.0 - r) * (1.8 * temp - 26.0)
+        - 0.55 * (1.0 - RH_REF) * 26.0
+    ) / (1.8 * (1.0 - 0.55 * (1.0 - RH_REF)))
+    return np.where(temp <= simmer_limit, temp, result)
+
+
+def _pow_016(base):
+    """Return base ** 0.16 elementwise, bit-identical to `math.pow`.
+
+    numpy's vectorized `power` may differ from the C library `pow` in the last
+    bit, so `math.pow` is evaluated once per distinct value. Wind speeds are
+    reported with 0.1 m/s resolution, so there are only a few hundred of them.
+    """
+    unique, inverse = np.unique(base, return_inverse=True)
+    powers = np.array(
+        [math.nan if b < 0.0 else math.pow(b, 0.16) for b in unique.tolist()],
+        dtype=np.float64,
+    )
+    return powers[inverse].reshape(base.shape)
+
+
+def fmi_feels_like_temperature_array(wind, rh, temp):
+    """Compute feels-like temperatures for arrays of wind speed, humidity and temperature.
+
+    Vectorized version of `fmi_feels_like_temperature` for many stations at
+    once (requires numpy). Inputs are broadcast together; the result is a
+    float64 array holding `Constants.INVALID_VALUE` wherever the scalar
+    function would return it (an invalid input or wind speed below -1).
+    Valid elements are identical to the scalar results.
+    """
+    if np is None:
+        raise ImportError("fmi_feels_like_temperature_array requires numpy")
+
+    wind, rh, temp = np.broadcast_arrays(
+        np.asarray(wind, dtype=np.float64),
+        np.asarray(rh, dtype=np.float64),
+        np.asarray(temp, dtype=np.float64),
+    )
+    invalid = (
+        (wind == Constants.INVALID_VALUE)
+        | (rh == Constants.INVALID_VALUE)
+        | (temp == Constants.INVALID_VALUE)
+        | (wind + 1.0 < 0.0)  # math.pow of a negative base fails in the scalar version
+    )
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        a = 15.0
+        t0 = 37.0
+        chill = (
+            a
+            + (1.0 - a / t0) * temp
+            + a / t0 * _pow_016(wind + 1.0) * (temp - t0)
+        )
+
+        heat = _fmi_summer_simmer_index_array(rh, temp)
+        invalid |= heat == Constants.INVALID_VALUE
+
+        feels_like = temp + (chill - temp) + (heat - temp)
+
+    return np.where(invalid, Constants.INVALID_VALUE, feels_like)
@@ -0,0 +1,205 @@
+import math
+from array import array
+
+from definitions import Constants
+
+
+class RollupSeries:
+    """Aggregates of one sensor at one resolution, oldest bucket first.
+
+    `starts` are bucket start times (seconds since the epoch, aligned to
+    the resolution in UTC); empty buckets are left out.
+    """
+
+    __slots__ = ("resolution_s", "starts", "minimums", "maximums", "means", "counts")
+
+    def __init__(self, resolution_s: int):
+        self.resolution_s = resolution_s
+        self.starts = array("d")
+        self.minimums = array("d")
+        self.maximums = array("d")
+        self.means = array("d")
+        self.counts = array("L")
+
+    def __repr__(self) -> str:
+        return f"RollupSeries(resolution_s={self.resolution_s}, buckets={len(self.starts)})"
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class RollupRing:
+    """Min/max/sum/count of the readings of the latest `capacity` buckets of `resolution_s`.
+
+    Bucket i of the arrays is bucket number (timestamp // resolution)
+    `_first + i`. The arrays grow with the buckets seen, so a station that
+    has been polled for an hour holds a few buckets, not `capacity`; old
+    buckets are dropped a batch at a time once there are more than
+    `capacity`. Adding a reading is amortized O(1). Readings older than the
+    latest `capacity` buckets are ignored.
+    """
+
+    __slots__ = ("_resolution", "_capacity", "_first", "_counts", "_sums", "_minimums", "_maximums")
+
+    def __init__(self, resolution_s: int, capacity: int):
+        if resolution_s <= 0 or capacity <= 0:
+            raise ValueError("resolution and capacity must be positive")
+        self._resolution = resolution_s
+        self._capacity = capacity
+        self._first = 0  # bucket number of index 0
+        self._counts = array("L")
+        self._sums = array("d")
+        self._minimums = array("d")
+        self._maximums = array("d")
+
+    def __repr__(self) -> str:
+        return f"RollupRing(resolution_s={self._resolution}, capacity={self._capacity})"
+
+    @property
+    def resolution_s(self) -> int:
+        return self._resolution
+
+    @property
+    def _latest(self) -> int:
+        return self._first + len(self._counts) - 1
+
+    @property
+    def oldest_start(self) -> float:
+        """Start time of the oldest bucket the ring can hold now (inf when empty)."""
+        if not self._counts:
+            return math.inf
+        return (self._latest - self._capacity + 1) * self._resolution
+
+    def _extend(self, buckets: int) -> None:
+        self._counts.extend(array("L", [0]) * buckets)
+        zeros = array("d", [0.0]) * buckets
+        self._sums.extend(zeros)
+        self._minimums.extend(zeros)
+        self._maximums.extend(zeros)
+
+    def add(self, timestamp: float, value: float) -> None:
+        bucket = int(timestamp // self._resolution)
+        size = len(self._counts)
+        latest = self._first + size - 1
+        if not size or bucket - latest >= self._capacity:
+            # first reading, or every kept bucket is too old
+            for column in (self._counts, self._sums, self._minimums, self._maximums):
+                del column[:]
+            self._first = bucket
+            self._extend(1)
+        elif bucket > latest:
+            self._extend(bucket - latest)
+            excess = len(self._counts) - self._capacity
+            if excess > self._capacity // 4:
+                for column in (self._counts, self._sums, self._minimums, self._maximums):
+                    del column[:excess]
+                self._first += excess
+        elif bucket <= latest - self._capacity or bucket < self._first:
+            return
+
+        i = bucket - self._first
+        if self._counts[i]:
+            self._counts[i] += 1
+            self._sums[i] += value
+            if value < self._minimums[i]:
+                self._minimums[i] = value
+            if value > self._maximums[i]:
+                self._maximums[i] = value
+        else:
+            self._counts[i] = 1
+            self._sums[i] = value
+            self._minimums[i] = value
+            self._maximums[i] = value
+
+    def buckets_between(self, start_s: float, end_s: float) -> int:
+        """Return the number of buckets overlapping [start_s, end_s)."""
+        if end_s <= start_s:
+            return 0
+        return math.ceil(end_s / self._resolution) - int(start_s // self._resolution)
+
+    def series(self, start_s: float, end_s: float) -> RollupSeries:
+        """Return the non-empty buckets overlapping [start_s, end_s)."""
+        result = RollupSeries(self._resolution)
+        if not self._counts or end_s <= start_s:
+            return result
+        latest = self._latest
+        first = max(int(start_s // self._resolution), latest - self._capacity + 1, self._first)
+        last = min(math.ceil(end_s / self._resolution) - 1, latest)
+        for bucket in range(first, last + 1):
+            i = bucket - self._first
+            count = self._counts[i]
+            if count:
+                result.starts.append(bucket * self._resolution)
+                result.minimums.append(self._minimums[i])
+                result.maximums.append(self._maximums[i])
+                result.means.append(self._sums[i] / count)
+                result.counts.append(count)
+        return result
+
+
+class StationRollups:
+    """10-minute, hourly and daily aggregates of one station's sensors, kept incrementally.
+
+    Resolutions and the number of buckets kept of each are
+    `Constants.ROLLUP_RESOLUTIONS`; rings are allocated per sensor on its
+    first valid reading.
+    """
+
+    __slots__ = ("_rings", "_last_times", "_resolutions")
+
+    def __init__(self, resolutions=Constants.ROLLUP_RESOLUTIONS):
+        self._rings = {}  # sensor id -> tuple of RollupRing, finest first
+        self._last_times = {}  # sensor id -> timestamp of the latest recorded reading
+        self._resolutions = tuple(sorted(resolutions))
+
+    def __repr__(self) -> str:
+        return f"StationRollups(sensors={len(self._rings)})"
+
+    def __len__(self) -> int:
+        return len(self._rings)
+
+    def record(self, sensors) -> int:
+        """Add the valid readings of `Sensor` objects newer than the last recorded ones.
+
+        Returns the number of readings added.
+        """
+        added = 0
+        last_time = None
+        last_timestamp = 0.0
+        for sensor in sensors:
+            value = sensor.float_value
+            if value == Constants.INVALID_VALUE:
+                continue
+            measured_time = sensor.measured_time
+            if measured_time is not last_time:
+                last_time = measured_time
+                last_timestamp = measured_time.timestamp()
+            if self._last_times.get(sensor.id, -math.inf) >= last_timestamp:
+                continue
+            self._last_times[sensor.id] = last_timestamp
+            rings = self._rings.get(sensor.id)
+            if rings is None:
+                rings = self._rings[sensor.id] = tuple(
+                    RollupRing(resolution, capacity) for resolution, capacity in self._resolutions
+                )
+            for ring in rings:
+                ring.add(last_timestamp, value)
+            added += 1
+        return added
+
+    def query(self, sensor_id: int, start_s: float, end_s: float, max_points: int) -> RollupSeries:
+        """Return aggregates of a sensor over [start_s, end_s) in at most `max_points` buckets.
+
+        Uses the finest resolution that fits the point budget and still
+        holds buckets back to `start_s`, so the result is only as coarse as
+        the budget and retention require. If none does, the coarsest
+        resolution is used even if it exceeds the budget. Unknown sensors
+        give an empty series.
+        """
+        rings = self._rings.get(sensor_id)
+        if rings is None:
+            return RollupSeries(self._resolutions[-1][0])
+        for ring in rings:
+            if ring.buckets_between(start_s, end_s) <= max_points and ring.oldest_start <= start_s:
+                return ring.series(start_s, end_s)
+        return rings[-1].series(start_s, end_s)
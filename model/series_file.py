@@ -0,0 +1,406 @@
+import bisect
+import hashlib
+import math
+import mmap
+import struct
+from array import array
+
+from definitions import Constants
+
+# File layout:
+#   header    _MAGIC, version byte
+#   segments  encoded timestamps (`encode_times`) and values (`encode_values`)
+#             of blocks of up to `block_points` readings of one sensor; equal
+#             segments are stored once, e.g. the timestamps shared by all
+#             sensors of a station or the values of constant status sensors
+#   index     one `_ENTRY` per block, sorted by (station, sensor, first time)
+#   trailer   `_TRAILER`: index offset, block count, _MAGIC
+_MAGIC = b"RWTS"
+_VERSION = 1
+_HEADER = struct.Struct("<4sB")
+# station, sensor, first time, last time, count, time segment offset and
+# length, value segment offset and length
+_ENTRY = struct.Struct("<IIqqIQIQI")
+_TRAILER = struct.Struct("<QI4s")
+
+# Value segment modes: 0-3 = values are decimals with that many digits and
+# are stored as delta-encoded integers; _MODE_CONSTANT = one value repeated;
+# _MODE_XOR = values are stored as XORed IEEE 754 bit patterns (Gorilla style).
+_MAX_DECIMALS = 3
+_MODE_CONSTANT = 0xFE
+_MODE_XOR = 0xFF
+_CONSTANT = struct.Struct("<d")
+
+# Prefix code buckets (prefix, prefix bits, payload bits) for zigzag encoded
+# integers; a single 0 bit encodes zero. Timestamps (delta of delta, s) are
+# nearly always zero; value deltas of slowly changing sensors are small.
+_TIME_BUCKETS = ((0b10, 2, 7), (0b110, 3, 9), (0b1110, 4, 12), (0b1111, 4, 64))
+_VALUE_BUCKETS = ((0b10, 2, 3), (0b110, 3, 7), (0b1110, 4, 16), (0b1111, 4, 64))
+
+
+def _zigzag(n: int) -> int:
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+
+def _unzigzag(n: int) -> int:
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+
+class _BitWriter:
+    __slots__ = ("_out", "_acc", "_bits")
+
+    def __init__(self, out: bytearray):
+        self._out = out
+        self._acc = 0
+        self._bits = 0
+
+    def write(self, value: int, bits: int) -> None:
+        acc = (self._acc << bits) | value
+        bits += self._bits
+        out = self._out
+        while bits >= 8:
+            bits -= 8
+            out.append((acc >> bits) & 0xFF)
+        self._acc = acc & ((1 << bits) - 1)
+        self._bits = bits
+
+    def write_bucketed(self, value: int, buckets) -> None:
+        if value == 0:
+            self.write(0, 1)
+            return
+        n = _zigzag(value)
+        for prefix, prefix_bits, payload_bits in buckets:
+            if n < 1 << payload_bits:
+                self.write((prefix << payload_bits) | n, prefix_bits + payload_bits)
+                return
+        raise ValueError(f"{value} does not fit in {buckets[-1][2]} bits")
+
+    def close(self) -> None:
+        if self._bits:
+            self.write(0, 8 - self._bits)
+
+
+class _BitReader:
+    __slots__ = ("_data", "_left")
+
+    def __init__(self, data):
+        # one integer holds the whole block, reads are shifts and masks
+        self._data = int.from_bytes(data, "big")
+        self._left = len(data) * 8  # bits not read yet
+
+    def read(self, bits: int) -> int:
+        self._left -= bits
+        if self._left < 0:
+            raise ValueError("truncated block")
+        return (self._data >> self._left) & ((1 << bits) - 1)
+
+    def read_bucketed(self, buckets) -> int:
+        if not self.read(1):
+            return 0
+        # the prefix is unary: each further 1 bit selects the next bucket,
+        # the last bucket needs no terminating 0
+        last = len(buckets) - 1
+        for i, (_, _, payload_bits) in enumerate(buckets):
+            if i == last or not self.read(1):
+                return _unzigzag(self.read(payload_bits))
+        raise ValueError("invalid prefix")
+
+
+def _decimals(values) -> int:
+    """Return the fewest decimals (up to `_MAX_DECIMALS`) that represent all values exactly, or -1."""
+    if any(v == 0.0 and math.copysign(1.0, v) < 0 for v in values):
+        return -1  # -0.0 would come back as 0.0
+    for decimals in range(_MAX_DECIMALS + 1):
+        scale = 10**decimals
+        try:
+            if all(round(v * scale) / scale == v and abs(v * scale) < 2**53 for v in values):
+                return decimals
+        except (OverflowError, ValueError):  # inf or nan
+            return -1
+    return -1
+
+
+def encode_times(times) -> bytes:
+    """Encode increasing integer timestamps (seconds) of a block.
+
+    The first timestamp is not stored (it is kept in the file index); the
+    others are stored as the delta of their delta, one bit when readings
+    arrive at a regular interval.
+    """
+    if not len(times):
+        raise ValueError("a block needs at least one reading")
+    out = bytearray()
+    writer = _BitWriter(out)
+    previous_delta = 0
+    for previous, current in zip(times, times[1:]):
+        delta = current - previous
+        if delta <= 0:
+            raise ValueError("timestamps must increase")
+        writer.write_bucketed(delta - previous_delta, _TIME_BUCKETS)
+        previous_delta = delta
+    writer.close()
+    return bytes(out)
+
+
+def decode_times(data, first_time: int, count: int) -> array:
+    """Decode `count` timestamps encoded by `encode_times` into an `array('d')`."""
+    reader = _BitReader(data)
+    times = array("d", [first_time])
+    current, delta = first_time, 0
+    for _ in range(count - 1):
+        delta += reader.read_bucketed(_TIME_BUCKETS)
+        current += delta
+        times.append(current)
+    return times
+
+
+def encode_values(values) -> bytes:
+    """Encode the float values of a block.
+
+    Values that are decimals with at most three digits (nearly all sensor
+    readings) are stored as delta-encoded integers, one bit when unchanged;
+    other values are XORed with the previous value and only the meaningful
+    bits are stored. A block of one repeated value stores it once.
+    """
+    if not len(values):
+        raise ValueError("a block needs at least one reading")
+    bit_patterns = memoryview(array("d", values).tobytes()).cast("Q")
+    if bit_patterns.tolist().count(bit_patterns[0]) == len(bit_patterns):
+        return bytes([_MODE_CONSTANT]) + _CONSTANT.pack(values[0])
+
+    decimals = _decimals(values)
+    out = bytearray([_MODE_XOR if decimals < 0 else decimals])
+    writer = _BitWriter(out)
+    if decimals >= 0:
+        scale = 10**decimals
+        previous = 0
+        for value in values:
+            scaled = round(value * scale)
+            writer.write_bucketed(scaled - previous, _VALUE_BUCKETS)
+            previous = scaled
+    else:
+        previous = bit_patterns[0]
+        writer.write(previous, 64)
+        leading, meaningful = 64, 0  # window of the previous stored XOR
+        for pattern in bit_patterns[1:]:
+            xor = pattern ^ previous
+            previous = pattern
+            if xor == 0:
+                writer.write(0, 1)
+                continue
+            xor_leading = min(64 - xor.bit_length(), 31)
+            xor_trailing = (xor & -xor).bit_length() - 1
+            if xor_leading >= leading and xor_trailing >= 64 - leading - meaningful:
+                writer.write(0b10, 2)
+                writer.write(xor >> (64 - leading - meaningful), meaningful)
+            else:
+                leading = xor_leading
+                meaningful = 64 - xor_leading - xor_trailing
+                writer.write(0b11, 2)
+                writer.write(leading, 5)
+                writer.write(meaningful & 63, 6)  # 64 meaningful bits is stored as 0
+                writer.write(xor >> xor_trailing, meaningful)
+    writer.close()
+    return bytes(out)
+
+
+def decode_values(data, count: int) -> array:
+    """Decode `count` values encoded by `encode_values` into an `array('d')`."""
+    mode = data[0]
+    if mode == _MODE_CONSTANT:
+        return array("d", _CONSTANT.unpack_from(data, 1)) * count
+    reader = _BitReader(data[1:])
+    if mode <= _MAX_DECIMALS:
+        scale = 10**mode
+        values = array("d")
+        scaled = 0
+        for _ in range(count):
+            scaled += reader.read_bucketed(_VALUE_BUCKETS)
+            values.append(scaled / scale)
+        return values
+    if mode == _MODE_XOR:
+        patterns = array("Q", [reader.read(64)])
+        previous = patterns[0]
+        leading, meaningful = 64, 0
+        for _ in range(count - 1):
+            if reader.read(1):
+                if reader.read(1):
+                    leading = reader.read(5)
+                    meaningful = reader.read(6) or 64
+                previous ^= reader.read(meaningful) << (64 - leading - meaningful)
+            patterns.append(previous)
+        return array("d", patterns.tobytes())
+    raise ValueError(f"unknown value segment mode {mode}")
+
+
+class SeriesFileWriter:
+    """Writes sensor histories into a compressed series file (see `SeriesFileReader`).
+
+    Each series is split into blocks of up to `block_points` readings whose
+    timestamps and values are encoded with `encode_times` and
+    `encode_values` and written as they are added. A segment equal to one
+    written earlier is not written again; only the block index and segment
+    digests are kept in memory until `close` writes the index at the end of
+    the file.
+    """
+
+    def __init__(self, file_name: str, block_points: int = Constants.SERIES_BLOCK_POINTS):
+        if block_points <= 0:
+            raise ValueError("block_points must be positive")
+        self._file = open(file_name, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION))
+        self._block_points = block_points
+        self._entries = []
+        self._segments = {}  # segment digest -> (offset, length)
+        self._last_times = {}  # (station id, sensor id) -> last written timestamp
+        self.points = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write_segment(self, data: bytes) -> tuple:
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        location = self._segments.get(digest)
+        if location is None:
+            location = self._segments[digest] = (self._file.tell(), len(data))
+            self._file.write(data)
+        return location
+
+    def add_series(self, station_id: int, sensor_id: int, times, values) -> None:
+        """Append readings of one sensor: integer timestamps (seconds, increasing) and values.
+
+        A series can be added in parts, each starting after the previous one.
+        """
+        if len(times) != len(values):
+            raise ValueError("times and values differ in length")
+        if not len(times):
+            return
+        key = (station_id, sensor_id)
+        times = [int(t) for t in times]
+        if times[0] <= self._last_times.get(key, times[0] - 1):
+            raise ValueError(f"readings of {key} must start after the previous ones")
+        for start in range(0, len(times), self._block_points):
+            block_times = times[start : start + self._block_points]
+            time_location = self._write_segment(encode_times(block_times))
+            value_location = self._write_segment(encode_values(values[start : start + self._block_points]))
+            self._entries.append(
+                (
+                    station_id,
+                    sensor_id,
+                    block_times[0],
+                    block_times[-1],
+                    len(block_times),
+                    *time_location,
+                    *value_location,
+                )
+            )
+        self._last_times[key] = times[-1]
+        self.points += len(times)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._entries.sort()
+        for entry in self._entries:
+            self._file.write(_ENTRY.pack(*entry))
+        self._file.write(_TRAILER.pack(index_offset, len(self._entries), _MAGIC))
+        self._file.close()
+
+
+class SeriesFileReader:
+    """Reads a file written by `SeriesFileWriter` through a read-only memory map.
+
+    Opening reads only the block index. `scan` decodes just the blocks of
+    the requested sensor that overlap the requested time range, directly
+    from the mapped file without copying it into memory.
+    """
+
+    def __init__(self, file_name: str):
+        with open(file_name, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._view = memoryview(self._mmap)
+            self._index = self._read_index()
+        except (ValueError, struct.error):
+            self.close()
+            raise
+        self.blocks_decoded = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"SeriesFileReader(series={len(self._index)})"
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _read_index(self) -> dict:
+        size = len(self._view)
+        if size < _HEADER.size + _TRAILER.size:
+            raise ValueError("not a series file")
+        magic, version = _HEADER.unpack_from(self._view, 0)
+        index_offset, count, trailer_magic = _TRAILER.unpack_from(self._view, size - _TRAILER.size)
+        if magic != _MAGIC or trailer_magic != _MAGIC or version != _VERSION:
+            raise ValueError("not a series file or an unsupported version")
+        if index_offset + count * _ENTRY.size != size - _TRAILER.size:
+            raise ValueError("corrupt series file index")
+
+        index = {}  # (station id, sensor id) -> (first times, last times, block locations)
+        for station_id, sensor_id, first, last, *location in _ENTRY.iter_unpack(
+            self._view[index_offset : size - _TRAILER.size]
+        ):
+            blocks = index.get((station_id, sensor_id))
+            if blocks is None:
+                blocks = index[(station_id, sensor_id)] = ([], [], [])
+            blocks[0].append(first)
+            blocks[1].append(last)
+            blocks[2].append(location)
+        return index
+
+    def series_keys(self) -> list:
+        """Return the (station id, sensor id) pairs in the file, sorted."""
+        return sorted(self._index)
+
+    def scan(
+        self, station_id: int, sensor_id: int, start_s: float | None = None, end_s: float | None = None
+    ) -> tuple:
+        """Return (timestamps, values) arrays of a sensor's readings in [start_s, end_s), oldest first.
+
+        Either bound may be None for no limit. Unknown sensors give empty arrays.
+        """
+        times, values = array("d"), array("d")
+        blocks = self._index.get((station_id, sensor_id))
+        if blocks is None:
+            return times, values
+        firsts, lasts, locations = blocks
+        view = self._view
+        first_block = 0 if start_s is None else bisect.bisect_left(lasts, start_s)
+        for i in range(first_block, len(firsts)):
+            if end_s is not None and firsts[i] >= end_s:
+                break
+            count, time_offset, time_length, value_offset, value_length = locations[i]
+            block_times = decode_times(view[time_offset : time_offset + time_length], firsts[i], count)
+            a = 0 if start_s is None else bisect.bisect_left(block_times, start_s)
+            b = count if end_s is None else bisect.bisect_left(block_times, end_s)
+            if a < b:
+                block_values = decode_values(view[value_offset : value_offset + value_length], count)
+                times.extend(block_times[a:b])
+                values.extend(block_values[a:b])
+            self.blocks_decoded += 1
+        return times, values
+
+    def close(self) -> None:
+        view = getattr(self, "_view", None)
+        if view is not None:
+            view.release()
+            self._view = None
+        if not self._mmap.closed:
+            self._mmap.close()
@@ -0,0 +1,202 @@
+import heapq
+import math
+
+from definitions import Constants
+
+
+class SpatialIndex:
+    """Grid index of station locations for nearest-station and radius queries.
+
+    Locations are mapped to points on a sphere of the Earth's radius in 3D
+    (x, y, z in kilometres) and bucketed into cubic cells of `cell_km`. The
+    straight-line (chord) distance between two such points grows
+    monotonically with the great-circle distance, so nearest neighbours by
+    chord are nearest neighbours on the ground. This avoids the longitude
+    wrap-around and the shrinking longitude degrees of a plain lat/lon grid.
+
+    Queries visit the cells around the query point ring by ring and stop once
+    no unvisited cell can hold a closer station, so results are exact.
+
+    Items are keyed by station id; `sync` updates the index in place when the
+    catalogue changes, only moving stations that were added, moved or removed.
+    """
+
+    def __init__(self, cell_km: float = Constants.SPATIAL_INDEX_CELL_KM):
+        self._cell_km = cell_km
+        self._cells = {}  # (i, j, k) -> {station id: (x, y, z, item)}
+        self._locations = {}  # station id -> (lat, lon, cell)
+
+    def __repr__(self) -> str:
+        return f"SpatialIndex(items={len(self._locations)}, cells={len(self._cells)})"
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, item_id) -> bool:
+        return item_id in self._locations
+
+    def insert(self, item_id, lat: float, lon: float, item=None) -> None:
+        """Add an item, or move it if `item_id` is already indexed."""
+        location = self._locations.get(item_id)
+        if location is not None:
+            if location[0] == lat and location[1] == lon:
+                self._cells[location[2]][item_id] = self._cells[location[2]][item_id][:3] + (item,)
+                return
+            self.remove(item_id)
+
+        point = _to_point(lat, lon)
+        cell = self._cell_of(point)
+        self._cells.setdefault(cell, {})[item_id] = point + (item,)
+        self._locations[item_id] = (lat, lon, cell)
+
+    def remove(self, item_id) -> None:
+        location = self._locations.pop(item_id, None)
+        if location is None:
+            return
+        bucket = self._cells[location[2]]
+        del bucket[item_id]
+        if not bucket:
+            del self._cells[location[2]]
+
+    def sync(self, stations) -> bool:
+        """Make the index match `stations` (`WeatherStationInfo` objects).
+
+        Only added, moved and removed stations are touched. Returns True if
+        the index changed.
+        """
+        changed = False
+        seen = set()
+        for station in stations:
+            seen.add(station.id)
+            location = self._locations.get(station.id)
+            lat = station.coordinates.latitude
+            lon = station.coordinates.longitude
+            if location is None or location[0] != lat or location[1] != lon:
+                changed = True
+            self.insert(station.id, lat, lon, station)
+
+        for item_id in [i for i in self._locations if i not in seen]:
+            self.remove(item_id)
+            changed = True
+        return changed
+
+    def nearest(self, lat: float, lon: float, k: int = 1, predicate=None) -> list:
+        """Return up to `k` (item, distance_km) pairs closest to (lat, lon), nearest first.
+
+        Items for which `predicate(item)` is False are skipped.
+        """
+        if k <= 0 or not self._cells:
+            return []
+
+        point = _to_point(lat, lon)
+        center = self._cell_of(point)
+        best = []  # max-heap of (-chord, id, item) holding the k closest so far
+        radius = 0
+        while True:
+            if (2 * radius + 1) ** 3 >= len(self._cells):
+                # the ring covers more cells than are occupied: scan the rest
+                cells = (c for c in self._cells if _ring(c, center) >= radius)
+                self._collect(point, cells, k, predicate, best)
+                break
+
+            self._collect(point, _shell(center, radius), k, predicate, best)
+            # points outside the visited rings are more than radius * cell_km away
+            if len(best) == k and -best[0][0] <= radius * self._cell_km:
+                break
+            radius += 1
+
+        return [(item, _chord_to_km(-neg_chord)) for neg_chord, _, item in sorted(best, reverse=True)]
+
+    def within(self, lat: float, lon: float, radius_km: float, predicate=None) -> list:
+        """Return (item, distance_km) pairs within `radius_km` of (lat, lon), nearest first."""
+        if radius_km < 0 or not self._cells:
+            return []
+
+        point = _to_point(lat, lon)
+        max_chord = _km_to_chord(radius_km)
+        center = self._cell_of(point)
+        reach = int(math.ceil(max_chord / self._cell_km))
+        if (2 * reach + 1) ** 3 >= len(self._cells):
+            cells = self._cells.keys()
+        else:
+            cells = (
+                (center[0] + i, center[1] + j, center[2] + k)
+                for i in range(-reach, reach + 1)
+                for j in range(-reach, reach + 1)
+                for k in range(-reach, reach + 1)
+            )
+
+        found = []
+        for cell in cells:
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                continue
+            for x, y, z, item in bucket.values():
+                chord = math.dist(point, (x, y, z))
+                if chord <= max_chord and (predicate is None or predicate(item)):
+                    found.append((chord, item))
+        found.sort(key=lambda pair: pair[0])
+        return [(item, _chord_to_km(chord)) for chord, item in found]
+
+    def _collect(self, point, cells, k, predicate, best) -> None:
+        for cell in cells:
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                continue
+            for item_id, (x, y, z, item) in bucket.items():
+                chord = math.dist(point, (x, y, z))
+                if len(best) == k and chord >= -best[0][0]:
+                    continue
+                if predicate is not None and not predicate(item):
+                    continue
+                entry = (-chord, item_id, item)
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                else:
+                    heapq.heapreplace(best, entry)
+
+    def _cell_of(self, point) -> tuple:
+        size = self._cell_km
+        return (
+            int(math.floor(point[0] / size)),
+            int(math.floor(point[1] / size)),
+            int(math.floor(point[2] / size)),
+        )
+
+
+def _to_point(lat: float, lon: float) -> tuple:
+    phi = math.radians(lat)
+    lam = math.radians(lon)
+    r = Constants.EARTH_RADIUS_KM
+    return (r * math.cos(phi) * math.cos(lam), r * math.cos(phi) * math.sin(lam), r * math.sin(phi))
+
+
+def _chord_to_km(chord: float) -> float:
+    r = Constants.EARTH_RADIUS_KM
+    return 2 * r * math.asin(min(1.0, chord / (2 * r)))
+
+
+def _km_to_chord(distance_km: float) -> float:
+    r = Constants.EARTH_RADIUS_KM
+    return 2 * r * math.sin(min(math.pi, distance_km / r) / 2)
+
+
+def _ring(cell, center) -> int:
+    """Chebyshev distance (in cells) between two cells."""
+    return max(abs(cell[0] - center[0]), abs(cell[1] - center[1]), abs(cell[2] - center[2]))
+
+
+def _shell(center, radius):
+    """Yield the cells at Chebyshev distance `radius` from `center`."""
+    ci, cj, ck = center
+    if radius == 0:
+        yield center
+        return
+    for i in range(-radius, radius + 1):
+        for j in range(-radius, radius + 1):
+            if abs(i) == radius or abs(j) == radius:
+                for k in range(-radius, radius + 1):
+                    yield (ci + i, cj + j, ck + k)
+            else:
+                yield (ci + i, cj + j, ck - radius)
+                yield (ci + i, cj + j, ck + radius)
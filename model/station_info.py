@@ -1,12 +1,26 @@
+import sys
 from datetime import datetime
 
+from dateutil import tz
+
 from .helpers import ok_to_add_station
+from .spatial_index import SpatialIndex
+from .station_table import HAS_NUMPY, StationTable
 from utils.utils import Utils
 from utils.weather_utils import WeatherUtils
 
+# shared default for timestamps that have not been parsed yet
+EPOCH = datetime(1970, 1, 1, 0, 0, 0)
+
 
+# The catalogue holds several hundred stations, so the objects use __slots__
+# instead of per-instance dictionaries.
 class WeatherStationInfo:
+    __slots__ = ("_formatted_name", "_visible", "_coordinates", "_properties")
+
     class Coordinates:
+        __slots__ = ("_lat", "_lon", "_alt")
+
         def __init__(self, lat=0.0, lon=0.0, alt=0.0):
             self._lat = lat  # location latitude
             self._lon = lon  # location longitude
@@ -25,14 +39,17 @@ class WeatherStationInfo:
             return self._alt
 
     class Properties:
+        __slots__ = ("_id", "_name", "_collection_status", "_data_updated_time")
+
         def __init__(self):
             self._id = int(0)
             self._name = ""
             self._collection_status = ""
-            self._data_updated_time = datetime(1970, 1, 1, 0, 0, 0)
+            self._data_updated_time = EPOCH
 
     def __init__(self):
         self._formatted_name = ""
+        self._visible = False  # True if the station is shown in station lists
         self._coordinates = WeatherStationInfo.Coordinates()
         self._properties = WeatherStationInfo.Properties()
 
@@ -46,15 +63,55 @@ class WeatherStationInfo:
         self._coordinates._lon = station_json["geometry"]["coordinates"][0]
         self._coordinates._alt = station_json["geometry"]["coordinates"][2]
         self._properties._id = station_json["id"]
-        self._properties._name = station_json["properties"]["name"]
-        self._properties._collection_status = station_json["properties"][
-            "collectionStatus"
-        ]
+        self._set_name(station_json["properties"]["name"])
+        collection_status = station_json["properties"]["collectionStatus"]
+        if isinstance(collection_status, str):
+            collection_status = sys.intern(collection_status)
+        self._properties._collection_status = collection_status
         self._properties._data_updated_time = Utils.timestamp_to_datetime(
             station_json["properties"]["dataUpdatedTime"]
         )
         return True
 
+    def to_snapshot(self) -> tuple:
+        """Return the station as a compact tuple for `DataModel.save_snapshot`."""
+        return (
+            self._properties._id,
+            self._properties._name,
+            self._properties._collection_status,
+            self._properties._data_updated_time.timestamp(),
+            self._coordinates._lat,
+            self._coordinates._lon,
+            self._coordinates._alt,
+        )
+
+    @staticmethod
+    def from_snapshot(row: tuple) -> "WeatherStationInfo":
+        """Create a `WeatherStationInfo` from a tuple made by `to_snapshot`."""
+        station_info = WeatherStationInfo()
+        (
+            station_info._properties._id,
+            name,
+            station_info._properties._collection_status,
+            data_updated_ts,
+            station_info._coordinates._lat,
+            station_info._coordinates._lon,
+            station_info._coordinates._alt,
+        ) = row
+        station_info._properties._data_updated_time = datetime.fromtimestamp(
+            data_updated_ts, tz.tzutc()
+        )
+        station_info._set_name(name)
+        return station_info
+
+    def _set_name(self, name: str) -> None:
+        """Set the raw name, precomputing the formatted name and list visibility when it changes."""
+        if name == self._properties._name and self._formatted_name != "":
+            return
+        self._properties._name = name
+        self._formatted_name = WeatherUtils.format_station_name(name)
+        self._visible = ok_to_add_station(name)
+
     @property
     def id(self) -> int:
         """Station identifier as an integer parsed from source JSON."""
@@ -74,54 +131,163 @@ class WeatherStationInfo:
             )
         return self._formatted_name
 
+    @property
+    def is_visible(self) -> bool:
+        """True if the station passes `ok_to_add_station` and is shown in station lists."""
+        return self._visible
+
     @property
     def coordinates(self):
         return self._coordinates
 
 
+def _is_visible(station: WeatherStationInfo) -> bool:
+    return station.is_visible
+
+
 class WeatherStationList:
     def __init__(self):
         # self._data_updated_time = datetime(1970, 1, 1, 0, 0, 0)
         self._stations = [WeatherStationInfo()]  # list of known weather stations
+        self._table = None  # columnar view, built on first use after each parse
+        self._spatial_index = SpatialIndex()
+        self._rebuild_index()
 
     def parse(self, station_list_json) -> bool:
-        self._stations.clear()
+        """Parse the station catalogue JSON.
+
+        Stations already known by id are updated in place, so their formatted
+        name and visibility are only recomputed when the raw name changes, and
+        the lookup indexes and the visible station list are only rebuilt when
+        stations were added, removed or renamed.
+
+        `station_list_json` may be any iterable of station objects, e.g. a
+        stream decoded while downloading. If it is invalid or raises
+        `ValueError`, False is returned and the previous list is kept.
+        """
+        stations = []
+        by_id = {}
+        catalogue_changed = False
+        parsed = True
+
+        try:
+            for station_json in station_list_json:
+                station_info = self._by_id.get(station_json["id"])
+                if station_info is None:
+                    station_info = WeatherStationInfo()
+                    catalogue_changed = True
+                old_name = station_info.name
+                parsed = station_info.parse(station_json)
+                if station_info.name != old_name:
+                    catalogue_changed = True
+                if not parsed:
+                    break
+                stations.append(station_info)
+                by_id.setdefault(station_info.id, station_info)
+        except (KeyError, TypeError, ValueError):
+            parsed = False
+
+        if not parsed:
+            # known stations may have been updated in place before the failure
+            self._table = None
+            self._spatial_index_synced = False
+            if catalogue_changed:
+                self._rebuild_index()
+            return False
 
-        for station_json in station_list_json:
-            station_info = WeatherStationInfo()
-            if not station_info.parse(station_json):
-                return False
-            self._stations.append(station_info)
+        if len(by_id) != len(self._by_id):
+            catalogue_changed = True  # stations were removed
 
+        self._stations[:] = stations
+        self._table = None  # coordinates, status and times may have changed
+        self._spatial_index_synced = False
+        if catalogue_changed:
+            self._rebuild_index()
         return True
 
+    def _rebuild_index(self) -> None:
+        """Rebuild the id and formatted name lookups; the first station wins on duplicates."""
+        self._by_id = {}
+        self._by_name = {}
+        for station in self._stations:
+            self._by_id.setdefault(station.id, station)
+            self._by_name.setdefault(station.formatted_name, station)
+        self._visible_stations = None  # built on first use
+        self._spatial_index_synced = False
+
+    def to_snapshot(self) -> list:
+        return [station.to_snapshot() for station in self._stations]
+
+    def restore_snapshot(self, rows) -> None:
+        self._stations = [WeatherStationInfo.from_snapshot(row) for row in rows]
+        self._table = None
+        self._rebuild_index()
+
     @property
     def stations(self):
         return self._stations
 
+    @property
+    def table(self) -> StationTable | None:
+        """Columnar NumPy view of the catalogue for vectorized queries.
+
+        Built once after each `parse` on first use. None if numpy is not installed.
+        """
+        if self._table is None and HAS_NUMPY:
+            self._table = StationTable(self._stations)
+        return self._table
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """Index of station locations for nearest-station and radius queries.
+
+        Updated incrementally on first use after a `parse`: only stations that
+        were added, moved or removed are re-indexed.
+        """
+        if not self._spatial_index_synced:
+            self._spatial_index.sync(self._by_id.values())
+            self._spatial_index_synced = True
+        return self._spatial_index
+
+    def find_nearest_stations(self, lat: float, lon: float, count: int = 1, visible_only=True) -> list:
+        """Return up to `count` (WeatherStationInfo, distance_km) pairs nearest to (lat, lon)."""
+        predicate = _is_visible if visible_only else None
+        return self.spatial_index.nearest(lat, lon, count, predicate)
+
+    def find_stations_within(self, lat: float, lon: float, radius_km: float, visible_only=True) -> list:
+        """Return (WeatherStationInfo, distance_km) pairs within `radius_km` of (lat, lon), nearest first."""
+        predicate = _is_visible if visible_only else None
+        return self.spatial_index.within(lat, lon, radius_km, predicate)
+
     def sort_by_station_name(self):
         if len(self._stations) > 1:
             self._stations.sort(key=lambda x: x.formatted_name)
+            self._table = None  # row order changed
 
     def find_station_id(self, formatted_name) -> int:
         station = self.find_station_by_name(formatted_name)
         return station.id
 
     def find_station_by_id(self, id: int) -> WeatherStationInfo:
-        for station in self._stations:
-            if id == station.id:
-                return station
-        return WeatherStationInfo()
+        station = self._by_id.get(id)
+        if station is None:
+            return WeatherStationInfo()
+        return station
 
     def find_station_by_name(self, name: str) -> WeatherStationInfo:
-        for station in self._stations:
-            if name == station.formatted_name:
-                return station
-        return WeatherStationInfo()
+        station = self._by_name.get(name)
+        if station is None:
+            return WeatherStationInfo()
+        return station
+
+    def get_visible_stations(self) -> list:
+        """Return the stations shown in station lists, sorted by formatted name (cached)."""
+        if self._visible_stations is None:
+            self._visible_stations = sorted(
+                (station for station in self._stations if station.is_visible),
+                key=lambda x: x.formatted_name,
+            )
+        return self._visible_stations
 
     def get_station_name_list(self):
-        list = []
-        for station in self._stations:
-            if ok_to_add_station(station.name):
-                list.append(station.formatted_name)
-        return list
+        return [station.formatted_name for station in self.get_visible_stations()]
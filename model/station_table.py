@@ -0,0 +1,114 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the table is unavailable without it
+    np = None
+
+from definitions import Constants
+
+HAS_NUMPY = np is not None
+
+
+class StationTable:
+    """Columnar view of the station catalogue for vectorized queries.
+
+    Holds one contiguous NumPy array per field (id, lat, lon, alt, collection
+    status, data updated time); row `i` describes `stations[i]`. Queries return
+    row index arrays, use `stations_at` to get the `WeatherStationInfo` objects.
+
+    Requires numpy, see `HAS_NUMPY`.
+    """
+
+    def __init__(self, stations):
+        if np is None:
+            raise ImportError("StationTable requires numpy")
+
+        self._stations = list(stations)
+        count = len(self._stations)
+        self.ids = np.fromiter((s.id for s in self._stations), dtype=np.int64, count=count)
+        self.lat = np.fromiter(
+            (s.coordinates.latitude for s in self._stations), dtype=np.float64, count=count
+        )
+        self.lon = np.fromiter(
+            (s.coordinates.longitude for s in self._stations), dtype=np.float64, count=count
+        )
+        self.alt = np.fromiter(
+            (s.coordinates.altitude for s in self._stations), dtype=np.float64, count=count
+        )
+        # data updated time as seconds since the epoch (UTC)
+        self.data_updated = np.fromiter(
+            (s._properties._data_updated_time.timestamp() for s in self._stations),
+            dtype=np.float64,
+            count=count,
+        )
+
+        # collection status as small integer codes into `status_names`
+        self.status_names = []
+        codes = {}
+        status = np.empty(count, dtype=np.int16)
+        for row, station in enumerate(self._stations):
+            name = station._properties._collection_status
+            code = codes.get(name)
+            if code is None:
+                code = codes[name] = len(self.status_names)
+                self.status_names.append(name)
+            status[row] = code
+        self.status = status
+
+    def __repr__(self) -> str:
+        return f"StationTable(rows={len(self._stations)})"
+
+    def __len__(self) -> int:
+        return len(self._stations)
+
+    def stations_at(self, rows) -> list:
+        """Return the `WeatherStationInfo` objects of the given rows, in order."""
+        return [self._stations[row] for row in rows]
+
+    def in_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """Return the rows inside the latitude/longitude bounding box (inclusive)."""
+        mask = (
+            (self.lat >= min_lat)
+            & (self.lat <= max_lat)
+            & (self.lon >= min_lon)
+            & (self.lon <= max_lon)
+        )
+        return np.flatnonzero(mask)
+
+    def with_status(self, collection_status: str):
+        """Return the rows whose collection status equals `collection_status`."""
+        try:
+            code = self.status_names.index(collection_status)
+        except ValueError:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self.status == code)
+
+    def updated_since(self, timestamp_s: float):
+        """Return the rows whose data was updated at or after `timestamp_s` (epoch seconds)."""
+        return np.flatnonzero(self.data_updated >= timestamp_s)
+
+    def distances_km(self, lat: float, lon: float, rows=None):
+        """Return great-circle distances from (lat, lon) to each row (or to `rows`)."""
+        station_lat = self.lat if rows is None else self.lat[rows]
+        station_lon = self.lon if rows is None else self.lon[rows]
+        phi1 = np.radians(lat)
+        phi2 = np.radians(station_lat)
+        d_phi = phi2 - phi1
+        d_lambda = np.radians(station_lon - lon)
+        a = np.sin(d_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2) ** 2
+        return 2 * Constants.EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def sort_by_distance(self, lat: float, lon: float, rows=None, limit=None):
+        """Return rows (all, or `rows`) ordered by distance from (lat, lon).
+
+        With `limit` only the closest `limit` rows are returned; they are
+        selected with a partial sort.
+        """
+        if rows is None:
+            rows = np.arange(len(self._stations))
+        else:
+            rows = np.asarray(rows, dtype=np.intp)
+        distances = self.distances_km(lat, lon, rows)
+        if limit is not None and limit < len(rows):
+            nearest = np.argpartition(distances, limit)[:limit]
+            return rows[nearest[np.argsort(distances[nearest], kind="stable")]]
+        return rows[np.argsort(distances, kind="stable")]
@@ -1,16 +1,45 @@
 import math
+import sys
 from datetime import datetime
 from enum import Enum
 
+from dateutil import tz
+
 from definitions import Constants, ConversionType
 
 from utils.utils import Utils
 
 from . import station_info
+from .cadence import CadenceEstimator
 from .helpers import ok_to_add_station
+from .history import StationHistory
+from .rollups import RollupSeries, StationRollups
+from .station_info import EPOCH
+
+
+def _intern(value):
+    """Intern strings that repeat across sensors and stations; other values pass through."""
+    return sys.intern(value) if isinstance(value, str) else value
 
 
 class Sensor:
+    # An all-station payload holds tens of thousands of sensors: no instance
+    # dictionaries, and the repeated name/unit strings are interned.
+    __slots__ = (
+        "_id",
+        "_station_id",
+        "_name",
+        "_short_name",
+        "_measured_time",
+        "_value",
+        "_float_value",
+        "_int_value",
+        "_unit",
+        "_sensor_value_description",
+        "_sensor_status",
+        "_sensor_type",
+    )
+
     INVALID_VALUE = -999
 
     class SensorType(Enum):
@@ -29,8 +58,8 @@ class Sensor:
         self._station_id = 0
         self._name = ""
         self._short_name = ""
-        self._measured_time = datetime(1970, 1, 1, 0, 0, 0)
-        self._value = 0.0
+        self._measured_time = EPOCH
+        self._set_value(0.0)
         self._unit = ""
         self._sensor_value_description = ""  # used for present weather
         self._sensor_status = Sensor.SensorStatus.OK
@@ -42,16 +71,18 @@ class Sensor:
         try:
             self._id = sensor_json["id"]
             self._station_id = sensor_json["stationId"]
-            self._name = sensor_json["name"]
-            self._short_name = sensor_json["shortName"]
+            self._name = _intern(sensor_json["name"])
+            self._short_name = _intern(sensor_json["shortName"])
             self._measured_time = Utils.timestamp_to_datetime(
                 sensor_json["measuredTime"]
             )
-            self._value = sensor_json["value"]
+            self._set_value(sensor_json["value"])
             if not sensor_json["unit"] in Constants.MISSING_UNIT:
-                self._unit = sensor_json["unit"]
+                self._unit = _intern(sensor_json["unit"])
             if "sensorValueDescriptionFi" in sensor_json:
-                self._sensor_value_description = sensor_json["sensorValueDescriptionFi"]
+                self._sensor_value_description = _intern(
+                    sensor_json["sensorValueDescriptionFi"]
+                )
             return True
 
         except:
@@ -59,6 +90,57 @@ class Sensor:
 
         return False
 
+    def to_snapshot(self) -> tuple:
+        """Return the sensor reading as a compact tuple for `DataModel.save_snapshot`."""
+        return (
+            self._id,
+            self._station_id,
+            self._name,
+            self._short_name,
+            self._measured_time.timestamp(),
+            self._value,
+            self._unit,
+            self._sensor_value_description,
+        )
+
+    @staticmethod
+    def from_snapshot(row: tuple) -> "Sensor":
+        """Create a `Sensor` from a tuple made by `to_snapshot`."""
+        sensor = Sensor()
+        (
+            sensor._id,
+            sensor._station_id,
+            sensor._name,
+            sensor._short_name,
+            measured_ts,
+            value,
+            sensor._unit,
+            sensor._sensor_value_description,
+        ) = row
+        sensor._measured_time = datetime.fromtimestamp(measured_ts, tz.tzutc())
+        sensor._set_value(value)
+        return sensor
+
+    def _set_value(self, value) -> None:
+        """Store the raw value and decode it once into typed float/int values.
+
+        Missing (null), non-numeric and non-finite readings decode to
+        `Constants.INVALID_VALUE` (`Sensor.INVALID_VALUE` as an int).
+        """
+        self._value = value
+        self._float_value = Constants.INVALID_VALUE
+        self._int_value = Sensor.INVALID_VALUE
+
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            return
+        try:
+            float_value = float(value)
+        except ValueError:
+            return
+        if math.isfinite(float_value):
+            self._float_value = float_value
+            self._int_value = int(float_value)  # truncates like the old str split
+
     @property
     def id(self) -> int:
         return self._id
@@ -67,10 +149,25 @@ class Sensor:
     def name(self) -> str:
         return self._name
 
+    @property
+    def measured_time(self) -> datetime:
+        return self._measured_time
+
     @property
     def value(self) -> float:
+        """Raw value as received, used for display."""
         return self._value
 
+    @property
+    def float_value(self) -> float:
+        """Value decoded at parse time, `Constants.INVALID_VALUE` if missing or invalid."""
+        return self._float_value
+
+    @property
+    def int_value(self) -> int:
+        """Value truncated to int at parse time, `Sensor.INVALID_VALUE` if missing or invalid."""
+        return self._int_value
+
     @property
     def unit(self) -> str:
         return self._unit
@@ -87,33 +184,37 @@ class WeatherStation:
 
     def __init__(self):
         self._station_info = station_info.WeatherStationInfo()
+        self._data_station_id = 0  # station id of the latest parsed data document
         time_now = datetime.now()
         self._data_updated_time = [time_now] * 2
         self.sensor_values = [Sensor()]
+        self.history = StationHistory()  # readings of earlier parses, per sensor
+        self.rollups = StationRollups()  # 10 min, hourly and daily aggregates, per sensor
+        self.cadence = CadenceEstimator()  # learned from observation times
+        self._build_sensor_index()
 
     def parse(self, weather_data) -> bool:
         """Parse weather observation JSON into this `WeatherStation`.
 
-        Updates observation timestamps and fills `sensor_values` from the
-        `sensorValues` array. Returns True on successful parse.
+        Updates observation timestamps and `cadence`, fills `sensor_values` from the
+        `sensorValues` array and adds new readings to `history` and `rollups`.
+        Returns True on successful parse.
         """
-        # update 'data updated' times
+        self._data_station_id = weather_data.get("id", self._data_station_id)
+
+        # update 'data updated' times and learn the station's update cadence
         observation_time = Utils.timestamp_to_datetime(
             weather_data["dataUpdatedTime"]
         )
-
-        # If this WeatherStation instance has no meaningful previous
-        # observation (both timestamps equal, e.g. just constructed), set
-        # both latest and previous to the incoming observation time. This
-        # prevents creating a negative update interval when a new station
-        # is selected and the instance was initialized with `now`.
-        prev_idx = WeatherStation.ObservationTimeIdx.PREVIOUS.value
-        latest_idx = WeatherStation.ObservationTimeIdx.LATEST.value
-        if self._data_updated_time[prev_idx] == self._data_updated_time[latest_idx]:
-            self._data_updated_time[prev_idx] = observation_time
-            self._data_updated_time[latest_idx] = observation_time
-        elif observation_time != self._data_updated_time[prev_idx]:
-            self._data_updated_time[prev_idx] = self._data_updated_time[latest_idx]
+        if self.cadence.add(observation_time.timestamp()):
+            # the first observation (e.g. just constructed with `now`) has no
+            # meaningful previous one: use it for both timestamps
+            prev_idx = WeatherStation.ObservationTimeIdx.PREVIOUS.value
+            latest_idx = WeatherStation.ObservationTimeIdx.LATEST.value
+            if len(self.cadence) > 1:
+                self._data_updated_time[prev_idx] = self._data_updated_time[latest_idx]
+            else:
+                self._data_updated_time[prev_idx] = observation_time
             self._data_updated_time[latest_idx] = observation_time
 
         # get sensor values
@@ -122,13 +223,44 @@ class WeatherStation:
             sensor_value = Sensor()
             if sensor_value.parse(sensor_json):
                 self.sensor_values.append(sensor_value)
+        self._build_sensor_index()
+        self.history.record(self.sensor_values)
+        self.rollups.record(self.sensor_values)
 
         return True
 
+    def to_snapshot(self) -> tuple:
+        """Return observation times and sensor readings as compact tuples."""
+        return (
+            tuple(t.timestamp() for t in self._data_updated_time),
+            [sensor.to_snapshot() for sensor in self.sensor_values],
+        )
+
+    def restore_snapshot(self, snapshot: tuple) -> None:
+        """Restore observation times and sensor readings saved by `to_snapshot`."""
+        data_updated_ts, sensor_rows = snapshot
+        self._data_updated_time = [
+            datetime.fromtimestamp(ts, tz.tzutc()) for ts in data_updated_ts
+        ]
+        self.cadence = CadenceEstimator()
+        for ts in sorted(set(data_updated_ts)):
+            self.cadence.add(ts)
+        self.sensor_values = [Sensor.from_snapshot(row) for row in sensor_rows]
+        self._build_sensor_index()
+
     @property
     def id(self):
-        """Return station id inherited from the associated `WeatherStationInfo`."""
-        return self._station_info.id
+        """Return station id inherited from the associated `WeatherStationInfo`.
+
+        A station without a catalogue entry uses the id of its parsed data
+        document.
+        """
+        return self._station_info.id or self._data_station_id
+
+    @property
+    def data_station_id(self):
+        """Return the station id of the latest parsed data document, 0 before the first parse."""
+        return self._data_station_id
 
     @property
     def formatted_name(self) -> str:
@@ -145,24 +277,23 @@ class WeatherStation:
         self, idx: ObservationTimeIdx = ObservationTimeIdx.LATEST
     ) -> datetime:
         if idx.value > WeatherStation.ObservationTimeIdx.LATEST.value:
-            return datetime(1970, 1, 1, 0, 0, 0)
+            return EPOCH
         else:
             return self._data_updated_time[idx.value]
 
+    @property
+    def previous_data_updated_time(self) -> datetime:
+        """Observation time before `data_updated_time` (equal to it after the first parse)."""
+        return self._data_updated_time[WeatherStation.ObservationTimeIdx.PREVIOUS.value]
+
     @property
     def seconds_until_next_update(self):
-        return Utils.calculate_seconds_until_next_update(
-            self._data_updated_time[
-                WeatherStation.ObservationTimeIdx.LATEST.value
-            ].timestamp(),
-            self._data_updated_time[
-                WeatherStation.ObservationTimeIdx.PREVIOUS.value
-            ].timestamp(),
-        )
+        """Seconds until the station's next expected update, learned by `cadence`; 0 when unknown."""
+        return self.cadence.seconds_until_next_update(datetime.now(tz.tzutc()).timestamp())
 
     @property
     def air_temperature(self):
-        return self.get_value("ILMA", ConversionType.TO_FLOAT)
+        return self.get_float("ILMA")
 
     @property
     def air_temperature_str(self) -> str:
@@ -170,7 +301,7 @@ class WeatherStation:
 
     @property
     def air_humidity(self):
-        return self.get_value("ILMAN_KOSTEUS", ConversionType.TO_FLOAT)
+        return self.get_float("ILMAN_KOSTEUS")
 
     @property
     def temperature_change_str(self) -> str:
@@ -178,11 +309,11 @@ class WeatherStation:
 
     @property
     def wind_speed(self):
-        return self.get_value("KESKITUULI", ConversionType.TO_FLOAT)
+        return self.get_float("KESKITUULI")
 
     @property
     def wind_direction(self):
-        return self.get_value("TUULENSUUNTA")
+        return self.get_int("TUULENSUUNTA")
 
     @property
     def wind_speed_str(self) -> str:
@@ -195,12 +326,12 @@ class WeatherStation:
     @property
     def present_weather_code(self):
         # find "VALLITSEVA_SÄÄ" by sensor id:
-        return self.get_value("100")
+        return self.get_int_by_id(100)
 
     @property
     def visibility(self):
         # find "NÄKYVYYS_M" by sensor id:
-        return self.get_value("58")
+        return self.get_int_by_id(58)
 
     @property
     def visibility_str(self):
@@ -229,9 +360,49 @@ class WeatherStation:
         if sensor == None:
             return Constants.INVALID_VALUE
         if conversion_type == ConversionType.TO_FLOAT:
-            return float(str(sensor.value))
+            return sensor.float_value
         if conversion_type == ConversionType.TO_INT:
-            return int(str(sensor.value).split(".")[0])
+            return sensor.int_value
+
+    # Typed accessors, used by the properties above. Unlike `get_value` they
+    # skip the identifier type dispatch.
+    def get_float(self, sensor_name: str) -> float:
+        sensor = self._sensors_by_name.get(sensor_name)
+        if sensor is None:
+            return Constants.INVALID_VALUE
+        return sensor.float_value
+
+    def get_int(self, sensor_name: str) -> int:
+        sensor = self._sensors_by_name.get(sensor_name)
+        if sensor is None:
+            return Constants.INVALID_VALUE
+        return sensor.int_value
+
+    def get_int_by_id(self, sensor_id: int) -> int:
+        sensor = self._sensors_by_id.get(sensor_id)
+        if sensor is None:
+            return Constants.INVALID_VALUE
+        return sensor.int_value
+
+    def get_history(self, sensor_name: str, hours: float, now: float | None = None) -> tuple:
+        """Return (timestamps, values) arrays of `sensor_name` readings from the last `hours`.
+
+        Timestamps are seconds since the epoch, oldest first. `now` defaults
+        to the current time. Unknown sensors give empty arrays.
+        """
+        sensor = self._sensors_by_name.get(sensor_name)
+        sensor_id = None if sensor is None else sensor.id
+        return self.history.last_hours(sensor_id, hours, now)
+
+    def get_rollups(self, sensor_name: str, start_s: float, end_s: float, max_points: int) -> RollupSeries:
+        """Return min/max/mean aggregates of `sensor_name` over [start_s, end_s).
+
+        The resolution (10 min, hourly or daily) is the finest one that fits
+        `max_points` buckets, see `StationRollups.query`.
+        """
+        sensor = self._sensors_by_name.get(sensor_name)
+        sensor_id = None if sensor is None else sensor.id
+        return self.rollups.query(sensor_id, start_s, end_s, max_points)
 
     def get_present_weather(self):
         pw_label = "Säätila:"
@@ -241,20 +412,22 @@ class WeatherStation:
         if sensor == None:
             return pw_label, pw_text
 
-        if sensor.value >= 1.0:
+        if sensor.float_value >= 1.0:
             pw_label = "Sade:"
         pw_text = sensor.sensor_value_description
 
         return pw_label, pw_text
 
-    def _find_sensor(self, sensor_name: str):
+    def _build_sensor_index(self):
+        """Index `sensor_values` by name and id; the first sensor wins on duplicates."""
+        self._sensors_by_name = {}
+        self._sensors_by_id = {}
         for sensor in self.sensor_values:
-            if sensor.name == sensor_name:
-                return sensor
-        return None
+            self._sensors_by_name.setdefault(sensor.name, sensor)
+            self._sensors_by_id.setdefault(sensor.id, sensor)
+
+    def _find_sensor(self, sensor_name: str):
+        return self._sensors_by_name.get(sensor_name)
 
     def _find_sensor_by_id(self, sensor_id: int):
-        for sensor in self.sensor_values:
-            if sensor.id == sensor_id:
-                return sensor
-        return None
+        return self._sensors_by_id.get(sensor_id)
@@ -1,6 +1,7 @@
 from enum import Enum
 import json
 import sys
+import time
 from datetime import datetime, timedelta
 
 from dateutil import tz
@@ -19,13 +20,17 @@ from PyQt6.QtWidgets import (
 )
 
 # local modules:
-from definitions import Constants, Formats, Styles
+from definitions import Constants, DataSource, Formats, Styles
 from model import data_model
-from model.helpers import ok_to_add_station
+from model.archive import ObservationArchive
 from utils.utils import Utils
 from utils.weather_utils import WeatherUtils
 from controller.app_controller import AppController
-from view.background_worker import NetworkWorker
+from controller.weather_service import WeatherService
+from utils.city_resolver import CityResolver
+from utils.http_cache import HttpCache
+from utils.response_cache import ResponseCache
+from view.background_worker import NetworkWorker, StationListWorker
 
 # indices to language list:
 class LangId:
@@ -42,7 +47,11 @@ class WeatherApp(QWidget):
         Utils.set_taskbar_icon()
 
         # Use AppController to orchestrate services and the data model
-        self._controller = AppController()
+        self._controller = AppController(
+            service=WeatherService(
+                cache=HttpCache(), owm_cache=ResponseCache(), city_resolver=CityResolver()
+            )
+        )
         self._data_model = self._controller.model
 
         self.current_station_id = 0
@@ -69,15 +78,31 @@ class WeatherApp(QWidget):
         self.update_button = QPushButton("Päivitä", self)
         self.update_time_value = QLabel(self)
         self.settings = Utils.load_settings(Constants.SETTINGS_FILE_NAME)
+        # bulk mode: fetch all stations at once, station switches need no network call
+        self._controller.bulk_mode = self.settings.get("bulk_mode", False)
+        # archive: keep every parsed observation in a local SQLite database
+        if self.settings.get("archive", False):
+            self._controller.archive = ObservationArchive(Constants.ARCHIVE_FILE_NAME)
+
+        self.timer = QTimer()
+        self.update_interval_s = Constants.DEFAULT_POLLING_INTERVAL_S
 
+        # open connections to the APIs while the widgets are being built
+        self._controller.service.warm_up()
         self._init_ui()
-        self._init_station_list()
-        self._apply_settings()
+        if self._data_model.load_snapshot(Constants.SNAPSHOT_FILE_NAME):
+            # show the data saved on the previous run right away and
+            # refresh the station list in the background
+            self._display_weather_stations(self._data_model)
+            self._apply_settings()
+            self._display_snapshot()
+            self._refresh_station_list()
+        else:
+            self._init_station_list()
+            self._apply_settings()
         self.station_list.currentIndexChanged.connect(self._on_station_selected)
         self.update_button.clicked.connect(self._on_station_selected)
 
-        self.timer = QTimer()
-        self.update_interval_s = Constants.DEFAULT_POLLING_INTERVAL_S
         self.timer.timeout.connect(self.timer_func)
         self.timer.start(self.update_interval_s * 1000)
         self._on_station_selected()
@@ -128,12 +153,17 @@ class WeatherApp(QWidget):
         self.ui_english.setChecked(True)
 
     def timer_func(self):
-        self.update_button.click()
+        # refresh only the sources whose data is due, see AppController.refresh_time
+        self._refresh(self._controller.due_sources())
 
     def _cleanup(self):
         self.settings["current_station"] = self.station_list.currentText()
         data = self.settings
         Utils.save_settings(Constants.SETTINGS_FILE_NAME, data)
+        self._data_model.save_snapshot(Constants.SNAPSHOT_FILE_NAME)
+        self._controller.service.close()
+        if self._controller.archive is not None:
+            self._controller.archive.close()
 
     def _apply_settings(self):
         if len(self.settings.items()) == 0:
@@ -254,15 +284,61 @@ class WeatherApp(QWidget):
         else:
             self._display_weather_stations(self._data_model)
 
+    def _refresh_station_list(self):
+        self._station_list_worker = StationListWorker(self._controller)
+        self._station_list_worker.finished.connect(self._on_station_list_received)
+        self._station_list_worker.start()
+
+    def _on_station_list_received(self, stations_json, error_message):
+        if error_message:
+            # keep showing the restored data
+            self.error_message.setText(f"Failed to get station list: {error_message}")
+            return
+        if not self._controller.load_station_list(stations_json):
+            return
+
+        # re-populate the combo box without triggering a refresh and keep the selection
+        current_name = self.station_list.currentText()
+        self.station_list.blockSignals(True)
+        self._display_weather_stations(self._data_model)
+        self.station_list.setCurrentText(current_name)
+        self.station_list.blockSignals(False)
+
+        current_data = self.station_list.currentData()
+        if current_data is not None and current_data["station_id"] != self._data_model.current_station.id:
+            self._on_station_selected()
+
+    def _display_snapshot(self):
+        """Show the data restored from the snapshot, marked as not yet refreshed."""
+        current_data = self.station_list.currentData()
+        if current_data is None or current_data["station_id"] != self._data_model.current_station.id:
+            return
+        self._display_weather_data(self._data_model.city_weather, self._data_model.forecast)
+        self.update_time_value.setText(
+            QApplication.translate("WeatherApp", "Tallennettu tieto, päivitetään...")
+        )
+
     def _on_station_selected(self):
+        self._refresh()
+
+    def _refresh(self, sources=None):
+        """Fetch the data of the selected station from `sources` (all `DataSource`s when None)."""
         self.error_message.clear()
 
+        current_data = self.station_list.currentData()
+        if current_data is None:
+            return  # station list not available
+
         # If the user has changed the station, clear all UI components
-        station_id = self.station_list.currentData()["station_id"]
+        station_id = current_data["station_id"]
         if station_id != self._data_model.current_station.id:
             self._controller.set_current_station(station_id)
             self._clear_ui_components()
             QApplication.processEvents()
+            sources = None
+        if sources is not None and not sources:
+            self._schedule_refresh()
+            return
 
         # get the data from the APIs — run network calls in a background thread
         QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
@@ -271,7 +347,9 @@ class WeatherApp(QWidget):
         api_key = self.settings["openweathermap_api_key"]
         station_id = station_id
 
-        self._worker = NetworkWorker(self._controller, station_id, api_key)
+        self._station_data_shown = False
+        self._worker = NetworkWorker(self._controller, station_id, api_key, sources)
+        self._worker.station_data_ready.connect(self._on_station_data_ready)
         self._worker.finished.connect(self._on_worker_finished)
         self._worker.start()
 
@@ -303,14 +381,34 @@ class WeatherApp(QWidget):
 
         return city_data, forecast
 
+    def _on_station_data_ready(self, error_message):
+        # render road weather right away, OpenWeatherMap data follows in _on_worker_finished
+        self._station_data_shown = True
+        if not error_message:
+            self._display_station_data()
+
     def _on_worker_finished(self, city_data, forecast, error_message):
         QApplication.restoreOverrideCursor()
         self.update_button.setEnabled(True)
 
+        # keep the latest OpenWeatherMap data until it is due for a refresh; data
+        # shared with other stations is as old as when it was first fetched
+        fetched_at = self._worker.fetched_at
+        if city_data:
+            self._controller.store_city_weather(city_data, fetched_at.get(DataSource.CITY_WEATHER))
+        if forecast:
+            self._controller.store_forecast(forecast, fetched_at.get(DataSource.FORECAST))
+
         if error_message:
             self._display_error(error_message)
             # still attempt to render any data that arrived
-        self._display_weather_data(city_data, forecast)
+        if not self._station_data_shown:
+            # road weather was not requested in this refresh
+            self._display_station_data()
+        self._display_forecast_data(
+            city_data or self._data_model.city_weather, forecast or self._data_model.forecast
+        )
+        self._schedule_refresh()
 
     def _clear_ui_components(self):
         self.observation_time_value.clear()
@@ -332,16 +430,11 @@ class WeatherApp(QWidget):
         """Populate the station list UI component from the given data model object"""
         self.station_list.clear()
 
-        for station in data_model.stations:
-            if ok_to_add_station(station.name):
-                self.station_list.addItem(
-                    station.formatted_name, {"station_id": station.id}
-                )
-
-        # sort the combo box:
-        list_model = self.station_list.model()
-        if list_model != None:
-            list_model.sort(0, Qt.SortOrder.AscendingOrder)
+        # the model keeps the filtered list sorted by name
+        for station in data_model.visible_stations:
+            self.station_list.addItem(
+                station.formatted_name, {"station_id": station.id}
+            )
 
     def _get_current_weather_id(self, city_data):
         id = 0
@@ -368,8 +461,11 @@ class WeatherApp(QWidget):
         return ""
 
     def _display_weather_data(self, city_data, forecast_data):
+        self._display_station_data()
+        self._display_forecast_data(city_data, forecast_data)
+
+    def _display_station_data(self):
         station = self._data_model.current_station
-        self.forecast_label.setText("")
 
         feels_like_temperature = WeatherUtils.fmi_feels_like_temperature(
             station.wind_speed, station.air_humidity, station.air_temperature
@@ -408,6 +504,38 @@ class WeatherApp(QWidget):
 
         self.visibility_value.setText(station.visibility_str)
 
+        time_now = datetime.now()
+        if station.seconds_until_next_update > 0:
+            next_update_time = time_now + timedelta(
+                0, station.seconds_until_next_update
+            )
+            self.update_time_value.setText(
+                f"{time_now.strftime(Formats.TIME_FORMAT)} --> {next_update_time.strftime(Formats.TIME_FORMAT)}"
+            )
+        else:
+            self.update_time_value.setText(f"{time_now.strftime(Formats.TIME_FORMAT)}")
+
+    def _schedule_refresh(self):
+        # calculate how long we need to wait until the next update and add some slack
+        waiting_time_s = self._data_model.current_station.seconds_until_next_update
+        if waiting_time_s <= 0:
+            self.update_interval_s = Constants.DEFAULT_POLLING_INTERVAL_S
+        else:
+            self.update_interval_s = int(str(f"{waiting_time_s:.0f}"))
+        interval_s = self.update_interval_s + Constants.STATION_UPDATE_DELAY_S
+
+        # OpenWeatherMap data may be due before the station's next update
+        now_s = time.time()
+        for source in (DataSource.CITY_WEATHER, DataSource.FORECAST):
+            due_in_s = self._controller.refresh_time(source) - now_s
+            if due_in_s > 0:
+                interval_s = min(interval_s, due_in_s)
+        self.timer.start(int(interval_s * 1000))
+
+    def _display_forecast_data(self, city_data, forecast_data):
+        station = self._data_model.current_station
+        self.forecast_label.setText("")
+
         if bool(city_data):
             current_weather_id = self._get_current_weather_id(city_data)
             if current_weather_id > 0:
@@ -442,27 +570,6 @@ class WeatherApp(QWidget):
         if not self.settings["openweathermap_api_key"]:
             self.error_message.setText("Open Weather API key is missing")
 
-        # calculate how long we need to wait until the next update and add some slack
-        waiting_time_s = station.seconds_until_next_update
-        if waiting_time_s <= 0:
-            self.update_interval_s = Constants.DEFAULT_POLLING_INTERVAL_S
-        else:
-            self.update_interval_s = int(str(f"{waiting_time_s:.0f}"))
-        self.timer.start(
-            (self.update_interval_s + Constants.STATION_UPDATE_DELAY_S) * 1000
-        )
-
-        time_now = datetime.now()
-        if station.seconds_until_next_update > 0:
-            next_update_time = time_now + timedelta(
-                0, station.seconds_until_next_update
-            )
-            self.update_time_value.setText(
-                f"{time_now.strftime(Formats.TIME_FORMAT)} --> {next_update_time.strftime(Formats.TIME_FORMAT)}"
-            )
-        else:
-            self.update_time_value.setText(f"{time_now.strftime(Formats.TIME_FORMAT)}")
-
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
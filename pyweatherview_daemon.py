@@ -0,0 +1,73 @@
+"""Headless road weather polling daemon (no Qt needed).
+
+Polls every station of the station list, or the station ids given on the
+command line, shortly after each one publishes new data, and optionally
+keeps every observation in the SQLite archive.
+
+Usage: `python pyweatherview_daemon.py [station_id ...] [--workers N]
+[--jitter S] [--archive FILE] [--duration S] [--verbose]`
+"""
+import argparse
+import signal
+import sys
+import time
+
+from controller.app_controller import AppController
+from controller.polling_daemon import PollingDaemon
+from controller.weather_service import WeatherService
+from definitions import Constants
+from model.archive import ObservationArchive
+from utils.http_cache import HttpCache
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Poll road weather stations without a UI.")
+    parser.add_argument("station_ids", nargs="*", type=int, help="stations to poll (default: all)")
+    parser.add_argument("--workers", type=int, default=Constants.DAEMON_WORKERS, help="max. requests in flight")
+    parser.add_argument("--jitter", type=float, default=Constants.DAEMON_JITTER_S, help="max. random delay, s")
+    parser.add_argument("--archive", metavar="FILE", help="archive observations into this SQLite file")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--verbose", action="store_true", help="print every station update")
+    return parser.parse_args(argv)
+
+
+def print_update(station):
+    print(f"{time.strftime('%H:%M:%S')} {station.id} {station.formatted_name}: {station.air_temperature_str}")
+
+
+def main(argv=None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    controller = AppController(service=WeatherService(cache=HttpCache()))
+    if not controller.stream_and_load_station_list():
+        print(f"Failed to get station list: {controller.last_error}")
+        return 1
+
+    archive = ObservationArchive(args.archive) if args.archive else None
+    daemon = PollingDaemon(
+        controller.model.station_list,
+        station_ids=args.station_ids or None,
+        service=controller.service,
+        workers=args.workers,
+        jitter_s=args.jitter,
+        archive=archive,
+        on_update=print_update if args.verbose else None,
+    )
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    print(f"Polling {len(daemon.scheduler)} stations with {args.workers} workers")
+    try:
+        daemon.run(args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+        controller.service.close()
+        if archive is not None:
+            archive.close()
+    print(f"{daemon.polls} polls, {daemon.updates} updates, {daemon.errors} errors")
+    if daemon.last_error:
+        print(f"Last error: {daemon.last_error}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
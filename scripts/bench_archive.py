@@ -0,0 +1,118 @@
+"""Benchmark sustained ingest into the SQLite observation archive.
+
+Simulates a day of polling all stations at 1-minute cadence: every poll
+hands every station to `ObservationArchive.add_station`, as
+`AppController.fetch_and_load_all_station_data` does. Each station has the
+87 sensors of `examples/station_data.json` and publishes new readings every
+`update_minutes` (10 by default, at a random phase), so most polls repeat
+readings that are already archived.
+
+Simulated time runs as fast as the archive allows. Reports the time a poll
+spends in `add_station` (the caller's cost; writing happens on the
+background thread), the writer's sustained throughput against the rate a
+real day needs, and the database size.
+
+Run from repository root: `python scripts/bench_archive.py [stations] [hours] [update_minutes]`
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from model.archive import ObservationArchive
+
+START = 1750000000
+
+
+class FakeSensor:
+    __slots__ = ("id", "float_value", "measured_time")
+
+    def __init__(self, sensor_id, value, measured_time):
+        self.id = sensor_id
+        self.float_value = value
+        self.measured_time = measured_time
+
+
+class FakeStation:
+    """Just what the archive reads from a `WeatherStation`: `id` and `sensor_values`."""
+
+    def __init__(self, station_id, sensor_ids, phase_s):
+        self.id = station_id
+        self.phase_s = phase_s
+        self.sensor_values = [FakeSensor(i, 0.0, None) for i in sensor_ids]
+
+    def update(self, now_s, update_s, rng):
+        # the station's latest observation at simulated time `now_s`
+        measured_s = now_s - (now_s - self.phase_s) % update_s
+        measured_time = datetime.fromtimestamp(measured_s, timezone.utc)
+        if self.sensor_values[0].measured_time != measured_time:
+            for sensor in self.sensor_values:
+                sensor.measured_time = measured_time
+                sensor.float_value = round(rng.uniform(-20.0, 20.0), 1)
+
+
+def run_benchmark(station_count=500, hours=24.0, update_minutes=10.0):
+    with open(os.path.join(ROOT, "examples", "station_data.json"), "r") as f:
+        sensor_ids = [s["id"] for s in json.load(f)["sensorValues"]]
+    rng = random.Random(1)
+    update_s = int(update_minutes * 60)
+    stations = [FakeStation(1000 + i, sensor_ids, rng.randrange(update_s)) for i in range(station_count)]
+    polls = int(hours * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = os.path.join(tmp, "archive.sqlite")
+        archive = ObservationArchive(file_name)
+        poll_times = []
+        started = time.perf_counter()
+        for poll in range(polls):
+            now_s = START + poll * 60
+            for station in stations:
+                station.update(now_s, update_s, rng)
+            t0 = time.perf_counter()
+            for station in stations:
+                archive.add_station(station)
+            poll_times.append(time.perf_counter() - t0)
+        produced = time.perf_counter() - started
+        archive.close()
+        elapsed = time.perf_counter() - started
+        size_mb = sum(
+            os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp)
+        ) / 1e6
+
+    rows = archive.rows_written
+    offered = polls * station_count * len(sensor_ids)
+    needed_rate = rows / (hours * 3600)
+    poll_times.sort()
+    print(
+        f"{station_count} stations x {len(sensor_ids)} sensors, {polls} polls "
+        f"({hours:g} h at 1-minute cadence), new readings every {update_minutes:g} min"
+    )
+    print(
+        f"readings offered {offered}, archived {rows} "
+        f"({offered - rows} duplicates skipped before queueing)"
+    )
+    print(
+        f"caller time per poll: median {poll_times[len(poll_times) // 2] * 1000:.2f} ms, "
+        f"max {poll_times[-1] * 1000:.2f} ms"
+    )
+    print(
+        f"writer: {rows / elapsed:,.0f} rows/s sustained in {archive.transactions} transactions "
+        f"({elapsed:.1f} s, producer done after {produced:.1f} s); "
+        f"a real day needs {needed_rate:,.0f} rows/s, headroom {rows / elapsed / needed_rate:,.0f}x"
+    )
+    print(f"database size {size_mb:.1f} MB ({size_mb * 1e6 / max(rows, 1):.1f} bytes/reading)")
+    if archive.last_error:
+        print(f"writer error: {archive.last_error}")
+
+
+if __name__ == "__main__":
+    args = [float(a) for a in sys.argv[1:]]
+    run_benchmark(int(args[0]) if args else 500, *args[1:])
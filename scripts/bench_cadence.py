@@ -0,0 +1,133 @@
+"""Benchmark the per-station update-cadence estimator of `model/cadence.py`.
+
+Replays publish-time sequences of stations that update every 1, 5, 10 or
+20 minutes with a few seconds of jitter, some missed updates, some late
+ones and an occasional change of cadence. Each station is polled the way
+the UI timer does: after `seconds_until_next_update` (or the default
+polling interval when that is 0) plus a fixed slack. Compares the learned
+cadence with the previous two-timestamp rule
+(`Utils.calculate_seconds_until_next_update`) on:
+
+- empty polls: polls that found no new observation
+- detection delay: time from publishing to the poll that found it
+- skipped observations: published ones replaced before any poll saw them
+
+Run from repository root: `python scripts/bench_cadence.py [stations] [hours]`
+"""
+import bisect
+import os
+import random
+import sys
+import time
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from definitions import Constants
+from model.cadence import CadenceEstimator
+from utils.utils import Utils
+
+START = 1750000000.0
+
+
+def record_publish_times(rng, hours):
+    """Publish times of one station: jittered grid times, missed and late updates, a cadence change."""
+    interval = rng.choice([60, 300, 600, 1200])
+    phase = rng.uniform(0, interval)
+    end = START + hours * 3600
+    change_at = START + rng.uniform(0.3, 0.7) * hours * 3600 if rng.random() < 0.2 else end
+    times = []
+    t = START + phase
+    while t < end:
+        if rng.random() >= 0.05:  # 5 % of the updates are missed
+            late = rng.uniform(60, 180) if rng.random() < 0.03 else 0.0
+            published = int(t + rng.gauss(0, 3) + late)  # dataUpdatedTime has whole seconds
+            if not times or published > times[-1]:
+                times.append(published)
+        if t >= change_at:
+            interval = rng.choice([60, 300, 600, 1200])
+            change_at = end
+        t += interval
+    return times
+
+
+class TwoTimestampRule:
+    """The previous schedule: latest minus previous observation time is the interval."""
+
+    def __init__(self):
+        self.latest = None
+        self.previous = None
+
+    def add(self, observation_s):
+        if self.latest is None:
+            self.latest = self.previous = observation_s
+        elif observation_s > self.latest:
+            self.latest, self.previous = observation_s, self.latest
+
+    def seconds_until_next_update(self, now_s):
+        if self.latest is None:
+            return 0
+        # the rule reads the wall clock: shift the replayed timestamps to it
+        shift = time.time() - now_s
+        return Utils.calculate_seconds_until_next_update(self.latest + shift, self.previous + shift)
+
+
+def replay(times, schedule, slack_s, end_s):
+    """Poll one station until `end_s`; returns (polls, empty polls, detection delays, skipped)."""
+    now = START
+    polls = empty = 0
+    delays = []
+    seen = -1  # index of the newest observation found
+    while now < end_s:
+        polls += 1
+        newest = bisect.bisect_right(times, now) - 1
+        if newest > seen:
+            delays.append(now - times[newest])
+            skipped_here = newest - seen - 1 if seen >= 0 else 0
+            seen = newest
+            schedule.add(times[newest])
+            delays.extend([None] * skipped_here)
+        else:
+            empty += 1
+        wait = schedule.seconds_until_next_update(now)
+        if wait <= 0:
+            wait = Constants.DEFAULT_POLLING_INTERVAL_S
+        now += wait + slack_s
+    skipped = sum(1 for delay in delays if delay is None)
+    return polls, empty, [delay for delay in delays if delay is not None], skipped
+
+
+def run_benchmark(station_count=500, hours=24.0):
+    rng = random.Random(1)
+    recordings = [record_publish_times(rng, hours) for _ in range(station_count)]
+    end = START + hours * 3600
+    published = sum(len(times) for times in recordings)
+    print(f"{station_count} stations, {hours:g} h, {published} observations published")
+    for slack_s in (Constants.STATION_UPDATE_DELAY_S, Constants.DAEMON_PUBLISH_DELAY_S):
+        print(f"slack {slack_s} s after the expected update:")
+        for label, make_schedule in (
+            ("two timestamps", TwoTimestampRule),
+            ("learned cadence", CadenceEstimator),
+        ):
+            polls = empty = skipped = 0
+            delays = []
+            for times in recordings:
+                p, e, d, s = replay(times, make_schedule(), slack_s, end)
+                polls += p
+                empty += e
+                skipped += s
+                delays.extend(d)
+            delays.sort()
+            print(
+                f"  {label:16} {polls:7} polls, {empty / polls:5.1%} empty, "
+                f"delay median {delays[len(delays) // 2]:4.0f} s, "
+                f"p95 {delays[int(len(delays) * 0.95)]:4.0f} s, "
+                f"{skipped / published:5.1%} observations skipped"
+            )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run_benchmark(int(args[0]) if args else 500, float(args[1]) if len(args) > 1 else 24.0)
@@ -0,0 +1,129 @@
+"""Benchmark loading the station catalogue: whole-body decode vs. streaming parser.
+
+Writes a synthetic catalogue (`examples/station_metadata.json` repeated with
+distinct ids and names) to a temporary file and loads it in a child process
+per path, through `AppController` and the real `RequestRunner`:
+
+- full: `fetch_and_load_station_list` (`response.json()`, then model objects)
+- stream: `stream_and_load_station_list` (`iter_content` chunks decoded one
+  station at a time)
+
+`requests.Session.get` is replaced by a response that reads the file, so the
+body arrives in chunks as from a socket. Reports the parse time and the peak
+RSS growth over the process baseline.
+
+Run from repository root: `python scripts/bench_catalogue_stream.py [station_count ...]`
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+class FileResponse:
+    """Stand-in for `requests.Response` reading the body from a file."""
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.status_code = 200
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+    @property
+    def content(self):
+        with open(self.file_name, "rb") as f:
+            return f.read()
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        with open(self.file_name, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def close(self):
+        pass
+
+
+def write_catalogue(file_name, station_count):
+    with open(os.path.join(ROOT, "examples", "station_metadata.json"), "r") as f:
+        station = json.load(f)
+    with open(file_name, "w", encoding="utf-8") as f:
+        f.write('{"type": "FeatureCollection", "dataUpdatedTime": "2025-06-17T03:05:33Z", "features": [')
+        for i in range(station_count):
+            station["id"] = 1000 + i
+            station["properties"]["name"] = f"vt{i % 30}_Paikka{i}_Asema{i}"
+            f.write(("," if i else "") + json.dumps(station, ensure_ascii=False))
+        f.write("]}")
+
+
+def run_child(mode, file_name):
+    from unittest.mock import patch
+
+    from controller.app_controller import AppController
+    from controller.weather_service import WeatherService
+
+    controller = AppController(service=WeatherService())
+    load = (
+        controller.stream_and_load_station_list
+        if mode == "stream"
+        else controller.fetch_and_load_station_list
+    )
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with patch("requests.Session.get", lambda session, url, **kwargs: FileResponse(file_name)):
+        start = time.perf_counter()
+        ok = load()
+        elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result = {
+        "ok": ok,
+        "stations": len(controller.get_stations()),
+        "seconds": elapsed,
+        "peak_kb": peak_kb - baseline_kb,
+    }
+    print(json.dumps(result))
+
+
+def run_benchmark(station_counts=(500, 50000)):
+    with tempfile.TemporaryDirectory() as tmp:
+        for station_count in station_counts:
+            file_name = os.path.join(tmp, "catalogue.json")
+            write_catalogue(file_name, station_count)
+            size_mb = os.path.getsize(file_name) / 1e6
+            print(f"{station_count} stations ({size_mb:.1f} MB body)")
+            for mode in ("full", "stream"):
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--child", mode, file_name],
+                    cwd=ROOT,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+                result = json.loads(output)
+                assert result["ok"] and result["stations"] == station_count
+                print(
+                    f"  {mode:6}: parse {result['seconds'] * 1000:8.1f} ms, "
+                    f"peak RSS +{result['peak_kb'] / 1024:7.1f} MB"
+                )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3])
+    else:
+        counts = [int(arg) for arg in sys.argv[1:]] or [500, 50000]
+        run_benchmark(counts)
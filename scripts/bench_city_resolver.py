@@ -0,0 +1,123 @@
+"""Benchmark the OpenWeatherMap requests saved by `utils/city_resolver.py`.
+
+Refreshes the city weather of every station of a synthetic catalogue
+(names like `vt1_<city>_<place>`, some of whose city tokens are villages
+OpenWeatherMap does not know, and some names without a city) through the
+real `RequestRunner.get_city_weather`, with `requests.Session.get`
+replaced by a stand-in for OpenWeatherMap. Without a resolver an unknown or
+empty city name costs a failed name query before the query by
+coordinates; with a resolver only the first refresh pays for it, also
+after a restart (the resolver is loaded again from its file).
+
+Run from repository root: `python scripts/bench_city_resolver.py [stations] [cities] [unknown share]`
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+from collections import Counter
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from model.station_info import WeatherStationInfo
+from utils.city_resolver import CityResolver
+from utils.utils import Utils
+from utils.weather_utils import WeatherUtils
+from utils.web_utils import RequestRunner
+
+
+class Response:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode()
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+class SimulatedOpenWeatherMap:
+    def __init__(self, known_cities):
+        self.known = {name.casefold(): i + 1 for i, name in enumerate(known_cities)}
+        self.queries = Counter()
+
+    def get(self, url, timeout=None, **kwargs):
+        query = {k: v[0] for k, v in parse_qs(urlsplit(url).query, keep_blank_values=True).items()}
+        if "q" in query:
+            self.queries["name"] += 1
+            if not query["q"]:
+                return Response(400, {"cod": "400", "message": "Nothing to geocode"})
+            city_id = self.known.get(query["q"].casefold())
+            if city_id is None:
+                return Response(404, {"cod": "404", "message": "city not found"})
+            return Response(200, {"id": city_id, "name": query["q"]})
+        self.queries["id" if "id" in query else "coordinates"] += 1
+        return Response(200, {"id": 0, "name": "weather"})
+
+
+def make_catalogue(station_count, city_count, unknown_share, rng):
+    cities = [f"Kunta{i}" for i in range(city_count)]
+    known = [c for c in cities if rng.random() >= unknown_share]
+    stations = []
+    for i in range(station_count):
+        if rng.random() < 0.05:
+            raw_name = f"Paikka{i}"  # no city in the name
+        else:
+            raw_name = f"vt{rng.randint(1, 30)}_{rng.choice(cities)}_Paikka{i}"
+        coordinates = WeatherStationInfo.Coordinates(rng.uniform(59.8, 69.9), rng.uniform(21.0, 31.0))
+        stations.append((raw_name, coordinates))
+    return stations, known
+
+
+def refresh_all(stations, upstream, resolver):
+    runner = RequestRunner(city_resolver=resolver)
+    runner._session_for = lambda url: upstream
+    upstream.queries.clear()
+    for raw_name, coordinates in stations:
+        # the city as NetworkWorker passes it
+        city = Utils.get_station_city(WeatherUtils.format_station_name(raw_name))
+        runner.get_city_weather(city, coordinates, "key")
+        assert not runner.has_error
+    return sum(upstream.queries.values()), upstream.queries["name"]
+
+
+def run_benchmark(station_count=500, city_count=180, unknown_share=0.3):
+    rng = random.Random(1)
+    stations, known = make_catalogue(station_count, city_count, unknown_share, rng)
+    upstream = SimulatedOpenWeatherMap(known)
+    print(
+        f"{station_count} stations in {city_count} cities, {city_count - len(known)} unknown "
+        f"to OpenWeatherMap; city weather requests per refresh of every station:"
+    )
+    requests_without, failed_without = refresh_all(stations, upstream, None)
+    print(f"  no resolver, every refresh: {requests_without:4} requests ({failed_without} by name)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "owm_cities.json")
+        resolver = CityResolver(file_name)
+        for label in ("first refresh", "second refresh"):
+            total, by_name = refresh_all(stations, upstream, resolver)
+            print(f"  resolver, {label:15}: {total:4} requests ({by_name} by name)")
+        total, by_name = refresh_all(stations, upstream, CityResolver(file_name))
+        print(f"  resolver, after restart  : {total:4} requests ({by_name} by name)")
+    print(
+        f"saved per refresh: {requests_without - total} requests "
+        f"({(requests_without - total) / requests_without:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run_benchmark(
+        int(args[0]) if args else 500,
+        int(args[1]) if len(args) > 1 else 180,
+        float(args[2]) if len(args) > 2 else 0.3,
+    )
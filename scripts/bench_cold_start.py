@@ -0,0 +1,170 @@
+"""Benchmark cold start time: process start to first painted value.
+
+Starts the application in a child process, once without and once with a
+`DataModel` snapshot, and reports the time from process start until the
+temperature label shows a value. Network requests are served from the files
+in `examples/` with a simulated round-trip latency, so the numbers do not
+depend on the real APIs being reachable.
+
+Run from repository root: `python scripts/bench_cold_start.py [latency_ms] [runs]`
+"""
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+STATION_ID = 12082
+
+
+def _load_example(file_name):
+    with open(os.path.join(ROOT, "examples", file_name), "r") as f:
+        return json.load(f)
+
+
+def _station_list():
+    station = _load_example("station_metadata.json")
+    station["id"] = STATION_ID
+    station["properties"]["name"] = "vt4_Oulu_Intiö"
+    return [station]
+
+
+class StandInRunner:
+    """Replaces `RequestRunner` in the child process, serving `examples/` with a delay."""
+
+    latency_s = 0.0
+
+    def __init__(self):
+        self.cache = None
+        self.status_code = 200
+        self.error_message = ""
+
+    @property
+    def has_error(self):
+        return False
+
+    def warm_up(self):
+        pass
+
+    def _respond(self, data):
+        time.sleep(self.latency_s)
+        return data
+
+    def get_weather_stations(self):
+        return self._respond(_station_list())
+
+    def get_road_weather(self, station_id):
+        return self._respond(_load_example("station_data.json"))
+
+    def get_city_weather(self, city, coordinates, api_key):
+        return self._respond(_load_example("city_data.json"))
+
+    def get_forecast(self, coordinates, api_key):
+        return self._respond(_load_example("forecast.json"))
+
+
+def run_child(latency_ms):
+    """Start the application and print the wall-clock time of the first painted value."""
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    import controller.weather_service
+
+    StandInRunner.latency_s = latency_ms / 1000.0
+    controller.weather_service.RequestRunner = StandInRunner
+    import pyweatherview
+
+    app = QApplication(sys.argv)
+    weather_app = pyweatherview.WeatherApp()
+    weather_app.show()
+
+    def check_painted():
+        if weather_app.temperature_value.text():
+            weather_app.temperature_value.repaint()
+            print(time.time(), flush=True)
+            app.exit(0)
+
+    poll_timer = QTimer()
+    poll_timer.timeout.connect(check_painted)
+    poll_timer.start(1)
+    check_painted()
+    app.exec()
+
+
+def make_snapshot(file_name):
+    from model.data_model import DataModel
+
+    model = DataModel()
+    model.parse_station_list(_station_list())
+    model.set_currect_station(STATION_ID)
+    model.parse_station_data(_load_example("station_data.json"))
+    model.city_weather = _load_example("city_data.json")
+    model.forecast = _load_example("forecast.json")
+    model.save_snapshot(file_name)
+
+
+def time_start(work_dir, latency_ms):
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONPATH"] = ROOT
+    start = time.time()
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", str(latency_ms)],
+        cwd=work_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    ).stdout
+    return (float(output.strip().splitlines()[-1]) - start) * 1000.0
+
+
+def run_benchmark(latency_ms=300, runs=5):
+    from definitions import Constants
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        shutil.copy(os.path.join(ROOT, "pyweatherview.qss"), work_dir)
+        with open(os.path.join(work_dir, Constants.SETTINGS_FILE_NAME), "w") as f:
+            json.dump(
+                {
+                    "current_station": "Oulu, Intiö vt4",
+                    "openweathermap_api_key": "key",
+                    "ui_language": "",
+                    "latest_stations": [],
+                },
+                f,
+            )
+        snapshot_file = os.path.join(work_dir, Constants.SNAPSHOT_FILE_NAME)
+
+        results = {}
+        for label in ("without snapshot", "with snapshot"):
+            samples = []
+            for _ in range(runs):
+                if os.path.exists(snapshot_file):
+                    os.remove(snapshot_file)
+                if label == "with snapshot":
+                    make_snapshot(snapshot_file)
+                samples.append(time_start(work_dir, latency_ms))
+            results[label] = samples
+
+    print(f"process start -> first painted value, {latency_ms} ms simulated request latency")
+    for label, samples in results.items():
+        print(f"{label:17}: median {statistics.median(samples):7.1f} ms, min {min(samples):7.1f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        run_child(float(sys.argv[2]))
+    else:
+        run_benchmark(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 300,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+        )
@@ -0,0 +1,75 @@
+"""Benchmark the derived metrics engine on a bulk update.
+
+Builds `station_count` stations from `examples/station_data.json` with
+varied readings and times `DerivedMetricsEngine.compute` for:
+
+- first poll: every station computed in one batch
+- next poll, 10% of the stations have a new observation
+- next poll, no new observations (all results cached)
+
+Run from repository root: `python scripts/bench_derived_metrics.py [station_count]`
+"""
+import copy
+import json
+import os
+import random
+import sys
+import time
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from model.derived_metrics import DerivedMetricsEngine
+from model.weather_station import WeatherStation
+
+
+def make_stations(station_count, seed=1):
+    with open(os.path.join(ROOT, "examples", "station_data.json"), "r") as f:
+        template = json.load(f)
+    rng = random.Random(seed)
+    stations = []
+    for i in range(station_count):
+        station_json = copy.deepcopy(template)
+        for sensor in station_json["sensorValues"]:
+            if sensor["name"] in ("ILMA", "TIE_1"):
+                sensor["value"] = rng.randint(-250, 250) / 10
+            elif sensor["name"] == "ILMAN_KOSTEUS":
+                sensor["value"] = rng.randint(30, 100)
+        station = WeatherStation()
+        station.parse(station_json)
+        stations.append((1000 + i, station))
+    return stations
+
+
+def new_observation(station):
+    times = station._data_updated_time
+    times[0] = times[0].replace(minute=(times[0].minute + 10) % 60)
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def run_benchmark(station_count=500):
+    stations = make_stations(station_count)
+    engine = DerivedMetricsEngine()
+    print(f"{station_count} stations, metrics: {', '.join(engine.metric_names)}")
+
+    first = timed(lambda: engine.compute(stations))
+    for _, station in stations[: station_count // 10]:
+        new_observation(station)
+    partial = timed(lambda: engine.compute(stations))
+    cached = timed(lambda: engine.compute(stations))
+
+    print(f"  first poll (all computed)    : {first:7.2f} ms")
+    print(f"  10% new observations         : {partial:7.2f} ms")
+    print(f"  no new observations (cached) : {cached:7.2f} ms")
+    print(f"  computed {engine.computed}, reused {engine.reused}")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,67 @@
+"""Benchmark the observation history ring buffers.
+
+Fills one `RingBuffer` per sensor of `examples/station_data.json` with a day
+of 1-minute readings (more than `Constants.HISTORY_CAPACITY`, so the buffers
+wrap), and reports append time, memory per station and the time of a
+"last N hours" query compared with filtering a list of pairs.
+
+Run from repository root: `python scripts/bench_history.py`
+"""
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from definitions import Constants
+from model.history import RingBuffer
+
+READINGS = 24 * 60  # one day at 1-minute cadence
+START = 1750000000.0
+
+
+def run_benchmark():
+    with open(os.path.join(ROOT, "examples", "station_data.json"), "r") as f:
+        sensor_count = len(json.load(f)["sensorValues"])
+
+    def fill():
+        buffers = [RingBuffer() for _ in range(sensor_count)]
+        for minute in range(READINGS):
+            timestamp = START + minute * 60
+            for buffer in buffers:
+                buffer.append(timestamp, 1.5)
+        return buffers
+
+    elapsed = min(timeit.repeat(fill, number=1, repeat=3))
+    appends = READINGS * sensor_count
+
+    tracemalloc.start()
+    buffers = fill()
+    station_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{sensor_count} sensors, capacity {Constants.HISTORY_CAPACITY}, {READINGS} readings each")
+    print(f"  append          : {elapsed / appends * 1e9:7.0f} ns per reading")
+    print(f"  memory          : {station_bytes / 1024:7.1f} KiB per station (bounded)")
+
+    buffer = buffers[0]
+    times, values = buffer.items()
+    pairs = list(zip(times, values))
+    now = START + (READINGS - 1) * 60
+    for hours in (1, 6):
+        cutoff = now - hours * 3600
+        number = 20000
+        ring = min(timeit.repeat(lambda: buffer.since(cutoff), number=number, repeat=5)) / number
+        scan = min(
+            timeit.repeat(lambda: [p for p in pairs if p[0] >= cutoff], number=number, repeat=5)
+        ) / number
+        print(f"  last {hours} h query : ring buffer {ring * 1e6:6.2f} us, list scan {scan * 1e6:6.2f} us")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,154 @@
+"""Benchmark cold vs. warm refresh latency of `RequestRunner`.
+
+Starts a local HTTPS stand-in server (self-signed certificate created with the
+`openssl` command line tool) which serves the JSON files in `examples/`, points
+the application URLs to it and times one full refresh (road weather, city
+weather and forecast requests):
+
+- cold: `RequestRunner(keep_alive=False)`, every request does a new TCP+TLS handshake
+- warm: `RequestRunner()` with pooled keep-alive sessions, warmed up before timing
+
+Run from repository root: `python scripts/bench_http_pool.py [refresh_count]`
+"""
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from definitions import Urls
+from utils.web_utils import RequestRunner
+
+
+def _read_example(file_name):
+    with open(os.path.join(ROOT, "examples", file_name), "rb") as f:
+        return f.read()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # allow keep-alive connections
+    disable_nagle_algorithm = True  # headers and body are written separately
+    bodies = {}
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        body = b"{}"
+        for path_part, payload in self.bodies.items():
+            if path_part in self.path:
+                body = payload
+                break
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            # tell the client not to return the connection to its pool
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_certificate(directory):
+    cert_file = os.path.join(directory, "cert.pem")
+    key_file = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", key_file, "-out", cert_file, "-days", "1",
+            "-subj", "/CN=localhost",
+            "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert_file, key_file
+
+
+def start_server(cert_file, key_file):
+    StandInHandler.bodies = {
+        "/stations/": _read_example("station_data.json"),
+        "/weather": _read_example("city_data.json"),
+        "/forecast": _read_example("forecast.json"),
+    }
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_file, key_file)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def point_urls_to(port):
+    # "localhost" stands in for Digitraffic and "127.0.0.1" for OpenWeatherMap,
+    # so the runner keeps two separate host pools as in production
+    road = f"https://localhost:{port}"
+    owm = f"https://127.0.0.1:{port}"
+    Urls.WEATHER_STATION_URL = road + "/api/weather/v1/stations/{}/data"
+    Urls.OPENWEATHERMAP_CITY_URL = owm + "/data/2.5/weather?q={}&appid={}"
+    Urls.OPENWEATHERMAP_LOCATION_URL = owm + "/data/2.5/weather?lat={}&lon={}&appid={}"
+    Urls.OPENWEATHERMAP_FORERCAST_URL = owm + "/data/2.5/forecast?cnt=8&lat={}&lon={}&appid={}"
+    Urls.WARM_UP_URLS = [road + "/", owm + "/"]
+
+
+class _Coordinates:
+    latitude = 65.01
+    longitude = 25.47
+
+
+def time_refreshes(runner, refresh_count):
+    samples = []
+    for _ in range(refresh_count):
+        start = time.perf_counter()
+        runner.get_road_weather(12082)
+        runner.get_city_weather("Oulu", _Coordinates(), "key")
+        runner.get_forecast(_Coordinates(), "key")
+        samples.append((time.perf_counter() - start) * 1000.0)
+        if runner.has_error:
+            raise RuntimeError(runner.error_message)
+    return samples
+
+
+def run_benchmark(refresh_count=50):
+    with tempfile.TemporaryDirectory() as directory:
+        cert_file, key_file = create_certificate(directory)
+        os.environ["REQUESTS_CA_BUNDLE"] = cert_file
+        server = start_server(cert_file, key_file)
+        point_urls_to(server.server_address[1])
+
+        cold_runner = RequestRunner(keep_alive=False)
+        cold = time_refreshes(cold_runner, refresh_count)
+        cold_runner.close()
+
+        warm_runner = RequestRunner()
+        warm_runner.warm_up(background=False)
+        warm = time_refreshes(warm_runner, refresh_count)
+        warm_runner.close()
+
+        server.shutdown()
+
+    print(f"{refresh_count} refreshes, 3 requests each, against a local HTTPS stand-in")
+    for label, samples in (("cold", cold), ("warm", warm)):
+        print(
+            f"{label}: median {statistics.median(samples):7.2f} ms, "
+            f"min {min(samples):7.2f} ms, max {max(samples):7.2f} ms"
+        )
+    print(f"speed-up (median): {statistics.median(cold) / statistics.median(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
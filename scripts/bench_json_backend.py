@@ -0,0 +1,68 @@
+"""Benchmark the JSON decoder backends of `utils/json_backend.py`.
+
+Decodes response bodies as `RequestRunner` does (from the raw body bytes)
+with every installed backend:
+
+- each file in `examples/`
+- a synthetic all-stations data payload of about 10 MB
+  (`examples/station_data.json` repeated with distinct station ids)
+
+Run from repository root: `python scripts/bench_json_backend.py [payload_mb]`
+"""
+import json
+import os
+import sys
+import timeit
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from utils import json_backend
+
+
+def all_stations_payload(size_mb):
+    with open(os.path.join(ROOT, "examples", "station_data.json"), "r") as f:
+        station = json.load(f)
+    station_size = len(json.dumps(station, ensure_ascii=False).encode("utf-8"))
+    stations = []
+    for i in range(int(size_mb * 1e6 / station_size) + 1):
+        station["id"] = 1000 + i
+        stations.append(json.dumps(station, ensure_ascii=False))
+    body = '{"dataUpdatedTime": "2025-06-17T03:05:33Z", "stations": [' + ",".join(stations) + "]}"
+    return body.encode("utf-8")
+
+
+def time_decode(body, repeat=5):
+    number = max(1, int(2e7 / len(body)))
+    return min(timeit.repeat(lambda: json_backend.loads(body), number=number, repeat=repeat)) / number
+
+
+def run_benchmark(payload_mb=10.0):
+    bodies = []
+    for file_name in sorted(os.listdir(os.path.join(ROOT, "examples"))):
+        if file_name.endswith(".json"):
+            with open(os.path.join(ROOT, "examples", file_name), "rb") as f:
+                bodies.append((file_name, f.read()))
+    bodies.append((f"all stations ({payload_mb:g} MB)", all_stations_payload(payload_mb)))
+
+    active = json_backend.get_backend()
+    backends = json_backend.available_backends()
+    print(f"active backend: {active}, installed: {', '.join(backends)}")
+    try:
+        for label, body in bodies:
+            times = {}
+            for name in backends:
+                json_backend.set_backend(name)
+                times[name] = time_decode(body)
+            line = ", ".join(f"{name} {seconds * 1000:8.3f} ms" for name, seconds in times.items())
+            if "json" in times and len(times) > 1:
+                line += f", speed-up {times['json'] / times[backends[0]]:4.1f}x"
+            print(f"{label:28} {len(body) / 1024:8.1f} KiB: {line}")
+    finally:
+        json_backend.set_backend(active)
+
+
+if __name__ == "__main__":
+    run_benchmark(float(sys.argv[1]) if len(sys.argv) > 1 else 10.0)
@@ -0,0 +1,175 @@
+"""Memory benchmark for the station catalogue and sensor model objects.
+
+Builds a production-scale catalogue (`examples/station_metadata.json` repeated
+with distinct ids and names) and all-station sensor data
+(`examples/station_data.json` repeated for every station), and reports the
+bytes per station and per sensor still allocated after loading (the decoded
+JSON has been released), measured with `tracemalloc`.
+
+For comparison the same data is loaded into dictionary-based replicas of the
+previous model classes (no __slots__, no string interning, a new default
+datetime per instance).
+
+Run from repository root: `python scripts/bench_memory.py [station_count]`
+"""
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from model.station_info import WeatherStationInfo
+from model.weather_station import Sensor
+from utils.utils import Utils
+
+
+class LegacyCoordinates:
+    def __init__(self, lat=0.0, lon=0.0, alt=0.0):
+        self._lat = lat
+        self._lon = lon
+        self._alt = alt
+
+
+class LegacyProperties:
+    def __init__(self):
+        self._id = int(0)
+        self._name = ""
+        self._collection_status = ""
+        self._data_updated_time = datetime(1970, 1, 1, 0, 0, 0)
+
+
+class LegacyStationInfo:
+    def __init__(self):
+        self._formatted_name = ""
+        self._coordinates = LegacyCoordinates()
+        self._properties = LegacyProperties()
+
+    def parse(self, station_json):
+        self._coordinates._lat = station_json["geometry"]["coordinates"][1]
+        self._coordinates._lon = station_json["geometry"]["coordinates"][0]
+        self._coordinates._alt = station_json["geometry"]["coordinates"][2]
+        self._properties._id = station_json["id"]
+        self._properties._name = station_json["properties"]["name"]
+        self._properties._collection_status = station_json["properties"]["collectionStatus"]
+        self._properties._data_updated_time = Utils.timestamp_to_datetime(
+            station_json["properties"]["dataUpdatedTime"]
+        )
+        return True
+
+
+class LegacySensor:
+    def __init__(self):
+        self._id = 0
+        self._station_id = 0
+        self._name = ""
+        self._short_name = ""
+        self._measured_time = datetime(1970, 1, 1, 0, 0, 0)
+        self._value = 0.0
+        self._unit = ""
+        self._sensor_value_description = ""
+        self._sensor_status = Sensor.SensorStatus.OK
+        self._sensor_type = Sensor.SensorType.NOT_DEFINED
+
+    def parse(self, sensor_json):
+        self._id = sensor_json["id"]
+        self._station_id = sensor_json["stationId"]
+        self._name = sensor_json["name"]
+        self._short_name = sensor_json["shortName"]
+        self._measured_time = Utils.timestamp_to_datetime(sensor_json["measuredTime"])
+        self._value = sensor_json["value"]
+        self._unit = sensor_json["unit"]
+        if "sensorValueDescriptionFi" in sensor_json:
+            self._sensor_value_description = sensor_json["sensorValueDescriptionFi"]
+        return True
+
+
+def _load_example(file_name):
+    with open(os.path.join(ROOT, "examples", file_name), "rb") as f:
+        return f.read()
+
+
+def decode_catalogue(station_count, metadata):
+    """Decode one catalogue feature per station with distinct ids and names."""
+    features = []
+    for i in range(station_count):
+        feature = json.loads(metadata)
+        feature["id"] = 1000 + i
+        feature["properties"]["name"] = f"vt{i % 30}_Paikka{i}_Asema{i}"
+        features.append(feature)
+    return features
+
+
+def decode_station_data(station_count, station_data):
+    """Decode the example sensor list once per station, as in an all-station payload."""
+    return [json.loads(station_data)["sensorValues"] for _ in range(station_count)]
+
+
+def retained_bytes(decode, build):
+    """Return memory still allocated after building objects and dropping the decoded JSON."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    payload = decode()
+    objects = build(payload)
+    del payload
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return retained, len(objects)
+
+
+def measure(station_count, station_class, sensor_class):
+    metadata = _load_example("station_metadata.json")
+    station_data = _load_example("station_data.json")
+
+    def build_stations(features):
+        stations = []
+        for feature in features:
+            station = station_class()
+            station.parse(feature)
+            stations.append(station)
+        return stations
+
+    def build_sensors(sensor_lists):
+        sensors = []
+        for sensor_list in sensor_lists:
+            for sensor_json in sensor_list:
+                sensor = sensor_class()
+                sensor.parse(sensor_json)
+                sensors.append(sensor)
+        return sensors
+
+    station_bytes, n_stations = retained_bytes(
+        lambda: decode_catalogue(station_count, metadata), build_stations
+    )
+    sensor_bytes, n_sensors = retained_bytes(
+        lambda: decode_station_data(station_count, station_data), build_sensors
+    )
+    return station_bytes / n_stations, sensor_bytes / n_sensors, n_sensors
+
+
+def run_benchmark(station_count=500):
+    results = {}
+    for label, station_class, sensor_class in (
+        ("dict-based", LegacyStationInfo, LegacySensor),
+        ("slots", WeatherStationInfo, Sensor),
+    ):
+        per_station, per_sensor, n_sensors = measure(station_count, station_class, sensor_class)
+        results[label] = (per_station, per_sensor)
+        if len(results) == 1:
+            print(f"{station_count} stations, {n_sensors} sensors (retained after loading)")
+        print(f"{label:10}: {per_station:6.0f} bytes/station, {per_sensor:6.0f} bytes/sensor")
+    print(
+        f"saving: {1 - results['slots'][0] / results['dict-based'][0]:.0%} per station, "
+        f"{1 - results['slots'][1] / results['dict-based'][1]:.0%} per sensor"
+    )
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,57 @@
+"""Throughput benchmark of the feels-like temperature calculation.
+
+Compares `model.physics.fmi_feels_like_temperature` called once per station
+with `fmi_feels_like_temperature_array` over all stations. Readings are
+random but realistic: wind speed and temperature with 0.1 resolution,
+humidity in whole percent, and about 2% of readings missing
+(`Constants.INVALID_VALUE`).
+
+Run from repository root: `python scripts/bench_physics.py [station_count ...]`
+"""
+import os
+import random
+import sys
+import timeit
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from definitions import Constants
+from model.physics import fmi_feels_like_temperature, fmi_feels_like_temperature_array
+
+
+def make_readings(station_count, seed=1):
+    rng = random.Random(seed)
+
+    def reading(value):
+        return Constants.INVALID_VALUE if rng.random() < 0.02 else value
+
+    wind = [reading(rng.randint(0, 250) / 10) for _ in range(station_count)]
+    rh = [reading(float(rng.randint(20, 100))) for _ in range(station_count)]
+    temp = [reading(rng.randint(-350, 330) / 10) for _ in range(station_count)]
+    return wind, rh, temp
+
+
+def run_benchmark(station_counts=(500, 50000)):
+    for station_count in station_counts:
+        wind, rh, temp = make_readings(station_count)
+        number = max(1, 200000 // station_count)
+
+        def scalar():
+            return [fmi_feels_like_temperature(w, h, t) for w, h, t in zip(wind, rh, temp)]
+
+        def vectorized():
+            return fmi_feels_like_temperature_array(wind, rh, temp)
+
+        assert vectorized().tolist() == scalar()
+        print(f"{station_count} stations")
+        for label, func in (("scalar", scalar), ("array", vectorized)):
+            seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+            print(f"  {label:6}: {seconds * 1000:8.3f} ms, {station_count / seconds:12,.0f} stations/s")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [500, 50000]
+    run_benchmark(counts)
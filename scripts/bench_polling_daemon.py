@@ -0,0 +1,126 @@
+"""Benchmark the scheduling of the headless polling daemon.
+
+Simulates stations that publish every 1, 5 or 10 minutes at random phases
+and runs `PollingDaemon` against them on a simulated clock (requests
+complete instantly). Reports, per new observation found, the number of
+requests made and the delay from publishing to polling, and the peak
+number of requests started in one second, compared with polling every
+station at a fixed 60 s interval as the UI timer does.
+
+Run from repository root: `python scripts/bench_polling_daemon.py [stations] [hours]`
+"""
+import copy
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from controller.polling_daemon import PollingDaemon
+from model.station_info import WeatherStationList
+
+START = 1750000000.0
+FIXED_INTERVAL_S = 60
+
+
+class SimulatedUpstream:
+    def __init__(self, station_ids, rng, clock):
+        with open(os.path.join(ROOT, "examples", "station_data.json"), "r") as f:
+            self._template = json.load(f)
+        self._template["sensorValues"] = self._template["sensorValues"][:5]
+        self._schedule = {i: (rng.choice([60, 300, 600]), rng.uniform(0, 600)) for i in station_ids}
+        self._clock = clock
+        self.has_error = False
+        self.error_message = ""
+        self.request_seconds = Counter()
+
+    def published_at(self, station_id, now_s):
+        interval, phase = self._schedule[station_id]
+        return now_s - (now_s - START - phase) % interval
+
+    def get_road_weather(self, station_id):
+        now = self._clock()
+        self.request_seconds[int(now)] += 1
+        data = copy.copy(self._template)
+        data["id"] = station_id
+        published = datetime.fromtimestamp(self.published_at(station_id, now), timezone.utc)
+        data["dataUpdatedTime"] = published.strftime("%Y-%m-%dT%H:%M:%SZ")
+        return data
+
+    def updates_between(self, station_id, start_s, end_s):
+        interval, phase = self._schedule[station_id]
+        return int((end_s - START - phase) // interval) - int((start_s - START - phase) // interval)
+
+
+def make_station_list(station_ids):
+    with open(os.path.join(ROOT, "examples", "station_metadata.json"), "r") as f:
+        template = json.load(f)
+    stations = []
+    for station_id in station_ids:
+        station = copy.deepcopy(template)
+        station["id"] = station_id
+        station["properties"]["name"] = f"vt1_Paikka{station_id}"
+        stations.append(station)
+    station_list = WeatherStationList()
+    station_list.parse(stations)
+    return station_list
+
+
+def run_benchmark(station_count=2000, hours=6.0):
+    station_ids = list(range(1, station_count + 1))
+    now = [START]
+    clock = lambda: now[0]
+    upstream = SimulatedUpstream(station_ids, random.Random(1), clock)
+    lags = []
+
+    def on_update(station):
+        lags.append((now[0], now[0] - station.data_updated_time.timestamp()))
+
+    daemon = PollingDaemon(
+        make_station_list(station_ids), service=upstream, workers=8, on_update=on_update, clock=clock
+    )
+    end = START + hours * 3600
+    started = time.perf_counter()
+    while now[0] < end:
+        if not daemon.in_flight:
+            now[0] = max(now[0], daemon.scheduler.next_due())  # jump to the next due poll
+        daemon.step(timeout_s=1.0)
+    while daemon.in_flight:
+        daemon.step(timeout_s=1.0)
+    elapsed = time.perf_counter() - started
+    daemon.close()
+
+    # skip the first hour: update intervals are learned from the first observations
+    warm = START + 3600
+    found = daemon.updates
+    published = sum(upstream.updates_between(i, warm, end) for i in station_ids)
+    warm_polls = sum(n for second, n in upstream.request_seconds.items() if second >= warm)
+    warm_lags = sorted(lag for polled, lag in lags if polled >= warm)
+    warm_peak = max(n for second, n in upstream.request_seconds.items() if second >= warm)
+    fixed_polls = station_count * (end - warm) / FIXED_INTERVAL_S
+
+    print(f"{station_count} stations publishing every 1/5/10 min, {hours:g} h simulated in {elapsed:.1f} s")
+    print(f"daemon: {daemon.polls} polls, {found} updates found, {daemon.errors} errors")
+    print(
+        f"after the first hour: {warm_polls / published:.2f} requests per update "
+        f"(fixed {FIXED_INTERVAL_S} s interval: {fixed_polls / published:.2f}), "
+        f"delay after publishing median {warm_lags[len(warm_lags) // 2]:.0f} s, "
+        f"p95 {warm_lags[int(len(warm_lags) * 0.95)]:.0f} s "
+        f"(fixed interval: ~{FIXED_INTERVAL_S / 2:.0f} s mean)"
+    )
+    print(
+        f"peak requests started in one second: {max(upstream.request_seconds.values())} at start-up, "
+        f"{warm_peak} after the first hour (fixed interval, stations in step: {station_count})"
+    )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run_benchmark(int(args[0]) if args else 2000, float(args[1]) if len(args) > 1 else 6.0)
@@ -0,0 +1,98 @@
+"""Benchmark the OpenWeatherMap requests saved by per-source refresh cadences.
+
+Replays a day of the UI refresh timer for a station that publishes every
+1, 5, 10 or 20 minutes. Before, every timer tick requested road weather,
+city weather and the forecast; now each tick requests only the sources
+`AppController.due_sources` returns, and the timer also fires when city
+weather or the forecast is due. Reports the requests per source and day.
+
+Run from repository root: `python scripts/bench_refresh_schedule.py`
+"""
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from controller.app_controller import AppController
+from definitions import Constants, DataSource
+
+START = 1750032000.0  # midnight UTC
+DAY_S = 24 * 3600
+
+
+class SimulatedService:
+    def __init__(self, interval_s, clock):
+        self.has_error = False
+        self.error_message = ""
+        self.interval_s = interval_s
+        self.clock = clock
+        self.requests = Counter()
+
+    def get_road_weather(self, station_id):
+        self.requests[DataSource.ROAD_WEATHER] += 1
+        now = self.clock()
+        published = now - (now - START) % self.interval_s
+        updated = datetime.fromtimestamp(published, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return {"dataUpdatedTime": updated, "sensorValues": []}
+
+    def get_city_weather(self, city, coordinates, api_key):
+        self.requests[DataSource.CITY_WEATHER] += 1
+        return {"weather": [{"id": 800}]}
+
+    def get_forecast(self, coordinates, api_key):
+        self.requests[DataSource.FORECAST] += 1
+        return {"list": []}
+
+
+def replay_day(interval_s, per_source):
+    """Run the UI refresh loop for a day; returns the requests made per `DataSource`."""
+    now = [START]
+    service = SimulatedService(interval_s, lambda: now[0])
+    controller = AppController(service=service)
+    while now[0] < START + DAY_S:
+        sources = controller.due_sources(now[0]) if per_source else set(DataSource)
+        if DataSource.ROAD_WEATHER in sources:
+            controller.fetch_and_load_station_data("1")
+        if DataSource.CITY_WEATHER in sources:
+            controller.store_city_weather(service.get_city_weather("", None, ""), now[0])
+        if DataSource.FORECAST in sources:
+            controller.store_forecast(service.get_forecast(None, ""), now[0])
+
+        # the timer of WeatherApp._schedule_refresh
+        waiting_time_s = controller.get_current_station().cadence.seconds_until_next_update(now[0])
+        if waiting_time_s <= 0:
+            waiting_time_s = Constants.DEFAULT_POLLING_INTERVAL_S
+        timer_s = waiting_time_s + Constants.STATION_UPDATE_DELAY_S
+        if per_source:
+            for source in (DataSource.CITY_WEATHER, DataSource.FORECAST):
+                due_in_s = controller.refresh_time(source) - now[0]
+                if due_in_s > 0:
+                    timer_s = min(timer_s, due_in_s)
+        now[0] += timer_s
+    return service.requests
+
+
+def run_benchmark():
+    print("requests per day: road weather / city weather / forecast")
+    for interval_s in (60, 300, 600, 1200):
+        before = replay_day(interval_s, per_source=False)
+        after = replay_day(interval_s, per_source=True)
+        owm_before = before[DataSource.CITY_WEATHER] + before[DataSource.FORECAST]
+        owm_after = after[DataSource.CITY_WEATHER] + after[DataSource.FORECAST]
+        print(
+            f"station updating every {interval_s // 60:2} min: "
+            f"before {before[DataSource.ROAD_WEATHER]:4} / {before[DataSource.CITY_WEATHER]:4} / "
+            f"{before[DataSource.FORECAST]:4}, "
+            f"after {after[DataSource.ROAD_WEATHER]:4} / {after[DataSource.CITY_WEATHER]:4} / "
+            f"{after[DataSource.FORECAST]:4}, "
+            f"OpenWeatherMap requests {owm_before / owm_after:4.1f}x fewer"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,102 @@
+"""Benchmark the incremental rollups of `model/rollups.py`.
+
+Feeds `StationRollups` a week of 1-minute readings of the 87 sensors of
+`examples/station_data.json` and reports:
+
+- the cost of keeping the rollups up to date, per poll of one station
+- dashboard queries (hourly min/max/mean of the last day and week, daily
+  of the last week) for every sensor of the station, answered from the
+  rollups and recomputed from the raw readings
+
+Run from repository root: `python scripts/bench_rollups.py`
+"""
+import json
+import os
+import random
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from model.rollups import StationRollups
+
+START = 1750032000  # midnight UTC
+MINUTES = 7 * 24 * 60
+
+
+class FakeSensor:
+    __slots__ = ("id", "float_value", "measured_time")
+
+    def __init__(self, sensor_id):
+        self.id = sensor_id
+        self.float_value = 0.0
+        self.measured_time = None
+
+
+def recompute(raw, start_s, end_s, resolution_s):
+    """Hourly/daily min, max and mean from raw (timestamp, value) pairs, as a dashboard would."""
+    buckets = {}
+    for timestamp, value in raw:
+        if start_s <= timestamp < end_s:
+            bucket = buckets.setdefault(timestamp // resolution_s, [value, value, 0.0, 0])
+            bucket[0] = min(bucket[0], value)
+            bucket[1] = max(bucket[1], value)
+            bucket[2] += value
+            bucket[3] += 1
+    return [(b * resolution_s, lo, hi, total / n) for b, (lo, hi, total, n) in sorted(buckets.items())]
+
+
+def run_benchmark():
+    with open(os.path.join(ROOT, "examples", "station_data.json"), "r") as f:
+        sensor_ids = [s["id"] for s in json.load(f)["sensorValues"]]
+    rng = random.Random(1)
+    sensors = [FakeSensor(i) for i in sensor_ids]
+    rollups = StationRollups()
+    raw = {i: [] for i in sensor_ids}
+
+    record_s = 0.0
+    for minute in range(MINUTES):
+        timestamp = START + minute * 60
+        measured_time = datetime.fromtimestamp(timestamp, timezone.utc)
+        for sensor in sensors:
+            sensor.measured_time = measured_time
+            sensor.float_value = round(rng.uniform(-10.0, 10.0), 1)
+            raw[sensor.id].append((timestamp, sensor.float_value))
+        started = time.perf_counter()
+        rollups.record(sensors)
+        record_s += time.perf_counter() - started
+    print(
+        f"{len(sensors)} sensors, {MINUTES} polls at 1-minute cadence: "
+        f"{record_s / MINUTES * 1e6:.0f} µs per poll to update rollups"
+    )
+
+    end = START + MINUTES * 60
+    queries = [
+        ("hourly, last day", end - 86400, 3600, 24),
+        ("hourly, last week", end - 7 * 86400, 3600, 168),
+        ("daily, last week", end - 7 * 86400, 86400, 7),
+    ]
+    for label, start, resolution, points in queries:
+        series = rollups.query(sensor_ids[0], start, end, points)
+        expected = recompute(raw[sensor_ids[0]], start, end, resolution)
+        assert series.resolution_s == resolution
+        assert [s for s, *_ in expected] == series.starts.tolist()
+        assert [lo for _, lo, _, _ in expected] == series.minimums.tolist()
+
+        query_all = lambda: [rollups.query(i, start, end, points) for i in sensor_ids]
+        recompute_all = lambda: [recompute(raw[i], start, end, resolution) for i in sensor_ids]
+        from_rollups = min(timeit.repeat(query_all, number=5, repeat=3)) / 5
+        from_raw = min(timeit.repeat(recompute_all, number=1, repeat=3))
+        print(
+            f"{label:18} all sensors: rollups {from_rollups * 1000:7.2f} ms, "
+            f"recomputed {from_raw * 1000:8.2f} ms, speed-up {from_raw / from_rollups:5.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,126 @@
+"""Micro-benchmark of the sensor lookups done by one UI render.
+
+Parses `examples/station_data.json` and times the `WeatherStation` accessors
+that `WeatherApp._display_weather_data` calls for one render:
+
+- linear scan: the original `_find_sensor`/`_find_sensor_by_id`/`get_value`
+  with linear scans, identifier dispatch and string round-trip conversions
+- indexed, str conversion: hash-indexed lookups, values still converted with
+  `float(str(value))` / `int(str(value).split(".")[0])` on every access
+- indexed, typed: hash-indexed lookups returning the values decoded at parse time
+
+Run from repository root: `python scripts/bench_sensor_lookup.py [renders]`
+"""
+import json
+import os
+import sys
+import timeit
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from definitions import Constants, ConversionType
+from model.weather_station import WeatherStation
+
+
+def _str_to_float(sensor):
+    return float(str(sensor.value))
+
+
+def _str_to_int(sensor):
+    return int(str(sensor.value).split(".")[0])
+
+
+class StrConversionStation(WeatherStation):
+    """Indexed lookups, but values converted through strings on every access."""
+
+    def get_float(self, sensor_name):
+        sensor = self._sensors_by_name.get(sensor_name)
+        return Constants.INVALID_VALUE if sensor is None else _str_to_float(sensor)
+
+    def get_int(self, sensor_name):
+        sensor = self._sensors_by_name.get(sensor_name)
+        return Constants.INVALID_VALUE if sensor is None else _str_to_int(sensor)
+
+    def get_int_by_id(self, sensor_id):
+        sensor = self._sensors_by_id.get(sensor_id)
+        return Constants.INVALID_VALUE if sensor is None else _str_to_int(sensor)
+
+
+class LinearScanStation(WeatherStation):
+    """Baseline: linear sensor scans, identifier dispatch and string conversions."""
+
+    def _find_sensor(self, sensor_name):
+        for sensor in self.sensor_values:
+            if sensor.name == sensor_name:
+                return sensor
+        return None
+
+    def _find_sensor_by_id(self, sensor_id):
+        for sensor in self.sensor_values:
+            if sensor.id == sensor_id:
+                return sensor
+        return None
+
+    def get_value(self, sensor_identifier, conversion_type=ConversionType.TO_INT):
+        if sensor_identifier.isnumeric():
+            sensor = self._find_sensor_by_id(int(sensor_identifier))
+        else:
+            sensor = self._find_sensor(sensor_identifier)
+        if sensor is None:
+            return Constants.INVALID_VALUE
+        if conversion_type == ConversionType.TO_FLOAT:
+            return _str_to_float(sensor)
+        return _str_to_int(sensor)
+
+    def get_float(self, sensor_name):
+        return self.get_value(sensor_name, ConversionType.TO_FLOAT)
+
+    def get_int(self, sensor_name):
+        return self.get_value(sensor_name)
+
+    def get_int_by_id(self, sensor_id):
+        return self.get_value(str(sensor_id))
+
+
+def render_lookups(station):
+    """The sensor accessors used by one `_display_weather_data` call."""
+    station.wind_speed
+    station.air_humidity
+    station.air_temperature
+    station.air_temperature_str
+    station.temperature_change_str
+    station.wind_speed_str
+    station.wind_speed_str
+    station.wind_direction
+    station.wind_direction
+    station.wind_speed_max_str
+    station.get_present_weather()
+    station.air_humidity
+    station.visibility_str
+    station.air_temperature
+
+
+def run_benchmark(renders=20000):
+    with open(os.path.join(ROOT, "examples", "station_data.json"), "r") as f:
+        station_json = json.load(f)
+
+    print(f"{len(station_json['sensorValues'])} sensors, {renders} renders")
+    results = {}
+    for label, station_class in (
+        ("linear scan", LinearScanStation),
+        ("indexed, str conversion", StrConversionStation),
+        ("indexed, typed", WeatherStation),
+    ):
+        station = station_class()
+        station.parse(station_json)
+        seconds = min(timeit.repeat(lambda: render_lookups(station), number=renders, repeat=5))
+        results[label] = seconds / renders * 1e6
+        speed_up = results["linear scan"] / results[label]
+        print(f"{label:24}: {results[label]:6.2f} us per render ({speed_up:.1f}x)")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
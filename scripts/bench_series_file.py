@@ -0,0 +1,122 @@
+"""Benchmark the compressed series file of `model/series_file.py`.
+
+Simulates a season (90 days) of 10-minute readings of a sample of stations,
+each with the 87 sensors of `examples/station_data.json`: measurements
+random walk from the example values in steps of their last decimal, status
+sensors and sensors reading zero (no rain, no salt, ...) change rarely, and
+a few timestamps are late by a second or two. Reports the encoding speed,
+bytes per reading, the size of a season for all stations extrapolated from
+the sample, and the cost of a one-day range scan compared with decoding the
+whole series.
+
+Run from repository root: `python scripts/bench_series_file.py [sample_stations] [all_stations]`
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import timeit
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from model.series_file import SeriesFileReader, SeriesFileWriter
+
+START = 1750000000
+DAYS = 90
+INTERVAL_S = 600
+SQLITE_BYTES_PER_READING = 25  # measured by scripts/bench_archive.py
+STATUS_WORDS = ("STATUS", "TILA", "KELI", "VAROITUS", "STAT", "AURINKOUP", "VALOISAA")
+
+
+def decimals_of(value):
+    text = repr(float(value))
+    return 0 if text.endswith(".0") else len(text.split(".")[1])
+
+
+def simulate_station(sensors, rng, count):
+    times = []
+    t = START
+    for _ in range(count):
+        times.append(t + (rng.random() < 0.05) * rng.randint(1, 2))
+        t += INTERVAL_S
+    series = []
+    for sensor in sensors:
+        decimals = decimals_of(sensor["value"])
+        step = 10.0**-decimals
+        rarely_changing = sensor["value"] == 0.0 or any(word in sensor["name"] for word in STATUS_WORDS)
+        change = 0.01 if rarely_changing else 0.6
+        scaled = round(sensor["value"] * 10**decimals)
+        values = []
+        for _ in range(count):
+            if rng.random() < change:
+                scaled += rng.randint(-2, 2)
+            values.append(round(scaled * step, decimals))
+        series.append((sensor["id"], values))
+    return times, series
+
+
+def run_benchmark(sample_stations=5, all_stations=500):
+    with open(os.path.join(ROOT, "examples", "station_data.json"), "r") as f:
+        sensors = json.load(f)["sensorValues"]
+    rng = random.Random(1)
+    count = DAYS * 24 * 3600 // INTERVAL_S
+    stations = [simulate_station(sensors, rng, count) for _ in range(sample_stations)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = os.path.join(tmp, "season.bin")
+        started = time.perf_counter()
+        with SeriesFileWriter(file_name) as writer:
+            for station_id, (times, series) in enumerate(stations, start=1000):
+                for sensor_id, values in series:
+                    writer.add_series(station_id, sensor_id, times, values)
+        encode_s = time.perf_counter() - started
+        size = os.path.getsize(file_name)
+        points = writer.points
+
+        open_s = min(timeit.repeat(lambda: SeriesFileReader(file_name).close(), number=10, repeat=3)) / 10
+        with SeriesFileReader(file_name) as reader:
+            station_id, sensor_id = 1000, sensors[0]["id"]
+            day_start = START + 45 * 86400
+            day = reader.scan(station_id, sensor_id, day_start, day_start + 86400)
+            full = reader.scan(station_id, sensor_id)
+            expected = stations[0][1][0][1]
+            assert full[1].tolist() == expected and len(day[0]) == 144
+
+            reader.blocks_decoded = 0
+            day_scan = lambda: reader.scan(station_id, sensor_id, day_start, day_start + 86400)
+            day_s = min(timeit.repeat(day_scan, number=20, repeat=3)) / 20
+            day_blocks = reader.blocks_decoded / 60
+            reader.blocks_decoded = 0
+            full_s = min(timeit.repeat(lambda: reader.scan(station_id, sensor_id), number=5, repeat=3)) / 5
+            full_blocks = reader.blocks_decoded / 15
+
+    per_point = size / points
+    season_mb = per_point * count * len(sensors) * all_stations / 1e6
+    print(
+        f"{sample_stations} stations x {len(sensors)} sensors x {count} readings "
+        f"({DAYS} days at {INTERVAL_S // 60} min): {points} readings"
+    )
+    print(
+        f"encode {points / encode_s:,.0f} readings/s, "
+        f"file {size / 1e6:.2f} MB, {per_point:.2f} bytes/reading"
+    )
+    print(
+        f"season of {all_stations} stations: {season_mb:,.0f} MB "
+        f"(raw 16 bytes/reading {16 * season_mb / per_point:,.0f} MB, "
+        f"SQLite archive ~{SQLITE_BYTES_PER_READING * season_mb / per_point:,.0f} MB)"
+    )
+    print(f"open (index only): {open_s * 1000:.2f} ms")
+    print(
+        f"one-day scan {day_s * 1000:.2f} ms ({day_blocks:g} blocks), "
+        f"full-season scan {full_s * 1000:.2f} ms ({full_blocks:g} blocks)"
+    )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run_benchmark(*args)
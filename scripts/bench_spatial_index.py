@@ -0,0 +1,83 @@
+"""Benchmark nearest-station queries: full scan vs. `SpatialIndex`.
+
+Synthetic catalogues spread over Finland; each query point is a random
+location in Finland. Reports the time per query for the 5 nearest stations
+and for stations within 30 km, and the time to index the catalogue.
+
+The grid cell size is `Constants.SPATIAL_INDEX_CELL_KM` (sized for the real
+catalogue of about 500 stations) scaled by sqrt(500 / station_count), so that
+denser synthetic catalogues keep about the same number of stations per cell.
+
+Run from repository root: `python scripts/bench_spatial_index.py [station_count ...]`
+"""
+import math
+import os
+import random
+import sys
+import time
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from definitions import Constants
+from model.helpers import distance_km
+from model.spatial_index import SpatialIndex
+
+QUERY_COUNT = 200
+
+
+def make_points(count, seed=1):
+    rng = random.Random(seed)
+    return [(i, rng.uniform(59.7, 70.0), rng.uniform(20.5, 31.5)) for i in range(count)]
+
+
+def scan_nearest(points, lat, lon, k):
+    return sorted(points, key=lambda p: distance_km(lat, lon, p[1], p[2]))[:k]
+
+
+def scan_within(points, lat, lon, radius_km):
+    return [p for p in points if distance_km(lat, lon, p[1], p[2]) <= radius_km]
+
+
+def per_query_us(func, queries):
+    start = time.perf_counter()
+    for lat, lon in queries:
+        func(lat, lon)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def run_benchmark(station_counts=(500, 50000)):
+    rng = random.Random(2)
+    queries = [(rng.uniform(59.8, 69.9), rng.uniform(21.0, 31.0)) for _ in range(QUERY_COUNT)]
+
+    for station_count in station_counts:
+        points = make_points(station_count)
+        start = time.perf_counter()
+        index = SpatialIndex(Constants.SPATIAL_INDEX_CELL_KM * math.sqrt(500 / station_count))
+        for item_id, lat, lon in points:
+            index.insert(item_id, lat, lon, item_id)
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"{station_count} stations, index build {build_ms:.1f} ms")
+
+        for label, scan, indexed in (
+            (
+                "nearest 5",
+                lambda lat, lon: scan_nearest(points, lat, lon, 5),
+                lambda lat, lon: index.nearest(lat, lon, 5),
+            ),
+            (
+                "within 30 km",
+                lambda lat, lon: scan_within(points, lat, lon, 30.0),
+                lambda lat, lon: index.within(lat, lon, 30.0),
+            ),
+        ):
+            old = per_query_us(scan, queries)
+            new = per_query_us(indexed, queries)
+            print(f"  {label:12}: scan {old:9.1f} us, index {new:7.1f} us, speed-up {old / new:6.1f}x")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [500, 50000]
+    run_benchmark(counts)
@@ -0,0 +1,107 @@
+"""Benchmark catalogue queries: list of `WeatherStationInfo` objects vs. `StationTable`.
+
+Builds synthetic catalogues spread over Finland and times three queries on
+both paths:
+
+- bounding box filter (southern Finland)
+- the 10 stations closest to a point (haversine distance sort)
+- collection status filter
+
+Table build time (once per parse) is reported separately.
+
+Run from repository root: `python scripts/bench_station_table.py [station_count ...]`
+"""
+import os
+import random
+import sys
+import timeit
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from model.helpers import distance_km
+from model.station_info import WeatherStationList
+from model.station_table import HAS_NUMPY
+
+BBOX = (59.8, 21.0, 61.5, 27.0)
+POINT = (60.17, 24.94)
+STATUSES = ["GATHERING", "GATHERING", "GATHERING", "REMOVED_TEMPORARILY"]
+
+
+def make_catalogue(station_count, seed=1):
+    rng = random.Random(seed)
+    return [
+        {
+            "geometry": {
+                "coordinates": [rng.uniform(20.5, 31.5), rng.uniform(59.7, 70.0), rng.uniform(0, 300)]
+            },
+            "id": 1000 + i,
+            "properties": {
+                "name": f"vt{i % 30}_Paikka{i}",
+                "collectionStatus": rng.choice(STATUSES),
+                "dataUpdatedTime": "2025-06-17T03:05:33Z",
+            },
+        }
+        for i in range(station_count)
+    ]
+
+
+def list_queries(stations):
+    min_lat, min_lon, max_lat, max_lon = BBOX
+    return {
+        "bbox": lambda: [
+            s
+            for s in stations
+            if min_lat <= s.coordinates.latitude <= max_lat
+            and min_lon <= s.coordinates.longitude <= max_lon
+        ],
+        "nearest 10": lambda: sorted(
+            stations,
+            key=lambda s: distance_km(*POINT, s.coordinates.latitude, s.coordinates.longitude),
+        )[:10],
+        "status": lambda: [s for s in stations if s._properties._collection_status == "GATHERING"],
+    }
+
+
+def table_queries(table):
+    return {
+        "bbox": lambda: table.in_bbox(*BBOX),
+        "nearest 10": lambda: table.sort_by_distance(*POINT, limit=10),
+        "status": lambda: table.with_status("GATHERING"),
+    }
+
+
+def best_time(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def run_benchmark(station_counts=(500, 50000)):
+    if not HAS_NUMPY:
+        print("numpy is not installed, nothing to compare")
+        return
+
+    for station_count in station_counts:
+        station_list = WeatherStationList()
+        station_list.parse(make_catalogue(station_count))
+        number = max(1, 200000 // station_count)
+
+        build_s = best_time(lambda: (setattr(station_list, "_table", None), station_list.table), number)
+        print(f"{station_count} stations, table build {build_s * 1000:.2f} ms")
+
+        table = station_list.table
+        objects = list_queries(station_list.stations)
+        columns = table_queries(table)
+        for name in objects:
+            old = best_time(objects[name], number)
+            new = best_time(columns[name], number)
+            print(
+                f"  {name:10}: objects {old * 1e6:9.1f} us, table {new * 1e6:8.1f} us, "
+                f"speed-up {old / new:6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [500, 50000]
+    run_benchmark(counts)
@@ -0,0 +1,75 @@
+"""Benchmark timestamp parsing: `strptime` vs. `utils.timestamps.parse_utc_timestamp`.
+
+Two workloads at production scale:
+
+- catalogue: one `dataUpdatedTime` per station, mostly distinct strings
+- all-station data: `examples/station_data.json` `measuredTime` values for
+  every station; sensors of one station share a few timestamps
+
+Run from repository root: `python scripts/bench_timestamps.py [station_count]`
+"""
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from dateutil import tz
+
+# ensure project root is on sys.path when running this script directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from utils.timestamps import _parse_cached, parse_utc_timestamp
+
+FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def strptime_parse(timestamp_str):
+    """The previous `Utils.timestamp_to_datetime` implementation."""
+    return datetime.strptime(timestamp_str, FORMAT).replace(tzinfo=tz.tzutc())
+
+
+def catalogue_timestamps(station_count):
+    start = datetime(2025, 6, 17, 3, 0, 0)
+    return [(start + timedelta(seconds=37 * i)).strftime(FORMAT) for i in range(station_count)]
+
+
+def station_data_timestamps(station_count):
+    with open(os.path.join(ROOT, "examples", "station_data.json"), "r") as f:
+        sensors = json.load(f)["sensorValues"]
+    timestamps = []
+    for i in range(station_count):
+        # every station measures at its own times
+        shift = timedelta(seconds=11 * i)
+        for sensor in sensors:
+            measured = datetime.strptime(sensor["measuredTime"], FORMAT) + shift
+            timestamps.append(measured.strftime(FORMAT))
+    return timestamps
+
+
+def time_parser(parse, timestamps, repeat=5):
+    def run():
+        _parse_cached.cache_clear()
+        for ts in timestamps:
+            parse(ts)
+
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+
+def run_benchmark(station_count=500):
+    for label, timestamps in (
+        ("catalogue", catalogue_timestamps(station_count)),
+        ("all-station data", station_data_timestamps(station_count)),
+    ):
+        old = time_parser(strptime_parse, timestamps)
+        new = time_parser(parse_utc_timestamp, timestamps)
+        print(
+            f"{label:16} ({len(timestamps):6} values): strptime {old * 1000:7.2f} ms, "
+            f"fast parser {new * 1000:6.2f} ms, speed-up {old / new:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
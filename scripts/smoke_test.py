@@ -16,6 +16,7 @@ import json
 def run_checks():
     print("Starting programmatic smoke tests")
     ctl = AppController()
+    print("Diagnostics:", ctl.service.diagnostics)
     print("Fetching station list...")
     success = ctl.fetch_and_load_station_list()
     print("fetch_and_load_station_list ->", success)
@@ -1,7 +1,49 @@
+import json
 import sys
 import os
 
+import pytest
+
 # Ensure project root is on sys.path for test discovery when running from tests/ directory
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
+
+EXAMPLES = os.path.join(ROOT, "examples")
+
+
+@pytest.fixture(scope="session")
+def examples_dir():
+    """Directory of the example API responses."""
+    return EXAMPLES
+
+
+@pytest.fixture(scope="session")
+def load_example(examples_dir):
+    """Return a function that decodes an example API response by file name (a fresh copy per call)."""
+
+    def load(file_name):
+        with open(os.path.join(examples_dir, file_name), "r") as f:
+            return json.load(f)
+
+    return load
+
+
+@pytest.fixture(scope="session")
+def station_json(load_example):
+    """Return a function that builds a station catalogue item based on station_metadata.json."""
+
+    def make(station_id, lat=None, lon=None, alt=None, name=None, status=None, updated=None):
+        station = load_example("station_metadata.json")
+        station["id"] = station["properties"]["id"] = station_id
+        coordinates = station["geometry"]["coordinates"]
+        for i, value in enumerate((lon, lat, alt)):
+            if value is not None:
+                coordinates[i] = value
+        properties = station["properties"]
+        properties["name"] = name or f"vt1_Paikka{station_id}"
+        properties["collectionStatus"] = status or properties["collectionStatus"]
+        properties["dataUpdatedTime"] = updated or properties["dataUpdatedTime"]
+        return station
+
+    return make
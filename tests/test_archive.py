@@ -0,0 +1,84 @@
+import copy
+
+from controller import app_controller
+from model.archive import ObservationArchive
+from model.weather_station import WeatherStation
+
+
+def ilma_id(station_json):
+    return [s for s in station_json["sensorValues"] if s["name"] == "ILMA"][0]["id"]
+
+
+def later_poll(station_json):
+    later = copy.deepcopy(station_json)
+    for sensor in later["sensorValues"]:
+        if sensor["name"] == "ILMA":
+            sensor["measuredTime"] = "2025-08-19T07:19:54Z"
+            sensor["value"] = 13.5
+    return later
+
+
+def test_archive_stores_and_deduplicates(tmp_path, load_example):
+    station_json = load_example("station_data.json")
+    station = WeatherStation()
+    station.parse(station_json)
+    ilma = ilma_id(station_json)
+    valid = sum(1 for s in station.sensor_values if s.float_value != -999.0)
+
+    file_name = str(tmp_path / "archive.sqlite")
+    archive = ObservationArchive(file_name, flush_interval_s=0.01)
+    assert archive.add_station(station) == valid
+    assert archive.add_station(station) == 0  # unchanged poll queues nothing
+
+    station.parse(later_poll(station_json))
+    assert archive.add_station(station) == 1
+    archive.flush()
+
+    rows = archive.query(station.id, ilma)
+    assert [value for _, value in rows] == [13.1, 13.5]
+    assert rows[1][0] - rows[0][0] == 600
+    assert archive.query(station.id, ilma, start_s=rows[1][0]) == [rows[1]]
+    assert archive.query(station.id, ilma, end_s=rows[1][0]) == [rows[0]]
+    archive.close()
+    assert archive.rows_written == valid + 1
+    assert archive.last_error == ""
+
+    # a new session writes the same readings again; the database ignores them
+    reopened = ObservationArchive(file_name, flush_interval_s=0.01)
+    assert reopened.add_station(station) == valid
+    reopened.close()
+    assert reopened.query(station.id, ilma) == rows
+
+
+def test_controller_archives_parsed_station_data(tmp_path, load_example):
+    class Service:
+        has_error = False
+        error_message = ""
+
+        def get_road_weather(self, station_id):
+            return load_example("station_data.json")
+
+    archive = ObservationArchive(str(tmp_path / "archive.sqlite"), flush_interval_s=0.01)
+    controller = app_controller.AppController(service=Service(), archive=archive)
+    assert controller.fetch_and_load_station_data("12016") is True
+    archive.close()
+
+    # no station was selected: the readings are archived under the data document's id
+    assert controller.get_current_station().id == 12082
+    rows = archive.query(12082, ilma_id(load_example("station_data.json")))
+    assert [value for _, value in rows] == [13.1]
+    assert archive.query(0, ilma_id(load_example("station_data.json"))) == []
+
+
+def test_unlinked_stations_are_archived_separately(tmp_path, load_example):
+    archive = ObservationArchive(str(tmp_path / "archive.sqlite"), flush_interval_s=0.01)
+    for station_id in (1, 2):
+        station_json = load_example("station_data.json")
+        station_json["id"] = station_id
+        station = WeatherStation()
+        station.parse(station_json)
+        assert station.id == station_id
+        assert archive.add_station(station) > 0
+    archive.close()
+    ilma = ilma_id(load_example("station_data.json"))
+    assert archive.query(1, ilma) == archive.query(2, ilma) != []
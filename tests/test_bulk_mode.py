@@ -0,0 +1,125 @@
+import copy
+
+from controller import app_controller
+from definitions import DataSource
+from model.data_model import DataModel
+from model.physics import fmi_feels_like_temperature
+from view.background_worker import NetworkWorker
+
+
+class BulkService:
+    def __init__(self, station_ids, station_metadata, station_data):
+        self.has_error = False
+        self.error_message = ""
+        self.station_ids = station_ids
+        self.station_metadata = station_metadata
+        self.station_data = station_data
+        self.bulk_calls = 0
+        self.single_calls = 0
+
+    def get_station_list(self):
+        stations = []
+        for station_id in self.station_ids:
+            station = copy.deepcopy(self.station_metadata)
+            station["id"] = station_id
+            station["properties"]["name"] = f"vt1_Paikka{station_id}"
+            stations.append(station)
+        return stations
+
+    def get_all_road_weather(self):
+        self.bulk_calls += 1
+        stations = []
+        for station_id in self.station_ids:
+            data = copy.deepcopy(self.station_data)
+            data["id"] = station_id
+            stations.append(data)
+        return stations
+
+    def get_road_weather(self, station_id):
+        self.single_calls += 1
+        return copy.deepcopy(self.station_data)
+
+
+def make_controller(load_example, station_ids=(1, 2, 3)):
+    service = BulkService(
+        list(station_ids), load_example("station_metadata.json"), load_example("station_data.json")
+    )
+    controller = app_controller.AppController(service=service, bulk_mode=True)
+    assert controller.fetch_and_load_station_list() is True
+    return controller, service
+
+
+def test_bulk_fetch_fills_observation_store(load_example):
+    controller, service = make_controller(load_example)
+    controller.set_current_station(1)
+    assert controller.fetch_and_load_station_data(1) is True
+
+    store = controller.model.observations
+    assert service.bulk_calls == 1 and service.single_calls == 0
+    assert len(store) == 3
+    assert controller.get_current_station() is store.get(1)
+    assert store.get(2).formatted_name == "Paikka2, vt1"
+    assert store.get(2).air_temperature != 0
+
+
+def test_station_switch_needs_no_request(load_example):
+    controller, service = make_controller(load_example)
+    controller.set_current_station(1)
+    controller.fetch_and_load_station_data(1)
+
+    controller.set_current_station(3)
+    assert controller.get_current_station() is controller.model.observations.get(3)
+    assert controller.fetch_and_load_station_data(3) is True
+    assert service.bulk_calls == 1
+
+
+def test_stale_store_is_refetched(monkeypatch, load_example):
+    controller, service = make_controller(load_example)
+    controller.fetch_and_load_station_data(1)
+    store = controller.model.observations
+    monkeypatch.setattr(store, "_fetched_at", store.fetched_at - 3600)
+    assert controller.fetch_and_load_station_data(2) is True
+    assert service.bulk_calls == 2
+
+
+def test_unknown_station_in_bulk_mode(load_example):
+    controller, service = make_controller(load_example)
+    assert controller.fetch_and_load_station_data(99) is False
+    assert controller.last_error == "station 99 missing from bulk data"
+    # a station outside the store gets its own object, stored stations stay intact
+    controller.set_current_station(1)
+    controller.set_current_station(99)
+    assert controller.get_current_station() is not controller.model.observations.get(1)
+    assert controller.model.observations.get(1).id == 1
+
+
+def test_worker_reports_station_missing_from_bulk_data(load_example):
+    controller, _ = make_controller(load_example)
+    worker = NetworkWorker(controller, station_id=99, api_key="key", sources={DataSource.ROAD_WEATHER})
+    results = []
+    worker.finished.connect(lambda city, forecast, err: results.append(err))
+    worker.run()
+    assert results == ["station 99 missing from bulk data"]
+
+
+def test_stations_without_catalogue_entry_keep_their_ids(load_example):
+    model = DataModel()  # the catalogue is not loaded yet
+    stations = []
+    for station_id in (1, 2):
+        data = load_example("station_data.json")
+        data["id"] = station_id
+        stations.append(data)
+    assert model.parse_all_station_data(stations) is True
+    assert [station.id for station in model.observations.stations] == [1, 2]
+    assert sorted(model.observations.feels_like_temperatures()) == [1, 2]
+
+
+def test_feels_like_for_all_stations(load_example):
+    controller, _ = make_controller(load_example)
+    controller.fetch_and_load_station_data(1)
+    feels_like = controller.model.observations.feels_like_temperatures()
+    station = controller.model.observations.get(2)
+    assert sorted(feels_like) == [1, 2, 3]
+    assert feels_like[2] == fmi_feels_like_temperature(
+        station.wind_speed, station.air_humidity, station.air_temperature
+    )
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from definitions import Constants
+from model.cadence import CadenceEstimator
+from model.data_model import DataModel
+from model.weather_station import WeatherStation
+
+START = 1750000000
+
+
+def test_unknown_until_two_observations():
+    estimator = CadenceEstimator()
+    assert estimator.interval_s is None and estimator.next_update_s(START) is None
+    assert estimator.seconds_until_next_update(START) == 0
+    assert estimator.add(START)
+    assert not estimator.add(START)  # unchanged observation time
+    assert not estimator.add(START - 60)
+    assert len(estimator) == 1 and estimator.interval_s is None
+    with pytest.raises(ValueError):
+        CadenceEstimator(history=1)
+
+
+def test_missed_and_late_updates_do_not_change_the_schedule():
+    estimator = CadenceEstimator()
+    times = [START + i * 300 for i in range(8)]
+    del times[3]  # missed update: a 600 s gap
+    times[5] += 90  # published late
+    times += [START + 8 * 300 + 2, START + 9 * 300 - 1]  # jitter
+    for t in times:
+        estimator.add(t)
+    assert estimator.interval_s == pytest.approx(300, abs=1)
+    assert estimator.expected_update_s() == pytest.approx(START + 10 * 300, abs=2)
+    assert estimator.seconds_until_next_update(START + 9 * 300 + 100) == pytest.approx(200, abs=2)
+
+
+def test_late_station_waits_for_the_next_grid_time():
+    estimator = CadenceEstimator()
+    for i in range(4):
+        estimator.add(START + i * 600)
+    # the update due at START + 2400 has not come
+    assert estimator.next_update_s(START + 2500) == pytest.approx(START + 3000)
+    assert estimator.next_update_s(START + 2400) == pytest.approx(START + 2400)
+
+
+def test_wait_is_capped():
+    estimator = CadenceEstimator()
+    estimator.add(START)
+    estimator.add(START + 7200)
+    assert estimator.seconds_until_next_update(START + 7200) == Constants.CADENCE_MAX_WAIT_S
+
+
+def test_cadence_adapts_after_a_change():
+    estimator = CadenceEstimator(history=6)
+    t = START
+    for _ in range(6):
+        t += 600
+        estimator.add(t)
+    for _ in range(6):
+        t += 60
+        estimator.add(t)
+    assert estimator.interval_s == pytest.approx(60)
+
+
+def test_weather_station_learns_from_parsed_observations():
+    station = WeatherStation()
+
+    def parse(timestamp):
+        station.parse({"dataUpdatedTime": timestamp, "sensorValues": []})
+
+    parse("2025-08-19T07:00:00Z")
+    assert station.previous_data_updated_time == station.data_updated_time
+    parse("2025-08-19T07:00:00Z")
+    parse("2025-08-19T07:10:00Z")
+    parse("2025-08-19T07:10:00Z")
+    assert station.cadence.interval_s == 600
+    assert station.data_updated_time.minute == 10 and station.previous_data_updated_time.minute == 0
+
+    restored = WeatherStation()
+    restored.restore_snapshot(station.to_snapshot())
+    assert restored.cadence.interval_s == 600
+
+
+def test_selecting_another_station_starts_a_new_cadence():
+    model = DataModel()
+    model.parse_station_list(
+        [
+            {
+                "id": station_id,
+                "geometry": {"type": "Point", "coordinates": [24.6, 60.2, 0.0]},
+                "properties": {"id": station_id, "name": f"vt1_Espoo_Paikka{station_id}"},
+            }
+            for station_id in (1, 2)
+        ]
+    )
+
+    def parse(timestamp):
+        model.parse_station_data({"dataUpdatedTime": timestamp, "sensorValues": []})
+
+    model.set_currect_station(1)
+    parse("2025-08-19T10:00:00Z")
+    parse("2025-08-19T10:10:00Z")
+    assert model.current_station.cadence.interval_s == 600
+    model.set_currect_station(2)
+    parse("2025-08-19T10:05:00Z")
+    station = model.current_station
+    assert station.data_updated_time == datetime(2025, 8, 19, 10, 5, tzinfo=timezone.utc)
+    assert station.previous_data_updated_time == station.data_updated_time
+    assert len(station.cadence) == 1 and station.cadence.interval_s is None
@@ -0,0 +1,85 @@
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from model.station_info import WeatherStationInfo
+from utils.city_resolver import CityResolver
+from utils.web_utils import RequestRunner
+
+KNOWN_CITIES = {"espoo": 660129}
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode()
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+class FakeOpenWeatherMap:
+    """Knows the cities of KNOWN_CITIES by name and id; every location has weather."""
+
+    def __init__(self):
+        self.queries = []
+
+    def get(self, url, timeout=None, **kwargs):
+        query = {k: v[0] for k, v in parse_qs(urlsplit(url).query).items()}
+        kind = "id" if "id" in query else "q" if "q" in query else "lat"
+        self.queries.append(kind)
+        if kind == "q":
+            city_id = KNOWN_CITIES.get(query["q"].casefold())
+            if city_id is None:
+                return FakeResponse(404, {"cod": "404", "message": "city not found"})
+            return FakeResponse(200, {"id": city_id, "name": query["q"]})
+        if kind == "id":
+            return FakeResponse(200, {"id": int(query["id"]), "name": "by id"})
+        return FakeResponse(200, {"id": 1, "name": "by location"})
+
+
+def make_runner(resolver):
+    runner = RequestRunner(city_resolver=resolver)
+    upstream = FakeOpenWeatherMap()
+    runner._session_for = lambda url: upstream
+    return runner, upstream
+
+
+def test_resolved_and_failed_names_skip_the_name_query(tmp_path):
+    file_name = str(tmp_path / "cities.json")
+    coordinates = WeatherStationInfo.Coordinates(60.2, 24.7)
+    runner, upstream = make_runner(CityResolver(file_name))
+
+    assert runner.get_city_weather("Espoo", coordinates, "key")["id"] == 660129
+    assert runner.get_city_weather("Nupuri", coordinates, "key")["name"] == "by location"
+    assert upstream.queries == ["q", "q", "lat"]
+
+    # a restarted application goes straight to the query that worked
+    runner, upstream = make_runner(CityResolver(file_name))
+    assert runner.get_city_weather(" espoo", coordinates, "key")["name"] == "by id"
+    assert runner.get_city_weather("Nupuri", coordinates, "key")["name"] == "by location"
+    assert runner.get_city_weather("", coordinates, "key")["name"] == "by location"
+    assert upstream.queries == ["id", "lat", "lat"]
+    assert not runner.has_error
+
+
+def test_failed_names_are_retried_after_the_ttl(tmp_path):
+    now = [1000.0]
+    resolver = CityResolver(str(tmp_path / "cities.json"), negative_ttl_s=60, clock=lambda: now[0])
+    resolver.failed("Nupuri")
+    assert resolver.is_unresolvable("nupuri")
+    now[0] += 60
+    assert not resolver.is_unresolvable("Nupuri")
+    assert resolver.stats == {"id_hits": 0, "negative_hits": 1, "ids": 0, "failed": 0}
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    file_name = tmp_path / "cities.json"
+    file_name.write_text("{not json")
+    resolver = CityResolver(str(file_name))
+    assert resolver.city_id("Espoo") is None
+    resolver.resolved("Espoo", 660129)
+    assert CityResolver(str(file_name)).city_id("ESPOO") == 660129
@@ -0,0 +1,81 @@
+import json
+import pickle
+import zlib
+
+from model.data_model import DataModel
+
+
+def make_model(load_example):
+    station = load_example("station_metadata.json")
+    station["id"] = 12082
+    model = DataModel()
+    model.parse_station_list([station])
+    model.set_currect_station(12082)
+    model.parse_station_data(load_example("station_data.json"))
+    model.city_weather = load_example("city_data.json")
+    model.forecast = load_example("forecast.json")
+    return model
+
+
+def test_snapshot_round_trip(tmp_path, load_example):
+    file_name = str(tmp_path / "snapshot.bin")
+    model = make_model(load_example)
+    assert model.save_snapshot(file_name) is True
+
+    restored = DataModel()
+    assert restored.load_snapshot(file_name) is True
+    assert restored.is_stale is True
+    assert [s.id for s in restored.stations] == [12082]
+    assert restored.stations[0].formatted_name == model.stations[0].formatted_name
+    station = restored.current_station
+    assert station.id == 12082
+    assert station.air_temperature == model.current_station.air_temperature
+    assert station.wind_speed_str == model.current_station.wind_speed_str
+    assert station.data_updated_time == model.current_station.data_updated_time
+    assert restored.city_weather == model.city_weather
+    assert restored.forecast == model.forecast
+
+    restored.parse_station_data(load_example("station_data.json"))
+    assert restored.is_stale is False
+
+
+def test_load_snapshot_missing_or_corrupt(tmp_path):
+    model = DataModel()
+    assert model.load_snapshot(str(tmp_path / "no_such_file.bin")) is False
+    corrupt = tmp_path / "corrupt.bin"
+    corrupt.write_bytes(b"not a snapshot")
+    assert model.load_snapshot(str(corrupt)) is False
+    assert model.is_stale is False
+
+
+def test_snapshot_is_compressed_json(tmp_path, load_example):
+    file_name = tmp_path / "snapshot.bin"
+    assert make_model(load_example).save_snapshot(str(file_name)) is True
+    snapshot = json.loads(zlib.decompress(file_name.read_bytes()))
+    assert snapshot["version"] == DataModel.SNAPSHOT_VERSION
+    assert snapshot["current_station_id"] == 12082
+
+    # a pickle is not a snapshot: it is never unpickled
+    file_name.write_bytes(zlib.compress(pickle.dumps(snapshot)))
+    assert DataModel().load_snapshot(str(file_name)) is False
+
+
+def test_malformed_snapshot_leaves_model_untouched(tmp_path, load_example):
+    file_name = tmp_path / "snapshot.bin"
+    model = make_model(load_example)
+    assert model.save_snapshot(str(file_name)) is True
+    snapshot = json.loads(zlib.decompress(file_name.read_bytes()))
+    good_stations = snapshot["stations"]
+
+    snapshot["stations"] = good_stations + [[1, "vt1_Paikka1"]]  # a short station row
+    file_name.write_bytes(zlib.compress(json.dumps(snapshot).encode()))
+    assert model.load_snapshot(str(file_name)) is False
+
+    snapshot["stations"] = good_stations
+    snapshot["current_station"][1][0] = ["not a sensor"]
+    file_name.write_bytes(zlib.compress(json.dumps(snapshot).encode()))
+    assert model.load_snapshot(str(file_name)) is False
+
+    assert [s.id for s in model.stations] == [12082]
+    assert model.current_station.id == 12082 and model.current_station.air_temperature != 0
+    assert model.city_weather and model.is_stale is False
@@ -0,0 +1,88 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from definitions import Constants
+from model import derived_metrics
+from model.derived_metrics import DerivedMetricsEngine, Metric
+from model.weather_station import WeatherStation
+
+
+@pytest.fixture
+def make_station(load_example):
+    def make(station_id, readings, measured_time="2025-06-17T03:05:33Z"):
+        station_json = load_example("station_data.json")
+        station_json["id"] = station_id
+        station_json["dataUpdatedTime"] = measured_time
+        for sensor in station_json["sensorValues"]:
+            if sensor["name"] in readings:
+                sensor["value"] = readings[sensor["name"]]
+        station = WeatherStation()
+        station.parse(station_json)
+        return station
+
+    return make
+
+
+def test_metric_values(make_station):
+    mild = make_station(1, {})
+    icy = make_station(2, {"ILMA": -2.0, "ILMAN_KOSTEUS": 95.0, "TIE_1": -6.0})
+    windy = make_station(3, {"ILMA": -20.0, "KESKITUULI": 10.0})
+    results = DerivedMetricsEngine().compute({1: mild, 2: icy, 3: windy}.items())
+
+    # dew point close to the station's own dew point sensor (KASTEPISTE 7.4 °C)
+    assert results[1]["dew_point"] == pytest.approx(7.4, abs=0.2)
+    assert results[1]["frost_point"] == results[1]["dew_point"]
+    assert results[1]["frost_point_margin"] == pytest.approx(19.9 - results[1]["frost_point"])
+    assert results[1]["slipperiness_risk"] == derived_metrics.RISK_NONE
+    assert results[1]["wind_chill_category"] == derived_metrics.WIND_CHILL_NONE
+
+    # below zero the frost point is warmer than the dew point
+    assert results[2]["frost_point"] > results[2]["dew_point"]
+    assert results[2]["frost_point_margin"] < 0
+    assert results[2]["slipperiness_risk"] == derived_metrics.RISK_HIGH
+    assert results[3]["wind_chill_category"] == derived_metrics.WIND_CHILL_VERY_COLD  # about -34 °C
+
+
+def test_invalid_inputs_propagate_to_dependent_metrics(make_station):
+    station = make_station(1, {"ILMAN_KOSTEUS": None})
+    values = DerivedMetricsEngine().compute([(1, station)])[1]
+    for name in ("dew_point", "frost_point", "frost_point_margin", "slipperiness_risk"):
+        assert values[name] == Constants.INVALID_VALUE
+    assert values["wind_chill_category"] != Constants.INVALID_VALUE
+
+
+def test_results_are_cached_per_observation_time(make_station):
+    engine = DerivedMetricsEngine()
+    stations = {1: make_station(1, {}), 2: make_station(2, {})}
+    first = engine.compute(stations.items())
+    assert engine.computed == 2 and engine.reused == 0
+
+    # station 2 has a new observation, station 1 is unchanged
+    stations[2] = make_station(2, {"ILMA": 0.5}, measured_time="2025-06-17T03:15:33Z")
+    second = engine.compute(stations.items())
+    assert engine.computed == 3 and engine.reused == 1
+    assert second[1] is first[1]
+    assert second[2]["dew_point"] != first[2]["dew_point"]
+
+    # dropped stations leave the cache
+    engine.compute([(1, stations[1])])
+    assert engine.reused == 2 and len(engine._cache) == 1
+
+
+def test_custom_metrics(make_station):
+    metrics = {
+        "double_air": Metric("double_air", ("ILMA",), lambda t: 2 * t),
+        "quad_air": Metric("quad_air", ("double_air",), lambda d: 2 * d),
+    }
+    engine = DerivedMetricsEngine(metrics)
+    assert engine.metric_names == ["double_air", "quad_air"]
+    assert engine.compute([(1, make_station(1, {}))])[1] == {"double_air": 26.2, "quad_air": 52.4}
+
+
+def test_results_are_keyed_by_the_given_station_ids(make_station):
+    engine = DerivedMetricsEngine()
+    mild, icy = make_station(0, {}), make_station(0, {"ILMA": -2.0})  # same WeatherStation.id
+    results = engine.compute({1: mild, 2: icy}.items())
+    assert sorted(results) == [1, 2] and len(engine._cache) == 2
+    assert results[1]["dew_point"] != results[2]["dew_point"]
@@ -0,0 +1,122 @@
+import copy
+from datetime import datetime, timezone
+
+import pytest
+
+from model.data_model import DataModel
+from model.history import RingBuffer, StationHistory
+from model.weather_station import WeatherStation
+
+
+def pairs(result):
+    times, values = result
+    return list(zip(times, values))
+
+
+def test_ring_buffer_wraps_and_keeps_newest():
+    buffer = RingBuffer(capacity=4)
+    for t in range(1, 7):
+        assert buffer.append(float(t), t * 10.0)
+    assert len(buffer) == 4
+    assert pairs(buffer.items()) == [(3.0, 30.0), (4.0, 40.0), (5.0, 50.0), (6.0, 60.0)]
+    assert buffer.latest == (6.0, 60.0)
+    assert pairs(buffer.since(4.5)) == [(5.0, 50.0), (6.0, 60.0)]
+    assert buffer.since(0.0) == buffer.items()
+    assert pairs(buffer.since(7.0)) == []
+
+    # duplicate and out-of-order readings are ignored
+    assert buffer.append(6.0, 1.0) is False
+    assert buffer.append(2.0, 1.0) is False
+    assert buffer.latest == (6.0, 60.0)
+
+    with pytest.raises(ValueError):
+        RingBuffer(capacity=0)
+
+
+@pytest.mark.parametrize("appended", range(0, 12))
+def test_since_matches_linear_filter(appended):
+    buffer = RingBuffer(capacity=5)
+    appended_pairs = [(float(t * 60), float(t)) for t in range(appended)]
+    for t, v in appended_pairs:
+        buffer.append(t, v)
+    kept = appended_pairs[-5:]
+    for cutoff in range(-60, appended * 60 + 60, 30):
+        assert pairs(buffer.since(cutoff)) == [p for p in kept if p[0] >= cutoff]
+
+
+def test_station_history_from_parses(load_example):
+    station_json = load_example("station_data.json")
+
+    station = WeatherStation()
+    station.parse(station_json)
+    station.parse(station_json)  # unchanged poll: nothing new is stored
+
+    later = copy.deepcopy(station_json)
+    for sensor in later["sensorValues"]:
+        if sensor["name"] == "ILMA":
+            sensor["measuredTime"] = "2025-08-19T07:19:54Z"
+            sensor["value"] = 13.5
+    station.parse(later)
+
+    ilma = [s for s in station_json["sensorValues"] if s["name"] == "ILMA"][0]
+    latest = station.history.sensor(ilma["id"]).latest[0]
+    times, values = station.get_history("ILMA", hours=24, now=latest)
+    assert values.tolist() == [13.1, 13.5]
+    assert times[1] - times[0] == 600
+    assert pairs(station.get_history("ILMA", hours=0.01, now=latest)) == [(latest, 13.5)]
+    assert pairs(station.get_history("NO_SUCH_SENSOR", hours=24)) == []
+    assert len(station.history.sensor(1)) == 2
+
+
+def test_invalid_readings_are_not_recorded():
+    class FakeSensor:
+        def __init__(self, sensor_id, value):
+            self.id = sensor_id
+            self.float_value = value
+            self.measured_time = None
+
+    history = StationHistory()
+    assert history.record([FakeSensor(1, -999.0)]) == 0
+    assert history.sensor(1) is None
+
+
+def observation(station_json, observed, air_temperature):
+    data = copy.deepcopy(station_json)
+    data["dataUpdatedTime"] = observed
+    for sensor in data["sensorValues"]:
+        sensor["measuredTime"] = observed
+        if sensor["name"] == "ILMA":
+            sensor["value"] = air_temperature
+    return data
+
+
+def test_history_belongs_to_the_selected_station(load_example):
+    metadata = load_example("station_metadata.json")
+    station_json = load_example("station_data.json")
+    stations = []
+    for station_id in (1, 2):
+        station = copy.deepcopy(metadata)
+        station["id"] = station["properties"]["id"] = station_id
+        stations.append(station)
+    model = DataModel()
+    model.parse_station_list(stations)
+
+    model.set_currect_station(1)
+    model.parse_station_data(observation(station_json, "2025-08-19T10:00:00Z", 1.0))
+    model.parse_station_data(observation(station_json, "2025-08-19T10:10:00Z", 2.0))
+    model.set_currect_station(2)
+    model.parse_station_data(observation(station_json, "2025-08-19T10:05:00Z", -5.0))
+
+    now = datetime(2025, 8, 19, 10, 10, tzinfo=timezone.utc).timestamp()
+    times, values = model.current_station.get_history("ILMA", hours=1, now=now)
+    assert model.current_station.id == 2
+    assert values.tolist() == [-5.0]
+
+    # switching back finds station 1's history and cadence where they were
+    model.set_currect_station(1)
+    times, values = model.current_station.get_history("ILMA", hours=1, now=now)
+    assert model.current_station.id == 1
+    assert values.tolist() == [1.0, 2.0]
+    assert model.current_station.cadence.interval_s == 600
+    model.set_currect_station(2)
+    assert model.current_station.get_history("ILMA", hours=1, now=now)[1].tolist() == [-5.0]
@@ -0,0 +1,103 @@
+import json
+import os
+from unittest.mock import Mock, patch
+
+from utils.http_cache import HttpCache
+from utils.web_utils import RequestRunner
+
+
+def make_response(status, data=None, headers=None):
+    m = Mock()
+    m.status_code = status
+    m.headers = headers or {}
+    m.content = json.dumps(data).encode() if data is not None else b""
+    m.json.side_effect = lambda: json.loads(m.content)
+    m.raise_for_status.return_value = None
+    return m
+
+
+def test_conditional_get_skips_decoding_on_304(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=1024 * 1024)
+    first = make_response(200, {"features": [1, 2]}, {"ETag": '"v1"'})
+    second = make_response(304, headers={"ETag": '"v1"'})
+    sent_headers = []
+    responses = iter([first, second])
+
+    def fake_get(session, url, timeout=None, headers=None):
+        sent_headers.append(headers)
+        return next(responses)
+
+    with patch("requests.Session.get", fake_get):
+        r = RequestRunner(cache=cache)
+        assert r.get_weather_stations() == [1, 2]
+        assert r.get_weather_stations() == [1, 2]
+
+    assert sent_headers[1] == {"If-None-Match": '"v1"'}
+    second.json.assert_not_called()
+    assert cache.stats["misses"] == 1
+    assert cache.stats["revalidations"] == 1
+
+
+def test_fresh_entry_is_served_without_request(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    calls = []
+
+    def fake_get(session, url, timeout=None, headers=None):
+        calls.append(url)
+        return make_response(200, {"id": 1}, {"Cache-Control": "max-age=60"})
+
+    with patch("requests.Session.get", fake_get):
+        r = RequestRunner(cache=cache)
+        r.get_road_weather(1)
+        assert r.get_road_weather(1) == {"id": 1}
+
+    assert len(calls) == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_cache_is_persisted_and_lru_bounded(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=40)
+    headers = {"Last-Modified": "Tue, 19 Aug 2025 07:11:16 GMT"}
+    cache.store("a", b'{"a": "0123456789"}', headers, {"a": "0123456789"})
+    cache.store("b", b'{"b": "0123456789"}', headers, {"b": "0123456789"})
+    cache.store("c", b'{"c": "0123456789"}', headers, {"c": "0123456789"})
+
+    assert cache.stats["evictions"] == 1
+    assert cache.conditional_headers("a") == {}
+
+    cache.close()
+    reloaded = HttpCache(str(tmp_path), max_bytes=40)
+    assert reloaded.stats["entries"] == 2
+    assert reloaded.conditional_headers("c") == {"If-Modified-Since": headers["Last-Modified"]}
+    assert reloaded.revalidated("c", {}) == {"c": "0123456789"}
+
+
+def test_weather_service_exposes_cache_stats(tmp_path):
+    from controller.weather_service import WeatherService
+
+    assert WeatherService().cache_stats == {}
+    svc = WeatherService(cache=HttpCache(str(tmp_path)))
+    assert svc.cache_stats["hits"] == 0
+
+
+def test_index_is_keyed_by_url_hash_and_written_on_a_timer(tmp_path):
+    url = "https://api.openweathermap.org/data/2.5/weather?q=Espoo&appid=secret"
+    index_path = tmp_path / HttpCache.INDEX_FILE_NAME
+    cache = HttpCache(str(tmp_path), save_interval_s=3600)
+    cache.store(url, b'{"id": 1}', {"ETag": '"v1"'}, {"id": 1})
+    assert cache.revalidated(url, {"ETag": '"v2"'}) == {"id": 1}
+    assert not index_path.exists()  # not written on every response
+
+    cache.close()
+    index = index_path.read_text()
+    assert "secret" not in index and "openweathermap" not in index
+    reloaded = HttpCache(str(tmp_path))
+    assert reloaded.conditional_headers(url) == {"If-None-Match": '"v2"'}
+
+    # an index written by an older version, keyed by URL, is rewritten at once
+    entries = json.loads(index)
+    index_path.write_text(json.dumps({url: entry for entry in entries.values()}))
+    migrated = HttpCache(str(tmp_path))
+    assert migrated.get_fresh(url) is None and migrated.conditional_headers(url) != {}
+    assert "secret" not in index_path.read_text()
+    assert len(os.listdir(tmp_path)) == 2  # the index and one body file
@@ -0,0 +1,36 @@
+import json
+import os
+
+import pytest
+
+from controller.weather_service import WeatherService
+from utils import json_backend
+
+@pytest.fixture
+def restore_backend():
+    backend = json_backend.get_backend()
+    yield
+    json_backend.set_backend(backend)
+
+
+@pytest.mark.parametrize("name", json_backend.available_backends())
+def test_backends_decode_examples_identically(name, restore_backend, examples_dir):
+    json_backend.set_backend(name)
+    for file_name in sorted(os.listdir(examples_dir)):
+        if not file_name.endswith(".json"):
+            continue
+        with open(os.path.join(examples_dir, file_name), "rb") as f:
+            body = f.read()
+        assert json_backend.loads(body) == json.loads(body), file_name
+
+    with pytest.raises(ValueError):
+        json_backend.loads(b"notjson")
+
+
+def test_backend_selection(restore_backend):
+    assert json_backend.get_backend() == json_backend.available_backends()[0]
+    assert "json" in json_backend.available_backends()
+    with pytest.raises(ValueError):
+        json_backend.set_backend("nope")
+    json_backend.set_backend("json")
+    assert WeatherService().diagnostics["json_backend"] == "json"
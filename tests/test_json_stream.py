@@ -0,0 +1,79 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from controller.app_controller import AppController
+from controller.weather_service import WeatherService
+from utils.json_stream import iter_array_items
+
+
+def split(raw: bytes, size: int) -> list:
+    return [raw[i : i + size] for i in range(0, len(raw), size)]
+
+
+def make_catalogue(station_json, count):
+    features = [station_json(i + 1, name=f"vt1_Äänekoski_{i}") for i in range(count)]
+    return {"type": "FeatureCollection", "dataUpdatedTime": "2025-06-17T03:05:33Z", "features": features}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 100000])
+def test_items_across_chunk_boundaries(chunk_size):
+    features = [{"id": i, "name": "äö€" * i, "v": [1.25, True, None, 10**i]} for i in range(40)]
+    doc = {"type": "x", "features": features, "n": 7}
+    raw = json.dumps(doc, ensure_ascii=False).encode("utf-8")
+    assert list(iter_array_items(split(raw, chunk_size), "features")) == doc["features"]
+    assert list(iter_array_items(split(raw, chunk_size), "missing")) == []
+    assert list(iter_array_items([b'{"features": []}'], "features")) == []
+
+
+@pytest.mark.parametrize(
+    "raw", [b'{"features": [1, 2', b'{"features": [1,, 2]}', b"[1]", b'{"features": [{"id": 1}']
+)
+def test_invalid_or_truncated_json_raises(raw):
+    with pytest.raises(ValueError):
+        list(iter_array_items(split(raw, 3), "features"))
+
+
+class FakeStreamResponse:
+    def __init__(self, raw, fail_after=None):
+        self.status_code = 200
+        self.raw = raw
+        self.fail_after = fail_after
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for i, chunk in enumerate(split(self.raw, 4096)):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ConnectionError("connection reset")
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+def test_controller_streams_catalogue_into_model(station_json):
+    raw = json.dumps(make_catalogue(station_json, 50)).encode("utf-8")
+    response = FakeStreamResponse(raw)
+    with patch("requests.Session.get", lambda session, url, timeout=None, stream=False: response):
+        controller = AppController(service=WeatherService())
+        assert controller.stream_and_load_station_list() is True
+    assert len(controller.get_stations()) == 50
+    assert controller.model.station_list.find_station_by_id(3).formatted_name == "Äänekoski, 2 vt1"
+    assert response.closed
+
+
+def test_interrupted_stream_keeps_previous_list(station_json):
+    controller = AppController(service=WeatherService())
+    controller.load_station_list(make_catalogue(station_json, 2)["features"])
+
+    raw = json.dumps(make_catalogue(station_json, 50)).encode("utf-8")
+    response = FakeStreamResponse(raw, fail_after=2)
+    with patch("requests.Session.get", lambda session, url, timeout=None, stream=False: response):
+        assert controller.stream_and_load_station_list() is False
+    assert "connection reset" in controller.last_error
+    assert len(controller.get_stations()) == 2
@@ -0,0 +1,35 @@
+import pytest
+
+from model.station_info import WeatherStationInfo
+from model.weather_station import Sensor
+
+
+def make_sensor_json(station_id):
+    return {
+        "id": 1,
+        "stationId": station_id,
+        "name": "".join(["IL", "MA"]),  # distinct string objects per payload
+        "shortName": "Ilma ",
+        "measuredTime": "2025-08-19T07:09:54Z",
+        "value": 13.1,
+        "unit": "°C",
+    }
+
+
+def test_model_objects_have_no_instance_dict():
+    for obj in (
+        Sensor(),
+        WeatherStationInfo(),
+        WeatherStationInfo.Coordinates(),
+        WeatherStationInfo.Properties(),
+    ):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.unexpected = 1
+
+
+def test_sensor_names_are_shared_between_stations():
+    a, b = Sensor(), Sensor()
+    assert a.parse(make_sensor_json(1)) and b.parse(make_sensor_json(2))
+    assert a.name is b.name
+    assert a.unit is b.unit
@@ -5,6 +5,7 @@ class ErrService:
     def __init__(self):
         self.has_error = True
         self.error_message = "service fail"
+        self.fetched_at = 0.0
 
     def get_city_weather(self, *args, **kwargs):
         return {}
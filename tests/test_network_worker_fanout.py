@@ -0,0 +1,77 @@
+import threading
+import time
+
+from PyQt6.QtCore import QCoreApplication
+
+from utils.web_utils import RequestRunner
+from view.background_worker import NetworkWorker
+
+DELAY_S = 0.2
+
+
+class SlowController:
+    def __init__(self):
+        class S:
+            def __init__(self):
+                self.has_error = False
+                self.error_message = ""
+                self.fetched_at = 0.0
+
+            def get_city_weather(self, city, coordinates, api_key):
+                time.sleep(DELAY_S)
+                return {"weather": "ok"}
+
+            def get_forecast(self, coordinates, api_key):
+                time.sleep(DELAY_S)
+                return {"list": []}
+
+        self.service = S()
+
+        class C:
+            formatted_name = "City, Station"
+            class Coord:
+                latitude = 60.0
+                longitude = 24.0
+            coordinates = Coord()
+
+        self.model = type("M", (), {"current_station": C(), "stations": []})()
+
+    def fetch_and_load_station_data(self, station_id):
+        time.sleep(DELAY_S)
+        return True
+
+
+def test_network_worker_requests_run_concurrently():
+    # partial results are emitted from pool threads and delivered through the event loop
+    app = QCoreApplication.instance() or QCoreApplication([])
+    worker = NetworkWorker(SlowController(), station_id="1", api_key="key")
+    partial = []
+    results = []
+    worker.station_data_ready.connect(lambda err: partial.append(("station", err)))
+    worker.city_weather_ready.connect(lambda city, err: partial.append(("city", err)))
+    worker.forecast_ready.connect(lambda forecast, err: partial.append(("forecast", err)))
+    worker.finished.connect(lambda city, forecast, err: results.append((city, forecast, err)))
+
+    start = time.perf_counter()
+    worker.run()
+    elapsed = time.perf_counter() - start
+    app.processEvents()
+
+    # roughly the slowest single call, not the sum of all three
+    assert elapsed < 2 * DELAY_S
+    assert sorted(name for name, _ in partial) == ["city", "forecast", "station"]
+    assert results == [({"weather": "ok"}, {"list": []}, "")]
+
+
+def test_requestrunner_error_state_is_per_thread():
+    r = RequestRunner()
+    r.status_code = 0
+    r.error_message = "network down"
+
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(r.has_error))
+    t.start()
+    t.join()
+
+    assert seen == [False]
+    assert r.has_error
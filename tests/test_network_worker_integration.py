@@ -7,6 +7,7 @@ class DummyController:
             def __init__(self):
                 self.has_error = False
                 self.error_message = ""
+                self.fetched_at = 0.0
 
             def get_city_weather(self, city, coordinates, api_key):
                 return {"weather": "ok"}
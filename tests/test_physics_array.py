@@ -0,0 +1,46 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from definitions import Constants
+from model.physics import fmi_feels_like_temperature, fmi_feels_like_temperature_array
+
+
+def readings(min_value, max_value):
+    """Sensor readings: any float in range, 0.1 resolution values or the invalid marker."""
+    return st.one_of(
+        st.floats(min_value=min_value, max_value=max_value),
+        st.integers(int(min_value * 10), int(max_value * 10)).map(lambda v: v / 10),
+        st.just(Constants.INVALID_VALUE),
+    )
+
+
+stations = st.lists(
+    st.tuples(readings(-3.0, 60.0), readings(0.0, 100.0), readings(-60.0, 50.0)),
+    min_size=1,
+    max_size=50,
+)
+
+
+@settings(max_examples=300, deadline=None)
+@given(stations)
+def test_array_matches_scalar(rows):
+    wind, rh, temp = (list(column) for column in zip(*rows))
+    expected = [fmi_feels_like_temperature(w, h, t) for w, h, t in rows]
+    result = fmi_feels_like_temperature_array(wind, rh, temp)
+    assert result.shape == (len(rows),)
+    for got, want in zip(result.tolist(), expected):
+        # bit-identical, not approximately equal
+        assert got == want or (math.isnan(got) and math.isnan(want))
+
+
+def test_masking_and_broadcasting():
+    inv = Constants.INVALID_VALUE
+    result = fmi_feels_like_temperature_array([inv, 3.0, -2.0, 3.0], 50.0, [10.0, inv, 10.0, 10.0])
+    assert result[:3].tolist() == [inv, inv, inv]
+    assert result[3] == fmi_feels_like_temperature(3.0, 50.0, 10.0)
@@ -0,0 +1,154 @@
+import copy
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from controller.polling_daemon import PollingDaemon, PollScheduler
+from definitions import Constants
+from model.station_info import WeatherStationList
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PUBLISHED = datetime(2025, 8, 19, 7, 0, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.fixture
+def make_station_list(station_json):
+    def make(station_ids):
+        station_list = WeatherStationList()
+        assert station_list.parse([station_json(station_id) for station_id in station_ids])
+        return station_list
+
+    return make
+
+
+@pytest.fixture
+def station_data(load_example):
+    return load_example("station_data.json")
+
+
+class FakeService:
+    """Serves station data published every 10 minutes from PUBLISHED; tracks concurrency."""
+
+    def __init__(self, station_data, failing=()):
+        self.station_data = station_data
+        self.has_error = False
+        self.error_message = ""
+        self.published = {}  # station id -> observation time served
+        self.failing = set(failing)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_road_weather(self, station_id):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.requests.append(station_id)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        if station_id in self.failing:
+            raise ConnectionError("upstream down")
+        data = copy.deepcopy(self.station_data)
+        data["id"] = station_id
+        published = self.published.get(station_id, PUBLISHED)
+        data["dataUpdatedTime"] = datetime.fromtimestamp(published, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return data
+
+
+def test_scheduler_orders_by_due_time_and_reschedules():
+    scheduler = PollScheduler()
+    scheduler.schedule("a", 30)
+    scheduler.schedule("b", 10)
+    scheduler.schedule("c", 20)
+    scheduler.schedule("b", 40)  # rescheduled: the old entry is stale
+    assert len(scheduler) == 3 and scheduler.next_due() == 20
+    assert scheduler.pop_due(35, limit=1) == ["c"]
+    assert scheduler.pop_due(35, limit=5) == ["a"]
+    scheduler.remove("b")
+    assert scheduler.next_due() is None and scheduler.pop_due(100, 5) == []
+
+
+def test_daemon_polls_after_publish_with_bounded_pool(make_station_list, station_data):
+    now = [PUBLISHED + 5]
+    service = FakeService(station_data)
+    station_ids = list(range(1, 9))
+    updates = []
+    daemon = PollingDaemon(
+        make_station_list(station_ids),
+        service=service,
+        workers=3,
+        jitter_s=0.0,
+        on_update=updates.append,
+        clock=lambda: now[0],
+    )
+    try:
+        while daemon.polls < len(station_ids) or daemon.in_flight:
+            daemon.step(timeout_s=1.0)
+        assert service.max_in_flight <= 3
+        assert sorted(station.id for station in updates) == station_ids
+        assert sorted(daemon.stations) == station_ids
+
+        # the update interval is unknown after one observation: the default is assumed
+        first_due = PUBLISHED + Constants.DEFAULT_POLLING_INTERVAL_S + Constants.DAEMON_PUBLISH_DELAY_S
+        assert daemon.scheduler.next_due() == first_due
+
+        # nothing is polled before the due time
+        daemon.step(timeout_s=0.0)
+        assert daemon.polls == len(station_ids)
+
+        # station 1 publishes again 10 minutes later; the others are late
+        service.published[1] = PUBLISHED + 600
+        now[0] = first_due
+        while daemon.polls < 2 * len(station_ids) or daemon.in_flight:
+            daemon.step(timeout_s=1.0)
+        assert daemon.updates == len(station_ids) + 1
+        station = daemon.stations[1]
+        assert station.data_updated_time.timestamp() == PUBLISHED + 600
+        due = {station_id: daemon.scheduler.due_time(station_id) for station_id in station_ids}
+        # station 1 is next polled right after its next expected publish time
+        assert due[1] == PUBLISHED + 1200 + Constants.DAEMON_PUBLISH_DELAY_S
+        # late stations are retried after the first retry delay
+        assert due[2] == first_due + Constants.DAEMON_RETRY_S
+    finally:
+        daemon.close()
+
+
+def test_failing_station_backs_off(make_station_list, station_data):
+    now = [PUBLISHED]
+    service = FakeService(station_data, failing={2})
+    daemon = PollingDaemon(
+        make_station_list([1, 2]), service=service, workers=2, jitter_s=0.0, clock=lambda: now[0]
+    )
+    try:
+        while daemon.polls < 2 or daemon.in_flight:
+            daemon.step(timeout_s=1.0)
+        assert daemon.errors == 1 and "upstream down" in daemon.last_error
+        assert daemon.scheduler.due_time(2) == PUBLISHED + Constants.DAEMON_RETRY_S
+
+        now[0] += Constants.DAEMON_RETRY_S
+        while daemon.polls < 3 or daemon.in_flight:
+            daemon.step(timeout_s=1.0)
+        assert daemon.scheduler.due_time(2) == now[0] + 2 * Constants.DAEMON_RETRY_S
+    finally:
+        daemon.close()
+
+
+def test_run_stops_after_duration(make_station_list, station_data):
+    daemon = PollingDaemon(make_station_list([1]), service=FakeService(station_data), jitter_s=0.0)
+    started = time.monotonic()
+    daemon.run(duration_s=0.2)
+    daemon.close()
+    assert daemon.polls == 1 and time.monotonic() - started < 2
+
+
+def test_daemon_entry_point_does_not_import_qt():
+    code = "import sys, pyweatherview_daemon; print(any(m.startswith('PyQt') for m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert result.stdout.strip() == "False", result.stderr
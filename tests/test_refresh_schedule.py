@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+
+from controller.app_controller import AppController
+from definitions import Constants, DataSource
+from view.background_worker import NetworkWorker
+
+# 07:00 UTC: a forecast slot starts at 06:00, the next at 09:00
+NOW = datetime(2025, 8, 19, 7, 0, tzinfo=timezone.utc).timestamp()
+
+
+class DummyService:
+    def __init__(self):
+        self.has_error = False
+        self.error_message = ""
+        self.fetched_at = 0.0
+        self.calls = []
+
+    def get_road_weather(self, station_id):
+        self.calls.append("road")
+        published = datetime.fromtimestamp(NOW - 60 * (3 - len(self.calls)), timezone.utc)
+        return {"dataUpdatedTime": published.strftime("%Y-%m-%dT%H:%M:%SZ"), "sensorValues": []}
+
+    def get_city_weather(self, city, coordinates, api_key):
+        self.calls.append("city")
+        return {"weather": "ok"}
+
+    def get_forecast(self, coordinates, api_key):
+        self.calls.append("forecast")
+        return {"list": []}
+
+
+def test_sources_have_separate_cadences():
+    controller = AppController(service=DummyService())
+    assert controller.due_sources(NOW) == set(DataSource)
+
+    controller.store_city_weather({"weather": "ok"}, NOW)
+    controller.store_forecast({"list": []}, NOW)
+    assert controller.refresh_time(DataSource.CITY_WEATHER) == NOW + Constants.CITY_WEATHER_REFRESH_S
+    next_slot = datetime(2025, 8, 19, 9, 0, tzinfo=timezone.utc).timestamp()
+    assert controller.refresh_time(DataSource.FORECAST) == next_slot + Constants.FORECAST_SLOT_DELAY_S
+    assert controller.due_sources(NOW + 60) == {DataSource.ROAD_WEATHER}
+    assert controller.due_sources(NOW + 600) == {DataSource.ROAD_WEATHER, DataSource.CITY_WEATHER}
+    assert DataSource.FORECAST in controller.due_sources(next_slot + Constants.FORECAST_SLOT_DELAY_S)
+
+    # road weather is due at the station's next expected update
+    controller.fetch_and_load_station_data("1")
+    controller.fetch_and_load_station_data("1")
+    assert controller.refresh_time(DataSource.ROAD_WEATHER) == NOW
+    assert DataSource.ROAD_WEATHER not in controller.due_sources(NOW - 1)
+
+    # another station has no observations or OpenWeatherMap data yet: all are due at once
+    controller.set_current_station("2")
+    assert controller.refresh_time(DataSource.ROAD_WEATHER) == 0.0
+    assert controller.due_sources(NOW - 1) == set(DataSource)
+
+
+def test_worker_fetches_only_due_sources():
+    controller = AppController(service=DummyService())
+    controller.service.fetched_at = NOW - 300  # shared with another station 5 minutes ago
+    worker = NetworkWorker(controller, station_id="1", api_key="key", sources={DataSource.CITY_WEATHER})
+    results = []
+    worker.finished.connect(lambda city, forecast, err: results.append((city, forecast, err)))
+    worker.run()
+    assert controller.service.calls == ["city"]
+    assert results == [({"weather": "ok"}, {}, "")]
+
+    # the city weather is due when the shared response is 10 minutes old
+    assert worker.fetched_at == {DataSource.CITY_WEATHER: NOW - 300}
+    controller.store_city_weather(results[0][0], worker.fetched_at[DataSource.CITY_WEATHER])
+    assert controller.refresh_time(DataSource.CITY_WEATHER) == NOW - 300 + Constants.CITY_WEATHER_REFRESH_S
@@ -8,11 +8,12 @@ def test_requestrunner_extracts_error_message_from_json():
     m.status_code = 500
     m.raise_for_status.side_effect = requests.HTTPError("500")
     m.json.return_value = {"message": "internal error"}
+    m.content = b'{"message": "internal error"}'
 
-    def fake_get(url, timeout=None):
+    def fake_get(session, url, timeout=None):
         return m
 
-    with patch("requests.get", fake_get):
+    with patch("requests.Session.get", fake_get):
         r = RequestRunner()
         out = r.get_road_weather(1)
         assert out == {}
@@ -0,0 +1,116 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from controller.weather_service import WeatherService
+from model.station_info import WeatherStationInfo
+from utils.response_cache import ResponseCache
+from utils.web_utils import RequestRunner
+
+
+def test_values_expire_and_errors_are_not_cached():
+    now = [1000.0]
+    cache = ResponseCache(ttl_s=600, max_entries=2, clock=lambda: now[0])
+    assert cache.get_or_fetch("a", lambda: ({"v": 1}, "")) == ({"v": 1}, "", 1000.0)
+    now[0] += 300
+    # a cached value comes with the time it was fetched
+    assert cache.get_or_fetch("a", lambda: ({"v": 2}, "")) == ({"v": 1}, "", 1000.0)
+    now[0] += 300
+    assert cache.get_or_fetch("a", lambda: ({"v": 3}, "")) == ({"v": 3}, "", 1600.0)
+
+    assert cache.get_or_fetch("b", lambda: ({}, "HTTP 500"))[:2] == ({}, "HTTP 500")
+    assert cache.get_or_fetch("b", lambda: ({"v": 4}, ""))[:2] == ({"v": 4}, "")
+    cache.get_or_fetch("c", lambda: ({"v": 5}, ""))
+    assert len(cache) == 2 and cache.stats["evictions"] == 1
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 5
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_fetch("d", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert cache.get_or_fetch("d", lambda: ({"v": 6}, ""))[:2] == ({"v": 6}, "")
+
+
+def test_concurrent_requests_share_one_fetch():
+    cache = ResponseCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return {"v": 1}, ""
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(cache.get_or_fetch, "a", fetch)
+        started.wait(timeout=5)
+        followers = [executor.submit(cache.get_or_fetch, "a", fetch) for _ in range(3)]
+        while cache.stats["coalesced"] < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+    assert calls == [1]
+    assert results == [({"v": 1}, "", results[0][2])] * 4
+
+
+class CountingRunner(RequestRunner):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def get_city_weather(self, city, coordinates, api_key):
+        self.requests.append(("weather", city))
+        if city == "Nowhere":
+            self.status_code = 404
+            self.error_message = "city not found"
+            return {}
+        self.reset_error()
+        return {"name": city}
+
+    def get_forecast(self, coordinates, api_key):
+        self.requests.append(("forecast", coordinates.latitude))
+        self.reset_error()
+        return {"list": []}
+
+
+def make_coordinates(lat, lon):
+    return WeatherStationInfo.Coordinates(lat, lon)
+
+
+def test_weather_service_shares_responses_by_city_and_location(monkeypatch):
+    monkeypatch.setattr("controller.weather_service.RequestRunner", CountingRunner)
+    service = WeatherService(owm_cache=ResponseCache())
+    espoo = make_coordinates(60.2, 24.66)
+    assert service.get_city_weather("Espoo", espoo, "key") == {"name": "Espoo"}
+    assert service.get_city_weather(" espoo", make_coordinates(60.3, 24.9), "key") == {"name": "Espoo"}
+    service.get_forecast(espoo, "key")
+    service.get_forecast(make_coordinates(60.21, 24.68), "key")  # rounds to the same location
+    service.get_forecast(make_coordinates(61.5, 23.8), "key")
+    assert service._runner.requests == [("weather", "Espoo"), ("forecast", 60.2), ("forecast", 61.5)]
+    assert not service.has_error
+
+    # failures are not shared after the fact, but the calling thread sees the error
+    assert service.get_city_weather("Nowhere", espoo, "key") == {}
+    assert service.has_error and service.error_message == "city not found"
+    service.get_city_weather("Nowhere", espoo, "key")
+    assert service._runner.requests.count(("weather", "Nowhere")) == 2
+    # a cache hit clears the error state of the calling thread
+    service.get_city_weather("Espoo", espoo, "key")
+    assert not service.has_error
+
+
+def test_shared_responses_report_when_they_were_fetched(monkeypatch):
+    monkeypatch.setattr("controller.weather_service.RequestRunner", CountingRunner)
+    now = [1000.0]
+    service = WeatherService(owm_cache=ResponseCache(clock=lambda: now[0]))
+    espoo = make_coordinates(60.2, 24.66)
+    service.get_city_weather("Espoo", espoo, "key")
+    assert service.fetched_at == 1000.0
+    now[0] += 300
+    service.get_city_weather("Espoo", espoo, "key")
+    service.get_forecast(espoo, "key")
+    assert service.fetched_at == 1300.0  # the forecast was fetched now
+    service.get_city_weather("Espoo", espoo, "key")
+    assert service.fetched_at == 1000.0  # shared: as old as the first request
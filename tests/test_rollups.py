@@ -0,0 +1,144 @@
+import copy
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from model.data_model import DataModel
+from model.rollups import RollupRing, StationRollups
+from model.weather_station import WeatherStation
+
+
+class FakeSensor:
+    def __init__(self, sensor_id, value, timestamp):
+        self.id = sensor_id
+        self.float_value = value
+        self.measured_time = datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+def buckets(series):
+    return list(zip(series.starts, series.minimums, series.maximums, series.means, series.counts))
+
+
+def test_ring_aggregates_buckets():
+    ring = RollupRing(600, capacity=4)
+    for t, v in [(0, 1.0), (300, 3.0), (599, 2.0), (1200, -1.0), (1800, 5.0)]:
+        ring.add(t, v)
+    assert buckets(ring.series(0, 2400)) == [
+        (0, 1.0, 3.0, 2.0, 3),
+        (1200, -1.0, -1.0, -1.0, 1),  # the empty bucket 600-1200 is left out
+        (1800, 5.0, 5.0, 5.0, 1),
+    ]
+    assert buckets(ring.series(700, 1300)) == [(1200, -1.0, -1.0, -1.0, 1)]
+
+    ring.add(2400, 0.0)  # the first bucket falls out of the 4 kept
+    assert [start for start, *_ in buckets(ring.series(0, 3000))] == [1200, 1800, 2400]
+    ring.add(0, 9.0)  # older than the kept buckets: ignored
+    assert ring.series(0, 1200).starts.tolist() == []
+
+    with pytest.raises(ValueError):
+        RollupRing(0, 10)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_ring_matches_recomputation(seed):
+    rng = random.Random(seed)
+    capacity = rng.randint(1, 10)
+    ring = RollupRing(60, capacity)
+    readings = []
+    t = 0
+    for _ in range(rng.randint(1, 300)):
+        t += rng.choice([1, 5, 30, 60, 200, 1000])
+        value = rng.randint(-50, 50) / 10
+        ring.add(t, value)
+        readings.append((t, value))
+
+    latest = t // 60
+    start, end = rng.uniform(0, t), t + 60
+    expected = {}
+    for timestamp, value in readings:
+        bucket = timestamp // 60
+        if bucket > latest - capacity and bucket >= start // 60:
+            expected.setdefault(bucket, []).append(value)
+    series = ring.series(start, end)
+    assert [(s, mn, mx, c) for s, mn, mx, _, c in buckets(series)] == [
+        (b * 60, min(v), max(v), len(v)) for b, v in sorted(expected.items())
+    ]
+    for (_, _, _, mean, _), (_, values) in zip(buckets(series), sorted(expected.items())):
+        assert mean == pytest.approx(sum(values) / len(values))
+
+
+def test_query_picks_finest_resolution_within_budget():
+    rollups = StationRollups()
+    start = 1_750_032_000  # midnight UTC
+    for minute in range(0, 3 * 24 * 60, 10):
+        assert rollups.record([FakeSensor(1, float(minute % 60), start + minute * 60)]) == 1
+    assert rollups.record([FakeSensor(1, 0.0, start)]) == 0  # not newer: ignored
+    end = start + 3 * 86400
+
+    last_hours = rollups.query(1, end - 6 * 3600, end, max_points=100)
+    assert last_hours.resolution_s == 600 and len(last_hours) == 36
+
+    last_day = rollups.query(1, end - 86400, end, max_points=48)
+    assert last_day.resolution_s == 3600 and len(last_day) == 24
+    assert set(last_day.minimums) == {0.0} and set(last_day.maximums) == {50.0}
+    assert set(last_day.means) == {25.0}
+
+    # 10-minute buckets are kept for a day only, so older ranges are hourly
+    older = rollups.query(1, start, start + 6 * 3600, max_points=100)
+    assert older.resolution_s == 3600 and len(older) == 6
+
+    days = rollups.query(1, start, end, max_points=10)
+    assert days.resolution_s == 86400 and days.counts.tolist() == [144, 144, 144]
+    assert len(rollups.query(2, start, end, max_points=10)) == 0
+
+
+def test_station_parse_updates_rollups(load_example):
+    station_json = load_example("station_data.json")
+    station = WeatherStation()
+    station.parse(station_json)
+    station.parse(station_json)  # unchanged poll: nothing is counted twice
+    later = copy.deepcopy(station_json)
+    for sensor in later["sensorValues"]:
+        if sensor["name"] == "ILMA":
+            sensor["measuredTime"] = "2025-08-19T07:19:54Z"
+            sensor["value"] = 13.5
+    station.parse(later)
+
+    end = datetime(2025, 8, 19, 7, 30, tzinfo=timezone.utc).timestamp()
+    hourly = station.get_rollups("ILMA", end - 1800, end, max_points=2)
+    assert hourly.resolution_s == 3600
+    assert buckets(hourly) == [(hourly.starts[0], 13.1, 13.5, pytest.approx(13.3), 2)]
+    assert len(station.get_rollups("NO_SUCH_SENSOR", 0, end, 10)) == 0
+
+
+def observation(station_json, observed, air_temperature):
+    data = copy.deepcopy(station_json)
+    data["dataUpdatedTime"] = observed
+    for sensor in data["sensorValues"]:
+        sensor["measuredTime"] = observed
+        if sensor["name"] == "ILMA":
+            sensor["value"] = air_temperature
+    return data
+
+
+def test_rollups_belong_to_the_selected_station(load_example):
+    metadata = load_example("station_metadata.json")
+    station_json = load_example("station_data.json")
+    stations = []
+    for station_id in (1, 2):
+        station = copy.deepcopy(metadata)
+        station["id"] = station["properties"]["id"] = station_id
+        stations.append(station)
+    model = DataModel()
+    model.parse_station_list(stations)
+
+    model.set_currect_station(1)
+    model.parse_station_data(observation(station_json, "2025-08-19T10:00:00Z", 1.0))
+    model.parse_station_data(observation(station_json, "2025-08-19T10:10:00Z", 2.0))
+    model.set_currect_station(2)
+    model.parse_station_data(observation(station_json, "2025-08-19T10:05:00Z", -5.0))
+
+    start = datetime(2025, 8, 19, 10, 0, tzinfo=timezone.utc).timestamp()
+    hourly = model.current_station.get_rollups("ILMA", start, start + 3600, max_points=1)
+    assert buckets(hourly) == [(start, -5.0, -5.0, -5.0, 1)]
@@ -0,0 +1,59 @@
+import pytest
+
+from definitions import Constants
+from model.weather_station import Sensor, WeatherStation
+
+
+def make_sensor_json(value, sensor_id=1, name="ILMA"):
+    return {
+        "id": sensor_id,
+        "stationId": 1,
+        "name": name,
+        "shortName": name,
+        "measuredTime": "2025-08-19T07:09:54Z",
+        "value": value,
+        "unit": "°C",
+    }
+
+
+@pytest.mark.parametrize(
+    "raw, float_value, int_value",
+    [
+        (13.9, 13.9, 13),
+        (-0.5, -0.5, 0),
+        (1234, 1234.0, 1234),
+        ("7.25", 7.25, 7),
+        (1e-05, 1e-05, 0),
+    ],
+)
+def test_numeric_values_are_decoded_once(raw, float_value, int_value):
+    sensor = Sensor()
+    assert sensor.parse(make_sensor_json(raw))
+    assert sensor.value == raw
+    assert sensor.float_value == float_value
+    assert isinstance(sensor.int_value, int) and sensor.int_value == int_value
+
+
+@pytest.mark.parametrize("raw", [None, "///", float("nan"), float("inf"), True, [1]])
+def test_missing_or_invalid_values_use_sentinel(raw):
+    sensor = Sensor()
+    assert sensor.parse(make_sensor_json(raw))
+    assert sensor.float_value == Constants.INVALID_VALUE
+    assert sensor.int_value == Sensor.INVALID_VALUE == Constants.INVALID_VALUE
+
+
+def test_station_accessors_handle_invalid_values():
+    w = WeatherStation()
+    w.parse(
+        {
+            "dataUpdatedTime": "2025-08-19T07:11:16Z",
+            "sensorValues": [
+                make_sensor_json(None),
+                make_sensor_json(None, sensor_id=58, name="NÄKYVYYS_M"),
+                make_sensor_json(None, sensor_id=22, name="SADE"),
+            ],
+        }
+    )
+    assert w.air_temperature == Constants.INVALID_VALUE
+    assert w.visibility_str == ""
+    assert w.get_present_weather() == ("Säätila:", "")
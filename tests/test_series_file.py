@@ -0,0 +1,123 @@
+import copy
+from array import array
+
+import pytest
+from hypothesis import given, strategies as st
+
+from model.archive import ObservationArchive
+from model.series_file import (
+    SeriesFileReader,
+    SeriesFileWriter,
+    decode_times,
+    decode_values,
+    encode_times,
+    encode_values,
+)
+from model.weather_station import WeatherStation
+
+
+def bits(values):
+    return [v.hex() for v in values]
+
+
+@given(
+    st.lists(st.integers(min_value=1, max_value=2**40), min_size=1, max_size=200),
+    st.one_of(
+        st.lists(st.integers(-50000, 50000).map(lambda n: n / 10), min_size=200, max_size=200),
+        st.lists(st.floats(allow_nan=False), min_size=200, max_size=200),
+    ),
+)
+def test_block_round_trip(steps, values):
+    times = [1_700_000_000]
+    for step in steps[1:]:
+        times.append(times[-1] + step)
+    values = values[: len(times)]
+    assert decode_times(encode_times(times), times[0], len(times)).tolist() == times
+    assert bits(decode_values(encode_values(values), len(values))) == bits(values)
+
+
+def test_regular_slowly_changing_series_is_compact():
+    times = list(range(0, 1024 * 600, 600))
+    values = [round(10.0 + (i // 6) * 0.1, 1) for i in range(1024)]  # +0.1 °C every hour
+    assert len(encode_times(times)) * 8 / len(times) < 1.1
+    assert len(encode_values(values)) * 8 / len(values) < 2.0
+    assert len(encode_values([0.0] * 1024)) == 9  # one repeated value is stored once
+
+
+def test_invalid_segments():
+    with pytest.raises(ValueError):
+        encode_times([1, 1])
+    with pytest.raises(ValueError):
+        encode_values([])
+    with pytest.raises(ValueError):
+        decode_values(encode_values([0.5, 1.5])[:1], 2)
+
+
+def test_range_scan_decodes_only_overlapping_blocks(tmp_path):
+    file_name = str(tmp_path / "series.bin")
+    times = list(range(0, 100 * 60, 60))
+    with SeriesFileWriter(file_name, block_points=10) as writer:
+        writer.add_series(2, 7, times[:50], [float(i) for i in range(50)])
+        writer.add_series(2, 7, times[50:], [float(i) for i in range(50, 100)])
+        writer.add_series(1, 7, times, [1.5] * 100)
+        with pytest.raises(ValueError):
+            writer.add_series(2, 7, [0], [0.0])  # not after the earlier readings
+
+    with SeriesFileReader(file_name) as reader:
+        assert reader.series_keys() == [(1, 7), (2, 7)]
+        all_times, all_values = reader.scan(2, 7)
+        assert all_times.tolist() == times
+        assert all_values.tolist() == [float(i) for i in range(100)]
+        assert reader.blocks_decoded == 10
+
+        reader.blocks_decoded = 0
+        scanned_times, scanned_values = reader.scan(2, 7, start_s=25 * 60, end_s=35 * 60)
+        assert scanned_times.tolist() == times[25:35]
+        assert scanned_values.tolist() == [float(i) for i in range(25, 35)]
+        assert reader.blocks_decoded == 2
+        assert reader.scan(3, 7) == (array("d"), array("d"))
+
+
+def test_equal_segments_are_stored_once(tmp_path):
+    times = list(range(0, 1000 * 60, 60))
+    sizes = []
+    for sensors in (1, 50):
+        file_name = tmp_path / f"series{sensors}.bin"
+        with SeriesFileWriter(str(file_name)) as writer:
+            for sensor_id in range(sensors):
+                writer.add_series(1, sensor_id, times, [float(i % 7) for i in range(1000)])
+        sizes.append(file_name.stat().st_size)
+    # the other sensors add nothing but their index entries
+    assert sizes[1] - sizes[0] < 49 * 64
+    with SeriesFileReader(str(tmp_path / "series50.bin")) as reader:
+        assert reader.scan(1, 49)[1].tolist() == [float(i % 7) for i in range(1000)]
+
+
+def test_reader_rejects_other_files(tmp_path):
+    file_name = tmp_path / "other.bin"
+    file_name.write_bytes(b"not a series file at all, just some bytes")
+    with pytest.raises(ValueError):
+        SeriesFileReader(str(file_name))
+
+
+def test_archive_export(tmp_path, load_example):
+    station_json = load_example("station_data.json")
+    ilma = [s for s in station_json["sensorValues"] if s["name"] == "ILMA"][0]["id"]
+    station = WeatherStation()
+    station.parse(station_json)
+    archive = ObservationArchive(str(tmp_path / "archive.sqlite"), flush_interval_s=0.01)
+    archive.add_station(station)
+    later = copy.deepcopy(station_json)
+    for sensor in later["sensorValues"]:
+        if sensor["name"] == "ILMA":
+            sensor["measuredTime"] = "2025-08-19T07:19:54Z"
+            sensor["value"] = 13.5
+    station.parse(later)
+    archive.add_station(station)
+    archive.close()
+
+    file_name = str(tmp_path / "series.bin")
+    assert archive.export_series(file_name) == archive.rows_written
+    with SeriesFileReader(file_name) as reader:
+        times, values = reader.scan(station.id, ilma)
+        assert list(zip(times, values)) == archive.query(station.id, ilma)
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from controller.app_controller import AppController
+from model.helpers import distance_km
+from model.spatial_index import SpatialIndex
+from model.station_info import WeatherStationList
+
+
+def random_points(count, seed=3):
+    rng = random.Random(seed)
+    return [(i, rng.uniform(59.7, 70.0), rng.uniform(20.5, 31.5)) for i in range(count)]
+
+
+def test_nearest_and_within_match_brute_force():
+    points = random_points(2000)
+    index = SpatialIndex(cell_km=20.0)
+    for item_id, lat, lon in points:
+        index.insert(item_id, lat, lon, item_id)
+
+    rng = random.Random(4)
+    for lat, lon in [(60.17, 24.94), (52.52, 13.40)] + [
+        (rng.uniform(59, 71), rng.uniform(19, 33)) for _ in range(20)
+    ]:
+        expected = sorted(points, key=lambda p: distance_km(lat, lon, p[1], p[2]))
+        nearest = index.nearest(lat, lon, 5)
+        assert [item for item, _ in nearest] == [p[0] for p in expected[:5]]
+        assert nearest[0][1] == pytest.approx(distance_km(lat, lon, expected[0][1], expected[0][2]))
+
+        within = index.within(lat, lon, 50.0)
+        assert [item for item, _ in within] == [
+            p[0] for p in expected if distance_km(lat, lon, p[1], p[2]) <= 50.0
+        ]
+
+
+def test_insert_move_remove():
+    index = SpatialIndex()
+    index.insert(1, 60.0, 24.0)
+    index.insert(2, 65.0, 25.0)
+    index.insert(1, 65.1, 25.0)  # moved next to station 2
+    assert len(index) == 2
+    assert [d < 20 for _, d in index.nearest(65.0, 25.0, 2)] == [True, True]
+    index.remove(2)
+    assert 2 not in index and len(index.nearest(65.0, 25.0, 2)) == 1
+    assert index.nearest(65.0, 25.0, 0) == []
+
+
+def test_station_list_queries_and_incremental_sync(station_json):
+    sl = WeatherStationList()
+    sl.parse(
+        [
+            station_json(1, 60.17, 24.94),
+            station_json(2, 60.20, 24.90, name="TestStation"),  # not visible
+            station_json(3, 61.50, 23.76),
+        ]
+    )
+    nearest = sl.find_nearest_stations(60.2, 24.9, 2)
+    assert [station.id for station, _ in nearest] == [1, 3]
+    assert [s.id for s, _ in sl.find_nearest_stations(60.2, 24.9, 1, visible_only=False)] == [2]
+    assert [s.id for s, _ in sl.find_stations_within(60.2, 24.9, 10.0)] == [1]
+
+    index = sl.spatial_index
+    # station 3 moves and station 1 is removed: the same index is updated
+    sl.parse([station_json(2, 60.20, 24.90, name="TestStation"), station_json(3, 60.21, 24.91)])
+    assert sl.spatial_index is index
+    assert len(index) == 2
+    assert [s.id for s, _ in sl.find_nearest_stations(60.2, 24.9, 2)] == [3]
+
+
+def test_app_controller_exposes_queries(station_json):
+    controller = AppController(service=object())
+    controller.load_station_list([station_json(1, 60.17, 24.94), station_json(3, 61.50, 23.76)])
+    station, distance = controller.find_nearest_stations(61.4, 23.8)[0]
+    assert station.id == 3 and distance < 15
+    assert controller.find_stations_within(61.4, 23.8, 1.0) == []
@@ -0,0 +1,37 @@
+from model.station_info import WeatherStationList
+
+
+def test_lookups_and_visible_name_list(station_json):
+    sl = WeatherStationList()
+    sl.parse(
+        [
+            station_json(2, name="vt4_Oulu_Intiö"),
+            station_json(1, name="vt1_Espoo_Nupuri"),
+            station_json(3, name="TestStation"),
+        ]
+    )
+    assert sl.find_station_by_id(1).formatted_name == "Espoo, Nupuri vt1"
+    assert sl.find_station_by_name("Oulu, Intiö vt4").id == 2
+    assert sl.find_station_by_id(99).id == 0
+    assert sl.get_station_name_list() == ["Espoo, Nupuri vt1", "Oulu, Intiö vt4"]
+    assert sl.get_visible_stations() is sl.get_visible_stations()
+
+
+def test_reparse_updates_indexes_incrementally(station_json):
+    sl = WeatherStationList()
+    sl.parse([station_json(1, name="vt1_Espoo_Nupuri"), station_json(2, name="vt4_Oulu_Intiö")])
+    espoo = sl.find_station_by_id(1)
+    visible = sl.get_visible_stations()
+
+    # unchanged catalogue: same objects, cached list kept
+    sl.parse([station_json(1, name="vt1_Espoo_Nupuri"), station_json(2, name="vt4_Oulu_Intiö")])
+    assert sl.find_station_by_id(1) is espoo
+    assert sl.get_visible_stations() is visible
+
+    # renamed and removed stations
+    sl.parse([station_json(1, name="vt1_Espoo_Kauklahti")])
+    assert sl.find_station_by_id(1) is espoo
+    assert sl.find_station_by_name("Espoo, Kauklahti vt1") is espoo
+    assert sl.find_station_by_name("Espoo, Nupuri vt1").id == 0
+    assert sl.find_station_by_id(2).id == 0
+    assert sl.get_station_name_list() == ["Espoo, Kauklahti vt1"]
@@ -0,0 +1,61 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from model.helpers import distance_km
+from model.station_info import WeatherStationList
+
+
+@pytest.fixture
+def station_list(station_json):
+    sl = WeatherStationList()
+    sl.parse(
+        [
+            station_json(1, 60.17, 24.94, 10.0),  # Helsinki
+            station_json(2, 61.50, 23.76, 10.0, status="REMOVED_TEMPORARILY"),  # Tampere
+            station_json(3, 65.01, 25.47, 10.0, updated="2025-06-17T04:00:00Z"),  # Oulu
+            station_json(4, 60.45, 22.27, 10.0),  # Turku
+        ]
+    )
+    return sl
+
+
+def test_columns_match_station_objects(station_list):
+    sl = station_list
+    table = sl.table
+    assert len(table) == 4
+    assert table.ids.tolist() == [1, 2, 3, 4]
+    assert table.lat[2] == 65.01 and table.lon[2] == 25.47 and table.alt[2] == 10.0
+    assert table.status_names[table.status[1]] == "REMOVED_TEMPORARILY"
+    assert sl.table is table  # built once
+
+
+def test_queries(station_list):
+    table = station_list.table
+    south = table.in_bbox(59.0, 20.0, 62.0, 26.0)
+    assert [s.id for s in table.stations_at(south)] == [1, 2, 4]
+    assert table.ids[table.with_status("GATHERING")].tolist() == [1, 3, 4]
+    assert table.with_status("unknown").size == 0
+    assert table.ids[table.updated_since(table.data_updated[2])].tolist() == [3]
+
+
+def test_distance_sort_matches_scalar_haversine(station_list):
+    table = station_list.table
+    lat, lon = 60.2, 24.6
+    expected = sorted(
+        table.stations_at(range(len(table))),
+        key=lambda s: distance_km(lat, lon, s.coordinates.latitude, s.coordinates.longitude),
+    )
+    assert table.stations_at(table.sort_by_distance(lat, lon)) == expected
+    assert table.stations_at(table.sort_by_distance(lat, lon, limit=2)) == expected[:2]
+
+    distances = table.distances_km(lat, lon)
+    assert distances[0] == pytest.approx(distance_km(lat, lon, 60.17, 24.94))
+
+
+def test_table_is_rebuilt_after_parse(station_list, station_json):
+    sl = station_list
+    table = sl.table
+    sl.parse([station_json(1, 60.17, 24.94)])
+    assert sl.table is not table
+    assert sl.table.ids.tolist() == [1]
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+import pytest
+from dateutil import tz
+
+from utils.timestamps import UTC, parse_utc_timestamp
+
+
+def test_canonical_format_matches_strptime():
+    ts = "2025-08-19T07:09:54Z"
+    expected = datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=tz.tzutc())
+    assert parse_utc_timestamp(ts) == expected
+    assert parse_utc_timestamp(ts).tzinfo is UTC
+    # memoized: the same immutable object is shared
+    assert parse_utc_timestamp(ts) is parse_utc_timestamp(ts)
+
+
+def test_fractional_seconds_and_offsets():
+    assert parse_utc_timestamp("2025-08-19T07:09:54.5Z") == datetime(2025, 8, 19, 7, 9, 54, 500000, tzinfo=UTC)
+    assert parse_utc_timestamp("2025-08-19T07:09:54.123456789Z").microsecond == 123456
+    assert parse_utc_timestamp("2025-08-19T10:09:54+03:00") == datetime(2025, 8, 19, 7, 9, 54, tzinfo=UTC)
+    assert parse_utc_timestamp("2025-08-19T05:39:54.25-0130") == datetime(2025, 8, 19, 7, 9, 54, 250000, tzinfo=UTC)
+    assert parse_utc_timestamp("2025-08-19T07:09:54+00:00").tzinfo is UTC
+
+
+@pytest.mark.parametrize(
+    "ts",
+    ["", "2025-08-19", "2025-08-19 07:09:54Z", "2025-08-19T07:09:54", "2025-08-19T07:09:54+3", "2025-08-19T07:09:54.xZ"],
+)
+def test_invalid_timestamps_raise(ts):
+    with pytest.raises(ValueError):
+        parse_utc_timestamp(ts)
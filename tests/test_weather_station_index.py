@@ -0,0 +1,44 @@
+from definitions import Constants, ConversionType
+from model.weather_station import WeatherStation
+
+
+def make_sensor(sensor_id, name, value):
+    return {
+        "id": sensor_id,
+        "stationId": 1,
+        "name": name,
+        "shortName": name,
+        "measuredTime": "2025-08-19T07:09:54Z",
+        "value": value,
+        "unit": "",
+    }
+
+
+def make_station_json(*sensors):
+    return {"dataUpdatedTime": "2025-08-19T07:11:16Z", "sensorValues": list(sensors)}
+
+
+def test_typed_accessors_match_get_value():
+    w = WeatherStation()
+    w.parse(
+        make_station_json(
+            make_sensor(1, "ILMA", 13.1),
+            make_sensor(16, "TUULENSUUNTA", 271.0),
+            make_sensor(58, "NÄKYVYYS_M", 2500),
+        )
+    )
+    assert w.get_float("ILMA") == w.get_value("ILMA", ConversionType.TO_FLOAT) == 13.1
+    assert w.get_int("TUULENSUUNTA") == w.get_value("TUULENSUUNTA") == 271
+    assert w.get_int_by_id(58) == w.get_value("58") == 2500
+    assert w.get_float("KESKITUULI") == Constants.INVALID_VALUE
+    assert w.get_int_by_id(100) == Constants.INVALID_VALUE
+
+
+def test_index_is_rebuilt_on_parse_and_first_duplicate_wins():
+    w = WeatherStation()
+    w.parse(make_station_json(make_sensor(1, "ILMA", 1.0), make_sensor(2, "ILMA", 2.0)))
+    assert w.air_temperature == 1.0
+
+    w.parse(make_station_json(make_sensor(3, "KESKITUULI", 4.0)))
+    assert w.air_temperature == Constants.INVALID_VALUE
+    assert w.wind_speed == 4.0
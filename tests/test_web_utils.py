@@ -8,6 +8,7 @@ class DummyResponse:
         self.status_code = status
         self._json = json_data or {}
         self.text = text
+        self.content = json.dumps(self._json).encode()
 
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -20,10 +21,10 @@ class DummyResponse:
 def test_get_weather_stations_success(monkeypatch):
     resp = DummyResponse(200, json_data={"features": [1, 2, 3]})
 
-    def fake_get(url, timeout=None):
+    def fake_get(session, url, timeout=None):
         return resp
 
-    with patch("requests.get", fake_get):
+    with patch("requests.Session.get", fake_get):
         r = RequestRunner()
         out = r.get_weather_stations()
         assert isinstance(out, list) and len(out) == 3
@@ -33,11 +34,12 @@ def test_execute_handles_invalid_json(monkeypatch):
     # simulate response with invalid JSON
     resp = DummyResponse(200, json_data=None, text="notjson")
 
-    def fake_get(url, timeout=None):
+    def fake_get(session, url, timeout=None):
         # return object whose json() will raise ValueError
         m = Mock()
         m.status_code = 200
         m.text = "notjson"
+        m.content = b"notjson"
 
         def raise_for_status():
             return None
@@ -49,7 +51,7 @@ def test_execute_handles_invalid_json(monkeypatch):
         m.json = json_raiser
         return m
 
-    with patch("requests.get", fake_get):
+    with patch("requests.Session.get", fake_get):
         r = RequestRunner()
         out = r.get_weather_stations()
         # should return empty-ish structure (list or dict)
@@ -5,10 +5,10 @@ from unittest.mock import patch
 
 
 def test_requests_get_raises_request_exception():
-    def fake_get(url, timeout=None):
+    def fake_get(session, url, timeout=None):
         raise RequestException("network down")
 
-    with patch("requests.get", fake_get):
+    with patch("requests.Session.get", fake_get):
         r = RequestRunner()
         out = r.get_weather_stations()
         assert out == {}
@@ -0,0 +1,40 @@
+from unittest.mock import Mock, patch
+
+from requests.exceptions import RequestException
+
+from utils.web_utils import RequestRunner
+
+
+def test_sessions_are_pooled_per_host():
+    r = RequestRunner()
+    s1 = r._session_for("https://tie.digitraffic.fi/api/weather/v1/stations")
+    s2 = r._session_for("https://tie.digitraffic.fi/api/weather/v1/stations/1/data")
+    s3 = r._session_for("https://api.openweathermap.org/data/2.5/weather")
+    assert s1 is s2
+    assert s1 is not s3
+    adapter = s1.get_adapter("https://tie.digitraffic.fi/")
+    assert adapter._pool_maxsize == r._pool_size
+    r.close()
+
+
+def test_keep_alive_disabled_requests_connection_close():
+    r = RequestRunner(keep_alive=False)
+    session = r._session_for("https://tie.digitraffic.fi/")
+    assert session.headers["Connection"] == "close"
+
+
+def test_warm_up_contacts_each_host_and_ignores_errors():
+    seen = []
+
+    def fake_head(session, url, timeout=None):
+        seen.append(url)
+        if "openweathermap" in url:
+            raise RequestException("offline")
+        return Mock()
+
+    with patch("requests.Session.head", fake_head):
+        r = RequestRunner()
+        r.warm_up(background=False)
+
+    assert len(seen) == 2
+    assert not r.has_error
@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+import time
+
+from definitions import Constants
+
+
+class CityResolver:
+    """Remembers which OpenWeatherMap current weather query works for each city name.
+
+    A name OpenWeatherMap recognised is mapped to its OpenWeatherMap city
+    id, so later requests query by id. A name it did not recognise is
+    remembered for `negative_ttl_s`; until then requests go straight to the
+    station coordinates instead of trying the name first. Names are
+    compared stripped and case-folded.
+
+    The mapping is kept in the JSON file `file_name` (rewritten whenever it
+    changes, which happens about once per city), so it survives restarts.
+    The resolver is safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        file_name: str = Constants.CITY_RESOLVER_FILE_NAME,
+        negative_ttl_s: float = Constants.CITY_NEGATIVE_TTL_S,
+        clock=time.time,
+    ):
+        self._file_name = file_name
+        self._negative_ttl_s = negative_ttl_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._ids = {}  # city name -> OpenWeatherMap city id
+        self._failed = {}  # city name -> time the name query failed (s)
+        self.id_hits = 0  # lookups answered with a city id
+        self.negative_hits = 0  # lookups answered with "use the coordinates"
+        self._load()
+
+    def __repr__(self) -> str:
+        return f"CityResolver(ids={len(self._ids)}, failed={len(self._failed)})"
+
+    @property
+    def stats(self) -> dict:
+        """Return lookup counters and the number of known and failed names."""
+        with self._lock:
+            return {
+                "id_hits": self.id_hits,
+                "negative_hits": self.negative_hits,
+                "ids": len(self._ids),
+                "failed": len(self._failed),
+            }
+
+    @staticmethod
+    def _key(city: str) -> str:
+        return city.strip().casefold()
+
+    def city_id(self, city: str) -> int | None:
+        """Return the OpenWeatherMap city id resolved for `city`, or None."""
+        with self._lock:
+            city_id = self._ids.get(self._key(city))
+            if city_id is not None:
+                self.id_hits += 1
+            return city_id
+
+    def is_unresolvable(self, city: str) -> bool:
+        """True when a query by `city` failed less than `negative_ttl_s` ago."""
+        key = self._key(city)
+        with self._lock:
+            failed_at = self._failed.get(key)
+            if failed_at is None:
+                return False
+            if failed_at + self._negative_ttl_s <= self._clock():
+                del self._failed[key]  # try the name again
+                return False
+            self.negative_hits += 1
+            return True
+
+    def resolved(self, city: str, city_id: int) -> None:
+        """Remember that a query by `city` returned the city `city_id`."""
+        key = self._key(city)
+        with self._lock:
+            if self._ids.get(key) == city_id and key not in self._failed:
+                return
+            self._ids[key] = city_id
+            self._failed.pop(key, None)
+            self._save()
+
+    def failed(self, city: str) -> None:
+        """Remember that OpenWeatherMap did not recognise `city`."""
+        key = self._key(city)
+        with self._lock:
+            self._ids.pop(key, None)
+            self._failed[key] = self._clock()
+            self._save()
+
+    def forget(self, city: str) -> None:
+        """Drop what is known about `city`, e.g. when its city id stopped working."""
+        key = self._key(city)
+        with self._lock:
+            if self._ids.pop(key, None) is not None or self._failed.pop(key, None) is not None:
+                self._save()
+
+    def _load(self):
+        try:
+            with open(self._file_name, "r") as f:
+                data = json.load(f)
+            self._ids = {str(k): int(v) for k, v in data["ids"].items()}
+            self._failed = {str(k): float(v) for k, v in data["failed"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self._ids, self._failed = {}, {}
+
+    def _save(self):
+        # called with the lock held
+        try:
+            directory = os.path.dirname(self._file_name)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self._file_name + ".tmp", "w") as f:
+                json.dump({"ids": self._ids, "failed": self._failed}, f)
+            os.replace(self._file_name + ".tmp", self._file_name)
+        except OSError:
+            pass
@@ -0,0 +1,291 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+
+from definitions import Constants
+from utils import json_backend
+
+
+class HttpCache:
+    """On-disk HTTP response cache with conditional-GET support.
+
+    Response bodies are stored in `directory`, one file per URL, together
+    with an index holding the validators (`ETag`, `Last-Modified`) and the
+    freshness lifetime of each entry. Decoded JSON is kept in memory, so a
+    fresh hit or a `304 Not Modified` revalidation returns the previously
+    decoded object without parsing the body again.
+
+    Entries are keyed by the SHA-1 of the URL, so URLs (and the API keys in
+    their query strings) are not written to disk. The index is written at
+    most every `save_interval_s` seconds when it has changed, and by
+    `flush()`/`close()`; the write happens outside the cache lock.
+
+    The total size of the stored bodies is bounded by `max_bytes`; the least
+    recently used entries are evicted first. The cache is safe to use from
+    several threads.
+    """
+
+    INDEX_FILE_NAME = "index.json"
+
+    def __init__(
+        self,
+        directory: str = Constants.HTTP_CACHE_DIR,
+        max_bytes: int = Constants.HTTP_CACHE_MAX_BYTES,
+        save_interval_s: float = Constants.HTTP_CACHE_INDEX_SAVE_S,
+    ):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._save_interval_s = save_interval_s
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # serializes index writes
+        self._entries = OrderedDict()  # URL hash -> entry dict, least recently used first
+        self._decoded = {}  # URL hash -> decoded JSON
+        self._total_bytes = 0
+        self._dirty = False  # the index changed since it was last written
+        self._saved_at = time.monotonic()
+        self.hits = 0  # fresh entries served without a request
+        self.revalidations = 0  # entries confirmed by a 304 response
+        self.misses = 0  # full downloads
+        self.evictions = 0
+        self._load_index()
+        if self._dirty:
+            self.flush()  # drop the URLs of an index written by an older version
+
+    def __repr__(self) -> str:
+        return f"HttpCache(entries={len(self._entries)}, bytes={self._total_bytes})"
+
+    @property
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current size of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "revalidations": self.revalidations,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
+
+    def get_fresh(self, url: str):
+        """Return the decoded response for `url` if the cached entry is still fresh.
+
+        Returns None when there is no entry or it has to be revalidated.
+        """
+        key = _key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["expires_at"] <= time.time():
+                return None
+            data = self._get_decoded(key, entry)
+            if data is not None:
+                self.hits += 1
+            return data
+
+    def conditional_headers(self, url: str) -> dict:
+        """Return `If-None-Match`/`If-Modified-Since` headers for a cached `url`."""
+        with self._lock:
+            entry = self._entries.get(_key(url))
+            headers = {}
+            if entry is not None:
+                if entry["etag"]:
+                    headers["If-None-Match"] = entry["etag"]
+                if entry["last_modified"]:
+                    headers["If-Modified-Since"] = entry["last_modified"]
+            return headers
+
+    def revalidated(self, url: str, headers):
+        """Handle a `304 Not Modified` response and return the cached decoded data.
+
+        Returns None if the entry has disappeared in the meantime (e.g. evicted
+        by another thread), in which case the caller should request it again.
+        """
+        key = _key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data = self._get_decoded(key, entry)
+            if data is None:
+                return None
+            entry["expires_at"] = _expiry_time(headers, time.time())
+            entry["etag"] = headers.get("ETag", entry["etag"])
+            entry["last_modified"] = headers.get("Last-Modified", entry["last_modified"])
+            self.revalidations += 1
+            self._dirty = True
+        self._save_index_if_due()
+        return data
+
+    def store(self, url: str, body: bytes, headers, data):
+        """Store a `200 OK` response body and its decoded JSON `data`.
+
+        Responses without validators or a freshness lifetime are not stored
+        (they could never be reused), but are still counted as a miss.
+        """
+        now = time.time()
+        etag = headers.get("ETag", "")
+        last_modified = headers.get("Last-Modified", "")
+        expires_at = _expiry_time(headers, now)
+        key = _key(url)
+        with self._lock:
+            self.misses += 1
+            cacheable = not _no_store(headers) and (
+                etag or last_modified or expires_at > now
+            )
+            self._remove(key)
+            if not cacheable or len(body) > self._max_bytes:
+                return
+
+            file_name = key + ".json"
+            try:
+                os.makedirs(self._directory, exist_ok=True)
+                with open(os.path.join(self._directory, file_name), "wb") as f:
+                    f.write(body)
+            except OSError:
+                return
+
+            self._entries[key] = {
+                "file": file_name,
+                "etag": etag,
+                "last_modified": last_modified,
+                "expires_at": expires_at,
+                "size": len(body),
+            }
+            self._decoded[key] = data
+            self._total_bytes += len(body)
+            self._evict()
+        self._save_index_if_due()
+
+    def clear(self):
+        """Remove all entries from memory and disk."""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+        self.flush()
+
+    def flush(self):
+        """Write the index now if it has changed since it was last written."""
+        with self._save_lock:
+            self._save_index()
+
+    def close(self):
+        """Write pending index changes; call before the application exits."""
+        self.flush()
+
+    def _get_decoded(self, key, entry):
+        # caller holds the lock; marks the entry as most recently used
+        self._entries.move_to_end(key)
+        data = self._decoded.get(key)
+        if data is None:
+            # decoded once per process, e.g. for entries loaded from a previous run
+            try:
+                with open(os.path.join(self._directory, entry["file"]), "rb") as f:
+                    data = json_backend.loads(f.read())
+            except (OSError, ValueError):
+                self._remove(key)
+                return None
+            self._decoded[key] = data
+        return data
+
+    def _remove(self, key):
+        # caller holds the lock
+        entry = self._entries.pop(key, None)
+        self._decoded.pop(key, None)
+        if entry is None:
+            return
+        self._dirty = True
+        self._total_bytes -= entry["size"]
+        try:
+            os.remove(os.path.join(self._directory, entry["file"]))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._total_bytes > self._max_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self._directory, self.INDEX_FILE_NAME), "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for stored_key, entry in entries.items():
+            # body files are named by the URL hash; older indexes were keyed by the URL
+            key = entry["file"][: -len(".json")]
+            if stored_key != key:
+                self._dirty = True
+            if os.path.exists(os.path.join(self._directory, entry["file"])):
+                self._entries[key] = entry
+                self._total_bytes += entry["size"]
+        self._evict()
+
+    def _save_index_if_due(self):
+        # called without the cache lock; skipped while another thread is writing
+        if not self._dirty or time.monotonic() - self._saved_at < self._save_interval_s:
+            return
+        if self._save_lock.acquire(blocking=False):
+            try:
+                self._save_index()
+            finally:
+                self._save_lock.release()
+
+    def _save_index(self):
+        # caller holds the save lock; only the snapshot is taken under the cache lock
+        with self._lock:
+            if not self._dirty:
+                return
+            index = json.dumps(self._entries)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        index_path = os.path.join(self._directory, self.INDEX_FILE_NAME)
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(index_path + ".tmp", "w") as f:
+                f.write(index)
+            os.replace(index_path + ".tmp", index_path)
+        except OSError:
+            with self._lock:
+                self._dirty = True
+
+
+def _key(url: str) -> str:
+    """Return the cache key of `url`, also the name of its body file without extension."""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def _cache_control(headers) -> list:
+    value = headers.get("Cache-Control", "") or ""
+    return [d.strip().lower() for d in value.split(",") if d.strip()]
+
+
+def _no_store(headers) -> bool:
+    return "no-store" in _cache_control(headers)
+
+
+def _expiry_time(headers, now: float) -> float:
+    """Return the time until which a response may be reused without revalidation."""
+    directives = _cache_control(headers)
+    if "no-cache" in directives:
+        return now
+    for directive in directives:
+        if directive.startswith("max-age="):
+            try:
+                age = float(headers.get("Age", 0) or 0)
+                return now + int(directive[len("max-age=") :]) - age
+            except ValueError:
+                return now
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            return now
+    return now
@@ -0,0 +1,49 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library decoder is used without it
+    orjson = None
+
+
+def _json_loads(data):
+    # json.loads detects the encoding of bytes input and decodes it in one step
+    return json.loads(data)
+
+
+_DECODERS = {"json": _json_loads}
+if orjson is not None:
+    _DECODERS["orjson"] = orjson.loads
+
+# preferred first
+_PREFERENCE = ["orjson", "json"]
+
+_backend = next(name for name in _PREFERENCE if name in _DECODERS)
+_loads = _DECODERS[_backend]
+
+
+def loads(data):
+    """Decode a JSON document from `bytes` (UTF-8) or `str` with the active backend.
+
+    Raises `ValueError` on invalid JSON, whichever backend is active.
+    """
+    return _loads(data)
+
+
+def get_backend() -> str:
+    """Return the name of the active JSON decoder backend, e.g. "orjson" or "json"."""
+    return _backend
+
+
+def available_backends() -> list:
+    """Return the names of the installed JSON decoder backends, preferred first."""
+    return [name for name in _PREFERENCE if name in _DECODERS]
+
+
+def set_backend(name: str) -> None:
+    """Select the JSON decoder backend by name; raises `ValueError` if it is not installed."""
+    global _backend, _loads
+    if name not in _DECODERS:
+        raise ValueError(f"JSON backend {name!r} is not available")
+    _backend = name
+    _loads = _DECODERS[name]
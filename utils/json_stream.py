@@ -0,0 +1,112 @@
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def iter_array_items(chunks, key: str):
+    """Yield the items of the array `key` of a top-level JSON object, one at a time.
+
+    `chunks` is an iterable of `bytes` (UTF-8), e.g. `response.iter_content()`.
+    Only the item being decoded is held in memory besides the unread part of
+    the current chunk, so the full document tree is never built. Other
+    top-level values are decoded and discarded; if `key` is missing nothing
+    is yielded.
+
+    Raises `ValueError` on invalid or truncated JSON.
+    """
+    reader = _ChunkReader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        name = reader.value()
+        if not isinstance(name, str):
+            raise ValueError("invalid JSON: object key is not a string")
+        reader.expect(":")
+
+        if name == key:
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.expect(",]") == "]":
+                        break
+        else:
+            reader.value()  # skip the value
+
+        if reader.expect(",}") == "}":
+            return
+
+
+class _ChunkReader:
+    """Text buffer over a stream of UTF-8 byte chunks with `raw_decode` based parsing."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self) -> bool:
+        """Append the next chunk to the buffer; return False at the end of the stream."""
+        if self._eof:
+            return False
+        # drop the consumed prefix so the buffer stays about one chunk long
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._utf8.decode(b"", final=True)
+        self._eof = True
+        return False
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._read_more():
+                return
+
+    def peek(self) -> str:
+        self._skip_whitespace()
+        return self._buffer[self._pos : self._pos + 1]
+
+    def expect(self, characters: str) -> str:
+        """Consume one of `characters` and return it."""
+        char = self.peek()
+        if not char or char not in characters:
+            raise ValueError(f"invalid JSON: expected one of {characters!r}, got {char!r}")
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Decode and consume the next complete JSON value."""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # the value continues in the next chunks; at least double the
+                # unread text before retrying, so large values decode in linear time
+                pending = len(self._buffer) - self._pos
+                while len(self._buffer) - self._pos < 2 * pending:
+                    if not self._read_more():
+                        break
+                if len(self._buffer) - self._pos == pending:
+                    raise
+                continue
+            if end == len(self._buffer) and not self._eof and self._buffer[self._pos] not in "{[\"":
+                # a number at the end of the buffer may continue in the next chunk
+                if self._read_more():
+                    continue
+            self._pos = end
+            return value
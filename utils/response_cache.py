@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+
+from definitions import Constants
+
+
+class _Flight:
+    """A request in progress; callers asking for the same key wait for its result."""
+
+    __slots__ = ("done", "result")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class ResponseCache:
+    """In-memory cache of decoded API responses with a time to live.
+
+    `get_or_fetch(key, fetch)` returns the cached value of `key` while it is
+    younger than `ttl_s`. Otherwise it calls `fetch()`, which returns a
+    (value, error) pair; the value is cached only when `error` is falsy.
+    Either way the time the value was fetched is returned with it, so
+    callers can tell how old a shared value is. Concurrent calls for a key
+    that is being fetched do not fetch again: they wait and get the same
+    result. At most `max_entries`
+    values are kept, the least recently used are evicted first. The cache is
+    safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        ttl_s: float = Constants.OWM_CACHE_TTL_S,
+        max_entries: int = Constants.OWM_CACHE_MAX_ENTRIES,
+        clock=time.time,
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self._ttl_s = ttl_s
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires at, value, fetched at), least recently used first
+        self._in_flight = {}  # key -> _Flight
+        self.hits = 0  # values served from the cache
+        self.coalesced = 0  # calls that waited for another caller's fetch
+        self.misses = 0  # fetches made
+        self.evictions = 0
+
+    def __repr__(self) -> str:
+        return f"ResponseCache(entries={len(self._entries)}, ttl_s={self._ttl_s})"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> dict:
+        """Return hit/miss counters and the number of cached values."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "coalesced": self.coalesced,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
+
+    def get_or_fetch(self, key, fetch) -> tuple:
+        """Return (value, error, fetched at) for `key`, from the cache or by calling `fetch()`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], "", entry[2]
+                del self._entries[key]
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            return flight.result
+
+        result = (None, "request failed", self._clock())
+        try:
+            value, error = fetch()
+            result = (value, error, self._clock())
+            return result
+        except Exception as exc:
+            result = (None, str(exc) or type(exc).__name__, self._clock())
+            raise
+        finally:
+            with self._lock:
+                value, error, fetched_at = result
+                if not error:
+                    self._entries[key] = (fetched_at + self._ttl_s, value, fetched_at)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self._max_entries:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+                del self._in_flight[key]
+            flight.result = result
+            flight.done.set()
+
+    def clear(self) -> None:
+        """Drop all cached values (requests in flight are not affected)."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from dateutil import tz
+
+from definitions import Constants
+
+# shared tzinfo instances, attached to every parsed timestamp
+UTC = tz.tzutc()
+LOCAL = tz.tzlocal()
+
+
+def parse_utc_timestamp(timestamp_str: str) -> datetime:
+    """Parse a Digitraffic ISO 8601 timestamp into a UTC `datetime`.
+
+    Accepts the canonical "%Y-%m-%dT%H:%M:%SZ" form as well as fractional
+    seconds ("...:54.123Z") and numeric UTC offsets ("...:54+03:00",
+    "...:54.5+0300"); offset timestamps are converted to UTC. Raises
+    `ValueError` for other formats.
+
+    The results of recently parsed strings are memoized: the sensors of one
+    station payload typically share a few `measuredTime` values, and
+    `datetime` objects are immutable, so they can be shared.
+    """
+    return _parse_cached(timestamp_str)
+
+
+@lru_cache(maxsize=Constants.TIMESTAMP_CACHE_SIZE)
+def _parse_cached(timestamp_str: str) -> datetime:
+    s = timestamp_str
+    if len(s) == 20 and s[19] == "Z":
+        # fast path for the fixed format used by almost all values
+        _check_separators(s)
+        return datetime(
+            int(s[0:4]), int(s[5:7]), int(s[8:10]),
+            int(s[11:13]), int(s[14:16]), int(s[17:19]),
+            tzinfo=UTC,
+        )
+    return _parse_variant(s)
+
+
+def _check_separators(s: str) -> None:
+    if s[4] != "-" or s[7] != "-" or s[10] != "T" or s[13] != ":" or s[16] != ":":
+        raise ValueError(f"invalid timestamp: {s!r}")
+
+
+def _parse_variant(s: str) -> datetime:
+    """Parse timestamps with fractional seconds and/or a numeric UTC offset."""
+    if len(s) < 20:
+        raise ValueError(f"invalid timestamp: {s!r}")
+    _check_separators(s)
+
+    # split off the zone designator: "Z" or +HH:MM / -HH:MM / +HHMM
+    offset = timedelta(0)
+    if s[-1] in "Zz":
+        body = s[:-1]
+    else:
+        sign_pos = max(s.rfind("+"), s.rfind("-"))
+        if sign_pos < 19:
+            raise ValueError(f"invalid timestamp: {s!r}")
+        body, zone = s[:sign_pos], s[sign_pos + 1 :].replace(":", "")
+        if len(zone) != 4 or not zone.isdigit():
+            raise ValueError(f"invalid timestamp: {s!r}")
+        offset = timedelta(hours=int(zone[0:2]), minutes=int(zone[2:4]))
+        if s[sign_pos] == "-":
+            offset = -offset
+
+    microsecond = 0
+    if len(body) > 19:
+        fraction = body[20:]
+        if body[19] != "." or not fraction.isdigit():
+            raise ValueError(f"invalid timestamp: {s!r}")
+        microsecond = int(fraction[:6].ljust(6, "0"))
+
+    result = datetime(
+        int(body[0:4]), int(body[5:7]), int(body[8:10]),
+        int(body[11:13]), int(body[14:16]), int(body[17:19]),
+        microsecond, tzinfo=UTC,
+    )
+    return result - offset
@@ -7,6 +7,7 @@ import requests
 from dateutil import tz
 
 from definitions import Urls
+from utils.timestamps import LOCAL, parse_utc_timestamp
 
 from view.ui_helpers import get_station_city as _get_station_city
 from view.ui_helpers import set_taskbar_icon as _set_taskbar_icon
@@ -30,17 +31,15 @@ class Utils:
     ) -> datetime:
         """Convert an ISO UTC timestamp to a timezone-aware `datetime`.
 
-        `timestamp_str` must be in the format "%Y-%m-%dT%H:%M:%SZ". When
-        `is_local_time` is True the returned datetime uses the local tzinfo,
-        otherwise UTC tzinfo is applied.
+        `timestamp_str` is normally in the format "%Y-%m-%dT%H:%M:%SZ";
+        fractional seconds and numeric UTC offsets are also accepted (see
+        `utils.timestamps.parse_utc_timestamp`). When `is_local_time` is True
+        the returned datetime uses the local tzinfo, otherwise UTC tzinfo is
+        applied.
         """
         if is_local_time:
-            return datetime.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%SZ").replace(
-                tzinfo=tz.tzlocal()
-            )
-        return datetime.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%SZ").replace(
-            tzinfo=tz.tzutc()
-        )
+            return parse_utc_timestamp(timestamp_str).replace(tzinfo=LOCAL)
+        return parse_utc_timestamp(timestamp_str)
     
     @staticmethod
     def set_taskbar_icon():
@@ -75,6 +74,10 @@ class Utils:
                         settings["latest_stations"] = []
                     if "ui_language" not in settings:
                         settings["ui_language"] = ""
+                    if "bulk_mode" not in settings:
+                        settings["bulk_mode"] = False
+                    if "archive" not in settings:
+                        settings["archive"] = False
         except FileNotFoundError:
             print(f"{file_path} not found!")
 
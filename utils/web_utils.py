@@ -1,23 +1,70 @@
-import json
+import threading
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
-from definitions import Urls
+from definitions import Constants, Urls
+from utils import json_backend
+from utils.json_stream import iter_array_items
 
 
 class RequestRunner:
-    def __init__(self):
+    def __init__(
+        self,
+        pool_size: int = Constants.HTTP_POOL_SIZE,
+        keep_alive: bool = True,
+        cache=None,
+        city_resolver=None,
+    ):
         """Create a RequestRunner and initialize error state.
 
         This object provides safe GET requests with JSON parsing and error
-        extraction helpers used across the application.
+        extraction helpers used across the application. Requests go through
+        one pooled `requests.Session` per upstream host so that consecutive
+        refreshes reuse open TCP/TLS connections. `pool_size` limits the
+        number of pooled connections per host; with `keep_alive` False every
+        request asks the server to close the connection (useful mainly for
+        comparing cold and warm request latency).
+
+        `cache` is an optional `HttpCache`; when set, responses are cached on
+        disk and revalidated with conditional GET requests. `city_resolver` is
+        an optional `CityResolver` used by `get_city_weather`.
         """
+        self._error_state = threading.local()
         self.reset_error()
+        self._pool_size = pool_size
+        self._keep_alive = keep_alive
+        self._sessions = {}  # host -> requests.Session
+        self._sessions_lock = threading.Lock()
+        self.cache = cache
+        self.city_resolver = city_resolver
 
     def reset_error(self):
         # 200 means OK; 0 means no response (network failure)
         self.status_code = 200
         self.error_message = ""
 
+    # The error state is kept per thread, so that requests running
+    # concurrently on worker threads each see the outcome of their own call.
+    @property
+    def status_code(self) -> int:
+        """HTTP status of the last request made by the calling thread."""
+        return getattr(self._error_state, "status_code", 200)
+
+    @status_code.setter
+    def status_code(self, value: int):
+        self._error_state.status_code = value
+
+    @property
+    def error_message(self) -> str:
+        """Error message of the last request made by the calling thread."""
+        return getattr(self._error_state, "error_message", "")
+
+    @error_message.setter
+    def error_message(self, value: str):
+        self._error_state.error_message = value
+
     @property
     def has_error(self) -> bool:
         """True when the last executed request ended in an error.
@@ -27,6 +74,57 @@ class RequestRunner:
         """
         return self.status_code != 200 or self.error_message != ""
 
+    def _session_for(self, url: str) -> requests.Session:
+        """Return the pooled session for the host of `url`, creating it on first use."""
+        host = urlsplit(url).netloc
+        with self._sessions_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                if not self._keep_alive:
+                    session.headers["Connection"] = "close"
+                self._sessions[host] = session
+        return session
+
+    def warm_up(self, urls=None, background: bool = True):
+        """Open pooled connections to the upstream hosts ahead of the first request.
+
+        A lightweight HEAD request is sent to each of `urls` (by default
+        `Urls.WARM_UP_URLS`) so that the TCP and TLS handshakes are done
+        before real data is requested. Failures are ignored; the regular
+        request path reports network errors. When `background` is True the
+        requests run in a daemon thread, which is returned to the caller.
+        """
+        warm_up_urls = list(Urls.WARM_UP_URLS if urls is None else urls)
+
+        def _warm_up():
+            for url in warm_up_urls:
+                try:
+                    response = self._session_for(url).head(
+                        url, timeout=Constants.HTTP_WARM_UP_TIMEOUT_S
+                    )
+                    response.close()
+                except RequestException:
+                    pass
+
+        if not background:
+            _warm_up()
+            return None
+
+        thread = threading.Thread(target=_warm_up, name="http-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        """Close all pooled sessions and their open connections."""
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
     def __execute(self, url: str, key: str = ""):
         """Execute a GET request and return parsed JSON or an empty dict on error.
 
@@ -36,16 +134,38 @@ class RequestRunner:
         self.reset_error()
         response = None
         try:
-            response = requests.get(url, timeout=10)
-            # raise HTTPError on 4xx/5xx
-            response.raise_for_status()
-            try:
-                json_data = response.json()
-            except ValueError:
-                # Invalid JSON body
-                self.status_code = response.status_code if response is not None else 0
-                self.error_message = "Invalid JSON response"
-                return {}
+            json_data = None
+            request_args = {}
+            if self.cache is not None:
+                json_data = self.cache.get_fresh(url)
+                if json_data is None:
+                    request_args["headers"] = self.cache.conditional_headers(url)
+
+            if json_data is None:
+                response = self._session_for(url).get(
+                    url, timeout=Constants.HTTP_TIMEOUT_S, **request_args
+                )
+                if response.status_code == 304 and self.cache is not None:
+                    # not modified: reuse the cached, already decoded body
+                    json_data = self.cache.revalidated(url, response.headers)
+                    if json_data is None:
+                        response = self._session_for(url).get(
+                            url, timeout=Constants.HTTP_TIMEOUT_S
+                        )
+
+            if json_data is None:
+                # raise HTTPError on 4xx/5xx
+                response.raise_for_status()
+                try:
+                    # decode straight from the body bytes with the fastest installed decoder
+                    json_data = json_backend.loads(response.content)
+                except ValueError:
+                    # Invalid JSON body
+                    self.status_code = response.status_code if response is not None else 0
+                    self.error_message = "Invalid JSON response"
+                    return {}
+                if self.cache is not None:
+                    self.cache.store(url, response.content, response.headers, json_data)
 
             if key:
                 return json_data.get(key, {})
@@ -56,7 +176,7 @@ class RequestRunner:
             if response is not None:
                 # try to extract a message from the response body, fall back to exception text
                 try:
-                    err = response.json()
+                    err = json_backend.loads(response.content)
                     self.error_message = err.get("message", str(exc))
                 except Exception:
                     self.error_message = str(exc)
@@ -77,6 +197,40 @@ class RequestRunner:
         """
         return self.__execute(Urls.STATION_LIST_URL, "features")
 
+    def stream_weather_stations(self):
+        """Fetch the list of weather stations and yield the `features` items one at a time.
+
+        The response body is decoded incrementally while it is downloaded, so
+        the whole catalogue is never held in memory as raw bytes or as a
+        decoded tree. Streamed responses bypass the HTTP cache, which keeps
+        whole decoded bodies.
+
+        If the request or decoding fails, `status_code`/`error_message` are
+        set and `ValueError` is raised, so a consumer can tell an interrupted
+        stream from a complete one.
+        """
+        self.reset_error()
+        url = Urls.STATION_LIST_URL
+        response = None
+        try:
+            response = self._session_for(url).get(
+                url, timeout=Constants.HTTP_TIMEOUT_S, stream=True
+            )
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=Constants.HTTP_STREAM_CHUNK_BYTES)
+            yield from iter_array_items(chunks, "features")
+        except RequestException as exc:
+            self.status_code = response.status_code if response is not None else 0
+            self.error_message = str(exc)
+            raise ValueError(self.error_message) from exc
+        except ValueError:
+            self.status_code = response.status_code if response is not None else 0
+            self.error_message = "Invalid JSON response"
+            raise
+        finally:
+            if response is not None:
+                response.close()
+
     def get_road_weather(self, road_station_id):
         """Get weather data from Liikennevirasto Open Data API"""
 
@@ -84,22 +238,51 @@ class RequestRunner:
         url = Urls.WEATHER_STATION_URL.format(road_station_id)
         return self.__execute(url)
 
+    def get_all_road_weather(self):
+        """Fetch weather data of all stations and return the `stations` array.
+
+        Each item has the same layout as a single station data document.
+        """
+        return self.__execute(Urls.ALL_STATIONS_DATA_URL, "stations")
+
     def get_city_weather(self, city: str, coordinates, api_key: str):
         """Get weather data from Open Weathermap API.
-        This is needed for the present weather symbol."""
-
-        url = Urls.OPENWEATHERMAP_CITY_URL.format(city, api_key)
-        data = self.__execute(url)
-        if self.has_error:
-            # failed to get weather by city name, try again with coordinates:
-            url = Urls.OPENWEATHERMAP_LOCATION_URL.format(
-                coordinates.latitude,
-                coordinates.longitude,
-                api_key,
-            )
-            data = self.__execute(url)
+        This is needed for the present weather symbol.
+
+        The city is queried by name and, when that fails, by coordinates.
+        With a `city_resolver` a name that worked is queried by its city id
+        later on, and a name OpenWeatherMap did not recognise (or an empty
+        name) goes straight to the coordinates.
+        """
+        resolver = self.city_resolver
+        if resolver is None:
+            data = self.__execute(Urls.OPENWEATHERMAP_CITY_URL.format(city, api_key))
+            if not self.has_error:
+                return data
+        elif city:
+            city_id = resolver.city_id(city)
+            if city_id is not None:
+                data = self.__execute(Urls.OPENWEATHERMAP_CITY_ID_URL.format(city_id, api_key))
+                if not self.has_error:
+                    return data
+                if self.status_code == 404:
+                    resolver.forget(city)
+            elif not resolver.is_unresolvable(city):
+                data = self.__execute(Urls.OPENWEATHERMAP_CITY_URL.format(city, api_key))
+                if not self.has_error:
+                    if isinstance(data.get("id"), int):
+                        resolver.resolved(city, data["id"])
+                    return data
+                if self.status_code in (400, 404):  # unknown name; other errors may be transient
+                    resolver.failed(city)
 
-        return data
+        # failed to get weather by city name, try again with coordinates:
+        url = Urls.OPENWEATHERMAP_LOCATION_URL.format(
+            coordinates.latitude,
+            coordinates.longitude,
+            api_key,
+        )
+        return self.__execute(url)
 
     def get_forecast(self, coordinates, api_key: str):
         """Get weather forecast from Open Weathermap API"""
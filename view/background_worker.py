@@ -1,61 +1,155 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtCore import QThread, pyqtSignal
 from typing import Any
 
+from definitions import DataSource
+from utils.utils import Utils
+
 
 class NetworkWorker(QThread):
     """Background worker to perform network calls without blocking the UI.
 
-    Emits a `finished` signal with (city_data, forecast, error_message).
+    The road weather, city weather and forecast requests are sent
+    concurrently. Partial results are emitted as each request completes
+    (`station_data_ready`, `city_weather_ready`, `forecast_ready`), and
+    when all of them are done a `finished` signal is emitted with
+    (city_data, forecast, error_message).
+
+    When `sources` is given, only the requests of those `DataSource`s are
+    sent; the others emit no partial result and an empty dict in `finished`.
+
+    `fetched_at` maps the OpenWeatherMap `DataSource`s that returned data to
+    the time it was fetched, which is earlier than the request for
+    responses shared between stations.
     """
 
+    station_data_ready = pyqtSignal(str)
+    city_weather_ready = pyqtSignal(object, str)
+    forecast_ready = pyqtSignal(object, str)
     finished = pyqtSignal(object, object, str)
 
-    def __init__(self, controller, station_id: str, api_key: str):
+    def __init__(self, controller, station_id: str, api_key: str, sources=None):
         super().__init__()
         self.controller = controller
         self.station_id = station_id
         self.api_key = api_key
+        self.sources = set(DataSource) if sources is None else set(sources)
+        self.fetched_at = {}  # DataSource -> when its data was fetched (s since the epoch)
 
     def __repr__(self) -> str:
         """Return a short repr useful in logs when debugging worker instances."""
-        return f"NetworkWorker(station_id={self.station_id})"
+        return f"NetworkWorker(station_id={self.station_id}, sources={len(self.sources)})"
 
     def run(self) -> None:
-        """Run the network sequence on the worker thread.
+        """Run the network requests on the worker thread.
 
-        The method fetches station data via the controller and then requests
-        city weather and forecast; on completion it emits `finished(city, forecast, error)`.
+        The OpenWeatherMap requests only need the station coordinates, which
+        are known before the road weather response arrives, so the requests
+        of all `sources` are started at once. On completion `finished(city, forecast,
+        error)` is emitted; `error` is the first error in the order road
+        weather, city weather, forecast.
         """
         try:
-            # Fetch and parse road weather into the model
-            success = self.controller.fetch_and_load_station_data(self.station_id)
-            if self.controller.service.has_error:
-                err = self.controller.service.error_message
-                self.finished.emit({}, {}, err)
-                return
+            fetchers = {
+                DataSource.ROAD_WEATHER: self._fetch_station_data,
+                DataSource.CITY_WEATHER: self._fetch_city_weather,
+                DataSource.FORECAST: self._fetch_forecast,
+            }
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = {
+                    source: executor.submit(fetch)
+                    for source, fetch in fetchers.items()
+                    if source in self.sources
+                }
+
+                def result(source, skipped):
+                    return futures[source].result() if source in futures else skipped
+
+                station_err = result(DataSource.ROAD_WEATHER, "")
+                city, city_err = result(DataSource.CITY_WEATHER, ({}, ""))
+                forecast, forecast_err = result(DataSource.FORECAST, ({}, ""))
+
+            err = station_err or city_err or forecast_err
+            self.finished.emit(city or {}, forecast or {}, err)
+
+        except Exception as exc:
+            self.finished.emit({}, {}, str(exc))
+
+    def _service_error(self) -> str:
+        # the service error state is tracked per thread, so this reports the
+        # outcome of the request made on the calling pool thread
+        if self.controller.service.has_error:
+            return self.controller.service.error_message
+        return ""
 
-            # Get city weather and forecast (may return empty dicts on error)
+    def _fetched_at(self) -> float:
+        # like the error state, the fetch time is tracked per thread
+        return self.controller.service.fetched_at or time.time()
+
+    def _fetch_station_data(self) -> str:
+        """Fetch and parse road weather into the model, return an error message."""
+        try:
+            loaded = self.controller.fetch_and_load_station_data(self.station_id)
+            err = self._service_error()
+            if not loaded and not err:
+                err = self.controller.last_error  # e.g. station missing from bulk data
+        except Exception as exc:
+            err = str(exc)
+        self.station_data_ready.emit(err)
+        return err
+
+    def _fetch_city_weather(self):
+        """Fetch city weather (may be an empty dict on error)."""
+        station = self.controller.model.current_station
+        try:
+            # stations of the same city share one OpenWeatherMap query
             city = self.controller.service.get_city_weather(
-                self.controller.model.current_station.formatted_name,
-                self.controller.model.current_station.coordinates,
-                self.api_key,
+                Utils.get_station_city(station.formatted_name), station.coordinates, self.api_key
             )
-            if self.controller.service.has_error:
-                err = self.controller.service.error_message
-                # still emit city and empty forecast so UI can update what it has
-                self.finished.emit(city or {}, {}, err)
-                return
+            err = self._service_error()
+            self.fetched_at[DataSource.CITY_WEATHER] = self._fetched_at()
+        except Exception as exc:
+            city, err = {}, str(exc)
+        self.city_weather_ready.emit(city or {}, err)
+        return city, err
 
+    def _fetch_forecast(self):
+        """Fetch the 3h forecast (may be an empty dict on error)."""
+        station = self.controller.model.current_station
+        try:
             forecast = self.controller.service.get_forecast(
-                self.controller.model.current_station.coordinates, self.api_key
+                station.coordinates, self.api_key
             )
+            err = self._service_error()
+            self.fetched_at[DataSource.FORECAST] = self._fetched_at()
+        except Exception as exc:
+            forecast, err = {}, str(exc)
+        self.forecast_ready.emit(forecast or {}, err)
+        return forecast, err
+
+
+class StationListWorker(QThread):
+    """Background worker that downloads the station catalogue.
+
+    Emits `finished` with (stations_json, error_message). The JSON is parsed
+    into the model by the receiver on the UI thread, so the station list is
+    never modified while the UI is reading it.
+    """
+
+    finished = pyqtSignal(object, str)
+
+    def __init__(self, controller):
+        super().__init__()
+        self.controller = controller
+
+    def run(self) -> None:
+        try:
+            stations_json = self.controller.service.get_station_list()
+            err = ""
             if self.controller.service.has_error:
                 err = self.controller.service.error_message
-                self.finished.emit(city or {}, forecast or {}, err)
-                return
-
-            # Success
-            self.finished.emit(city or {}, forecast or {}, "")
+            self.finished.emit(stations_json, err)
 
         except Exception as exc:
-            self.finished.emit({}, {}, str(exc))
+            self.finished.emit([], str(exc))